@@ -5,21 +5,23 @@ BACKEND AS SOURCE OF TRUTH - Frontend uses these APIs
 Roles: Farmer, Admin
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional, Dict
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 import random
 import os
 import logging
 
-from app.db.database import get_db
-from app.db import crud
+from app.db.database import get_async_db
+from app.db import crud_async as crud
 from app.db.models import Farmer, OTPStore
+from app.api.v1.pagination import PageParams, fetch_page
 
 logger = logging.getLogger(__name__)
 
@@ -94,10 +96,10 @@ def generate_otp() -> str:
     return str(random.randint(100000, 999999))
 
 
-def store_otp_db(db: Session, phone: str, otp: str):
+async def store_otp_db(db: AsyncSession, phone: str, otp: str):
     """Store OTP in database with expiry"""
     # Delete any existing OTP for this phone
-    db.query(OTPStore).filter(OTPStore.phone == phone).delete()
+    await db.execute(delete(OTPStore).where(OTPStore.phone == phone))
     
     otp_record = OTPStore(
         phone=phone,
@@ -106,34 +108,34 @@ def store_otp_db(db: Session, phone: str, otp: str):
         attempts=0
     )
     db.add(otp_record)
-    db.commit()
+    await db.commit()
 
 
-def verify_otp_db(db: Session, phone: str, otp: str) -> bool:
+async def verify_otp_db(db: AsyncSession, phone: str, otp: str) -> bool:
     """Verify OTP from database"""
-    record = db.query(OTPStore).filter(OTPStore.phone == phone).first()
+    record = (await db.execute(select(OTPStore).where(OTPStore.phone == phone))).scalars().first()
     
     if not record:
         return False
     
     # Check expiry
     if datetime.now() > record.expires_at:
-        db.delete(record)
-        db.commit()
+        await db.delete(record)
+        await db.commit()
         return False
     
     # Check attempts (max 3)
     if record.attempts >= 3:
-        db.delete(record)
-        db.commit()
+        await db.delete(record)
+        await db.commit()
         return False
     
     record.attempts += 1
-    db.commit()
+    await db.commit()
     
     if record.otp == otp:
-        db.delete(record)
-        db.commit()
+        await db.delete(record)
+        await db.commit()
         return True
     
     return False
@@ -209,23 +211,23 @@ def require_role(required_role: str):
 # ENDPOINTS - DATABASE PERSISTED
 # ==================================================
 @router.post("/register")
-async def register_with_password(request: UsernamePasswordRegister, db: Session = Depends(get_db)):
+async def register_with_password(request: UsernamePasswordRegister, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new farmer with username/password. PERSISTED TO DATABASE.
     This is the primary registration method.
     """
     # Check if phone already registered
-    existing_phone = crud.get_farmer_by_phone(db, request.phone)
+    existing_phone = await crud.get_farmer_by_phone(db, request.phone)
     if existing_phone:
         raise HTTPException(status_code=400, detail="Phone number already registered")
     
     # Check if username taken
-    existing_username = db.query(Farmer).filter(Farmer.username == request.username.lower()).first()
+    existing_username = await crud.get_farmer_by_username(db, request.username)
     if existing_username:
         raise HTTPException(status_code=400, detail="Username already taken")
     
     # Create farmer with hashed password
-    farmer = crud.create_farmer(
+    farmer = await crud.create_farmer(
         db=db,
         name=request.name,
         phone=request.phone,
@@ -238,8 +240,8 @@ async def register_with_password(request: UsernamePasswordRegister, db: Session
     farmer.username = request.username.lower()
     farmer.password_hash = hash_password(request.password)
     farmer.role = "farmer"
-    db.commit()
-    db.refresh(farmer)
+    await db.commit()
+    await db.refresh(farmer)
     
     # Create token
     user_data = {
@@ -259,7 +261,7 @@ async def register_with_password(request: UsernamePasswordRegister, db: Session
 
 
 @router.post("/login")
-async def login_with_password(request: UsernamePasswordLogin, db: Session = Depends(get_db)):
+async def login_with_password(request: UsernamePasswordLogin, db: AsyncSession = Depends(get_async_db)):
     """
     Login with username/password. FROM DATABASE.
     Supports both username and phone number as identifier.
@@ -267,9 +269,9 @@ async def login_with_password(request: UsernamePasswordLogin, db: Session = Depe
     identifier = request.username.lower().strip()
     
     # Find user by username or phone
-    farmer = db.query(Farmer).filter(
+    farmer = (await db.execute(select(Farmer).where(
         (Farmer.username == identifier) | (Farmer.phone == identifier)
-    ).first()
+    ))).scalars().first()
     
     if not farmer:
         raise HTTPException(status_code=401, detail="User not found")
@@ -298,7 +300,7 @@ async def login_with_password(request: UsernamePasswordLogin, db: Session = Depe
 
 
 @router.post("/request-otp")
-async def request_otp(request: OTPRequest, db: Session = Depends(get_db)):
+async def request_otp(request: OTPRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Request OTP for phone login. PERSISTED TO DATABASE.
     
@@ -313,7 +315,7 @@ async def request_otp(request: OTPRequest, db: Session = Depends(get_db)):
     
     # Generate and store OTP in database
     otp = generate_otp()
-    store_otp_db(db, phone, otp)
+    await store_otp_db(db, phone, otp)
     
     # In production, integrate with Twilio/SNS here
     logger.info(f"OTP requested for {phone[-4:]}: {otp}")
@@ -328,18 +330,18 @@ async def request_otp(request: OTPRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/verify-otp", response_model=TokenResponse)
-async def verify_otp_login(request: OTPVerify, db: Session = Depends(get_db)):
+async def verify_otp_login(request: OTPVerify, db: AsyncSession = Depends(get_async_db)):
     """
     Verify OTP and get JWT token. FROM DATABASE.
     Creates new farmer account if first login.
     """
     phone = request.phone.strip()
     
-    if not verify_otp_db(db, phone, request.otp):
+    if not await verify_otp_db(db, phone, request.otp):
         raise HTTPException(status_code=401, detail="Invalid or expired OTP")
     
     # Find or create farmer
-    farmer = crud.get_farmer_by_phone(db, phone)
+    farmer = await crud.get_farmer_by_phone(db, phone)
     
     if farmer:
         user_data = {
@@ -373,11 +375,11 @@ async def verify_otp_login(request: OTPVerify, db: Session = Depends(get_db)):
 @router.get("/me")
 async def get_current_user_info(
     user: UserInfo = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current logged-in user info - FROM DATABASE"""
     if user.farmer_id:
-        farmer = crud.get_farmer_by_id(db, user.farmer_id)
+        farmer = await crud.get_farmer_by_id(db, user.farmer_id)
         if farmer:
             return {
                 "farmer_id": farmer.farmer_id,
@@ -420,13 +422,13 @@ async def change_password(
     old_password: str,
     new_password: str,
     user: UserInfo = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Change user password - PERSISTED TO DATABASE"""
     if not user.farmer_id:
         raise HTTPException(status_code=400, detail="User not registered")
     
-    farmer = crud.get_farmer_by_id(db, user.farmer_id)
+    farmer = await crud.get_farmer_by_id(db, user.farmer_id)
     if not farmer:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -440,7 +442,7 @@ async def change_password(
         raise HTTPException(status_code=400, detail="New password must be at least 6 characters")
     
     farmer.password_hash = hash_password(new_password)
-    db.commit()
+    await db.commit()
     
     return {"message": "Password changed successfully"}
 
@@ -450,15 +452,21 @@ async def change_password(
 # ==================================================
 @router.get("/admin/users")
 async def list_users(
-    skip: int = 0,
-    limit: int = 50,
+    response: Response,
+    params: PageParams = Depends(),
     user: UserInfo = Depends(require_role("admin")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Admin: List all users - FROM DATABASE (requires admin role)"""
-    farmers = crud.get_farmers(db, skip=skip, limit=limit)
+    """
+    Admin: List all users, newest first - FROM DATABASE (requires admin role)
+    Paginated: pass next_cursor back as ?cursor= for the next page.
+    """
+    query = select(Farmer).options(*crud.FARMER_LOAD).where(Farmer.is_active == True)
+    page = await fetch_page(db, query, Farmer, params, response, count_key=("farmers", "active"))
+    farmers = page.items
     return {
-        "total": len(farmers),
+        "total": page.total if page.total is not None else len(farmers),
+        "next_cursor": page.next_cursor,
         "users": [
             {
                 "farmer_id": f.farmer_id,
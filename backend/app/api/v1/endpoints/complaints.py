@@ -4,17 +4,23 @@ Farmers submit complaints, Admin reviews and resolves them
 DATABASE PERSISTED - Real multi-user support
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from pydantic import BaseModel, Field
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Optional, List, Dict
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from datetime import datetime
+import time
 import random
 import string
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.db.database import get_async_db
 from app.db.models import Complaint, Farmer
+from app.db.pagination import invalidate_counts
 from app.api.v1.endpoints.auth import get_current_user, UserInfo
+from app.api.v1.pagination import PageParams, fetch_page
 
 router = APIRouter()
 
@@ -64,6 +70,79 @@ class ComplaintResponse(BaseModel):
 # ==================================================
 # HELPER FUNCTIONS
 # ==================================================
+def complaints_query():
+    """Complaints with their farmer loaded (complaint_to_response reads it)"""
+    return select(Complaint).options(joinedload(Complaint.farmer))
+
+
+async def load_complaint(db: AsyncSession, complaint_id: str, refresh: bool = False) -> Optional[Complaint]:
+    query = complaints_query().where(Complaint.complaint_id == complaint_id)
+    if refresh:
+        # Re-read after commit: server-side defaults and the farmer relationship
+        query = query.execution_options(populate_existing=True)
+    return (await db.execute(query)).scalars().first()
+
+
+async def get_farmer(db: AsyncSession, farmer_id: str) -> Optional[Farmer]:
+    return (await db.execute(select(Farmer).where(Farmer.farmer_id == farmer_id))).scalars().first()
+
+
+# ==================================================
+# DISTRICT STATS CACHE
+# ==================================================
+DISTRICT_STATS_CACHE: Dict[str, Dict] = {}
+# Bumped on every invalidation so a stats query that was already running when a
+# complaint changed does not store its (stale) result
+_district_generation: Dict[str, int] = {}
+
+
+def get_cached_district_stats(district: str) -> Optional[Dict]:
+    """Cached stats for a district if fresh"""
+    cached = DISTRICT_STATS_CACHE.get(district)
+    if cached and time.monotonic() - cached["timestamp"] < settings.COMPLAINT_STATS_CACHE_SECONDS:
+        return cached["data"]
+    return None
+
+
+def cache_district_stats(district: str, data: Dict, generation: int):
+    if settings.COMPLAINT_STATS_CACHE_SECONDS > 0 and _district_generation.get(district, 0) == generation:
+        DISTRICT_STATS_CACHE[district] = {"data": data, "timestamp": time.monotonic()}
+
+
+def invalidate_district_stats(district: Optional[str]):
+    """Drop a district's cached stats after one of its complaints changed"""
+    if district is None:
+        return
+    _district_generation[district] = _district_generation.get(district, 0) + 1
+    DISTRICT_STATS_CACHE.pop(district, None)
+
+
+async def query_district_stats(db: AsyncSession, district: str) -> Dict:
+    """
+    Farmer count and complaints per status for a district in one statement:
+    the district's farmers left-joined to their complaints, grouped by status
+    (farmers without complaints form a NULL-status group with a count of 0).
+    """
+    farmer_count = select(func.count(Farmer.id)).where(Farmer.district == district).scalar_subquery()
+    rows = (await db.execute(
+        select(Complaint.status, func.count(Complaint.id), farmer_count)
+        .select_from(Farmer)
+        .outerjoin(Complaint, Complaint.farmer_id == Farmer.id)
+        .where(Farmer.district == district)
+        .group_by(Complaint.status)
+    )).all()
+    
+    by_status = {status: count for status, count, _ in rows if status is not None}
+    return {
+        "district": district,
+        "totalFarmers": rows[0][2] if rows else 0,
+        "total": sum(by_status.values()),
+        "pending": by_status.get("pending", 0),
+        "inProgress": by_status.get("in-progress", 0),
+        "resolved": by_status.get("resolved", 0)
+    }
+
+
 def generate_complaint_id() -> str:
     """Generate unique complaint ID"""
     timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
@@ -100,7 +179,7 @@ def complaint_to_response(complaint: Complaint) -> dict:
 @router.post("/", response_model=dict)
 async def create_complaint(
     complaint: ComplaintCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """
@@ -108,7 +187,7 @@ async def create_complaint(
     Requires authenticated farmer.
     """
     # Get farmer from database
-    farmer = db.query(Farmer).filter(Farmer.farmer_id == current_user.farmer_id).first()
+    farmer = await get_farmer(db, current_user.farmer_id)
     if not farmer:
         raise HTTPException(status_code=404, detail="Farmer not found")
     
@@ -135,8 +214,10 @@ async def create_complaint(
     )
     
     db.add(new_complaint)
-    db.commit()
-    db.refresh(new_complaint)
+    await db.commit()
+    invalidate_district_stats(farmer.district)
+    invalidate_counts("complaints")
+    new_complaint = await load_complaint(db, new_complaint.complaint_id, refresh=True)
     
     return {
         "success": True,
@@ -147,19 +228,19 @@ async def create_complaint(
 
 @router.get("/my", response_model=List[dict])
 async def get_my_complaints(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """
     Get all complaints submitted by the current farmer.
     """
-    farmer = db.query(Farmer).filter(Farmer.farmer_id == current_user.farmer_id).first()
+    farmer = await get_farmer(db, current_user.farmer_id)
     if not farmer:
         raise HTTPException(status_code=404, detail="Farmer not found")
     
-    complaints = db.query(Complaint).filter(
+    complaints = (await db.execute(complaints_query().where(
         Complaint.farmer_id == farmer.id
-    ).order_by(Complaint.created_at.desc()).all()
+    ).order_by(Complaint.created_at.desc()))).scalars().all()
     
     return [complaint_to_response(c) for c in complaints]
 
@@ -167,18 +248,18 @@ async def get_my_complaints(
 @router.get("/{complaint_id}", response_model=dict)
 async def get_complaint(
     complaint_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """
     Get a specific complaint by ID.
     """
-    complaint = db.query(Complaint).filter(Complaint.complaint_id == complaint_id).first()
+    complaint = await load_complaint(db, complaint_id)
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
     
     # Check ownership (or admin)
-    farmer = db.query(Farmer).filter(Farmer.farmer_id == current_user.farmer_id).first()
+    farmer = await get_farmer(db, current_user.farmer_id)
     if complaint.farmer_id != farmer.id and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied")
     
@@ -191,66 +272,63 @@ async def get_complaint(
 @router.get("/admin/district/{district}", response_model=List[dict])
 async def get_district_complaints(
     district: str,
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db)
+    params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get all complaints from farmers in a specific district.
+    Get complaints from farmers in a specific district, newest first.
     For admin dashboard - no auth required for demo.
+    Paginated: pass the X-Next-Cursor header back as ?cursor= for the next page.
     """
-    # Get all farmers in district
-    farmers = db.query(Farmer).filter(Farmer.district == district).all()
-    farmer_ids = [f.id for f in farmers]
-    
-    # Get complaints from those farmers
-    query = db.query(Complaint).filter(Complaint.farmer_id.in_(farmer_ids))
+    query = complaints_query().join(Farmer).where(Farmer.district == district)
     
     if status and status != 'all':
-        query = query.filter(Complaint.status == status)
+        query = query.where(Complaint.status == status)
     
-    complaints = query.order_by(
-        # Pending first
-        Complaint.status.desc(),
-        Complaint.created_at.desc()
-    ).all()
-    
-    return [complaint_to_response(c) for c in complaints]
+    page = await fetch_page(db, query, Complaint, params, response,
+                            count_key=("complaints", "district", district, status))
+    return [complaint_to_response(c) for c in page.items]
 
 
 @router.get("/admin/all", response_model=List[dict])
 async def get_all_complaints(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status"),
     district: Optional[str] = Query(None, description="Filter by district"),
-    db: Session = Depends(get_db)
+    params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get all complaints (admin view).
+    Get all complaints (admin view), newest first.
+    Paginated: pass the X-Next-Cursor header back as ?cursor= for the next page.
     """
-    query = db.query(Complaint)
+    query = complaints_query()
     
     if status and status != 'all':
-        query = query.filter(Complaint.status == status)
+        query = query.where(Complaint.status == status)
     
     if district:
         # Join with farmers table to filter by district
-        query = query.join(Farmer).filter(Farmer.district == district)
+        query = query.join(Farmer).where(Farmer.district == district)
     
-    complaints = query.order_by(Complaint.created_at.desc()).all()
-    
-    return [complaint_to_response(c) for c in complaints]
+    page = await fetch_page(db, query, Complaint, params, response,
+                            count_key=("complaints", "all", district, status))
+    return [complaint_to_response(c) for c in page.items]
 
 
 @router.put("/admin/{complaint_id}", response_model=dict)
 async def update_complaint(
     complaint_id: str,
     update: ComplaintUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update complaint status (admin action).
     Mark as in-progress, resolved, or rejected.
     """
-    complaint = db.query(Complaint).filter(Complaint.complaint_id == complaint_id).first()
+    complaint = await load_complaint(db, complaint_id)
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
     
@@ -269,8 +347,10 @@ async def update_complaint(
     if update.status == 'resolved':
         complaint.resolved_at = datetime.now()
     
-    db.commit()
-    db.refresh(complaint)
+    await db.commit()
+    complaint = await load_complaint(db, complaint_id, refresh=True)
+    invalidate_district_stats(complaint.farmer.district if complaint.farmer else None)
+    invalidate_counts("complaints")
     
     return {
         "success": True,
@@ -282,34 +362,17 @@ async def update_complaint(
 @router.get("/admin/stats/{district}", response_model=dict)
 async def get_district_stats(
     district: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get complaint statistics for a district.
+    Cached per district; creating or updating a complaint there drops the entry.
     """
-    # Get farmers in district
-    farmers = db.query(Farmer).filter(Farmer.district == district).all()
-    farmer_ids = [f.id for f in farmers]
+    cached = get_cached_district_stats(district)
+    if cached is not None:
+        return cached
     
-    total = db.query(Complaint).filter(Complaint.farmer_id.in_(farmer_ids)).count()
-    pending = db.query(Complaint).filter(
-        Complaint.farmer_id.in_(farmer_ids),
-        Complaint.status == "pending"
-    ).count()
-    in_progress = db.query(Complaint).filter(
-        Complaint.farmer_id.in_(farmer_ids),
-        Complaint.status == "in-progress"
-    ).count()
-    resolved = db.query(Complaint).filter(
-        Complaint.farmer_id.in_(farmer_ids),
-        Complaint.status == "resolved"
-    ).count()
-    
-    return {
-        "district": district,
-        "totalFarmers": len(farmers),
-        "total": total,
-        "pending": pending,
-        "inProgress": in_progress,
-        "resolved": resolved
-    }
+    generation = _district_generation.get(district, 0)
+    stats = await query_district_stats(db, district)
+    cache_district_stats(district, stats, generation)
+    return stats
@@ -3,13 +3,14 @@ Crop Advisory Endpoints
 ML-powered crop recommendations using trained Random Forest model
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel, Field
 from typing import List, Optional
 import numpy as np
 from pathlib import Path
+from starlette.concurrency import run_in_threadpool
 
-from app.ml_service import predict_crop
+from app.ml_service import predict_crop, predict_crop_many, require_model
 
 router = APIRouter()
 
@@ -45,6 +46,31 @@ class CropResponse(BaseModel):
     advisory: str
 
 
+MAX_BATCH_SAMPLES = 10000
+
+
+class CropBatchInput(BaseModel):
+    """Many soil samples scored in one request (e.g. a cooperative society's survey)"""
+    samples: List[CropInput] = Field(..., min_length=1, max_length=MAX_BATCH_SAMPLES)
+    top_k: int = Field(default=3, ge=1, le=10)
+
+
+class CropBatchResult(BaseModel):
+    """Recommendations for one sample, in request order"""
+    index: int
+    state: Optional[str] = None
+    district: Optional[str] = None
+    recommendations: List[CropRecommendation]
+    soil_health: str
+
+
+class CropBatchResponse(BaseModel):
+    """API Response for batch crop recommendation"""
+    success: bool
+    count: int
+    results: List[CropBatchResult]
+
+
 # Crop metadata database
 CROP_DATA = {
     "rice": {"season": "Kharif", "water": "High", "yield": "4-5 tonnes/hectare", "desc": "Ideal for waterlogged fields"},
@@ -77,15 +103,41 @@ CROP_DATA = {
 }
 
 
-@router.post("/recommend", response_model=CropResponse)
+def _to_recommendation(pred: dict) -> CropRecommendation:
+    """Attach crop metadata to a model prediction"""
+    crop_name = pred['crop_name'].lower()
+    data = CROP_DATA.get(crop_name, {
+        "season": "Variable", 
+        "water": "Medium", 
+        "yield": "Variable",
+        "desc": "Suitable for your conditions"
+    })
+    
+    return CropRecommendation(
+        crop_name=pred['crop_name'].capitalize(),
+        confidence=round(pred['confidence'], 2),
+        description=data.get("desc", "Recommended for your soil"),
+        season=data.get("season", "Year-round"),
+        water_requirement=data.get("water", "Medium"),
+        expected_yield=data.get("yield", "Variable")
+    )
+
+
+def _assess_soil_health(input_data: CropInput) -> str:
+    if input_data.nitrogen < 30 or input_data.phosphorus < 20:
+        return "Needs Improvement"
+    if input_data.nitrogen > 100 and input_data.phosphorus > 80:
+        return "Excellent"
+    return "Good"
+
+
+@router.post("/recommend", response_model=CropResponse, dependencies=[Depends(require_model("crop"))])
 async def recommend_crops(input_data: CropInput):
     """
     Get AI-powered crop recommendations based on soil and climate parameters.
     Uses trained Random Forest model with 99%+ accuracy.
     """
     try:
-        from starlette.concurrency import run_in_threadpool
-        
         # Get ML predictions (Non-blocking)
         predictions = await run_in_threadpool(
             predict_crop,
@@ -98,24 +150,7 @@ async def recommend_crops(input_data: CropInput):
             rainfall=input_data.rainfall
         )
         
-        recommendations = []
-        for pred in predictions[:3]:
-            crop_name = pred['crop_name'].lower()
-            data = CROP_DATA.get(crop_name, {
-                "season": "Variable", 
-                "water": "Medium", 
-                "yield": "Variable",
-                "desc": "Suitable for your conditions"
-            })
-            
-            recommendations.append(CropRecommendation(
-                crop_name=pred['crop_name'].capitalize(),
-                confidence=round(pred['confidence'], 2),
-                description=data.get("desc", "Recommended for your soil"),
-                season=data.get("season", "Year-round"),
-                water_requirement=data.get("water", "Medium"),
-                expected_yield=data.get("yield", "Variable")
-            ))
+        recommendations = [_to_recommendation(pred) for pred in predictions[:3]]
         
         # Check if recommendations are empty
         if not recommendations:
@@ -124,12 +159,7 @@ async def recommend_crops(input_data: CropInput):
                 detail="Crop recommendation model failed to generate predictions. Check model file exists and is compatible."
             )
         
-        # Assess soil health
-        soil_health = "Good"
-        if input_data.nitrogen < 30 or input_data.phosphorus < 20:
-            soil_health = "Needs Improvement"
-        elif input_data.nitrogen > 100 and input_data.phosphorus > 80:
-            soil_health = "Excellent"
+        soil_health = _assess_soil_health(input_data)
         
         # Generate advisory
         top_crop = recommendations[0].crop_name if recommendations else "crops"
@@ -153,6 +183,36 @@ async def recommend_crops(input_data: CropInput):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/recommend/batch", response_model=CropBatchResponse, dependencies=[Depends(require_model("crop"))])
+async def recommend_crops_batch(batch: CropBatchInput):
+    """
+    Crop recommendations for up to 10,000 soil samples at once.
+    All samples are scaled and scored by the Random Forest in a single call.
+    """
+    features = np.array([
+        [s.nitrogen, s.phosphorus, s.potassium, s.temperature, s.humidity, s.ph, s.rainfall]
+        for s in batch.samples
+    ], dtype=np.float64)
+    
+    try:
+        predictions = await run_in_threadpool(predict_crop_many, features, batch.top_k)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch crop prediction failed: {e}")
+    
+    results = [
+        CropBatchResult(
+            index=i,
+            state=sample.state,
+            district=sample.district,
+            recommendations=[_to_recommendation(pred) for pred in preds],
+            soil_health=_assess_soil_health(sample)
+        )
+        for i, (sample, preds) in enumerate(zip(batch.samples, predictions))
+    ]
+    
+    return CropBatchResponse(success=True, count=len(results), results=results)
+
+
 @router.get("/crops")
 async def list_crops():
     """Get list of all supported crops"""
@@ -9,10 +9,10 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 from enum import Enum
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
-from app.db import crud
+from app.db.database import get_async_db
+from app.db import crud_async as crud
 from app.db.models import CropCycle as CropCycleModel, Land as LandModel
 
 router = APIRouter()
@@ -200,8 +200,12 @@ def predict_yield_for_cycle(crop: str, health_status: str, growth_stage: str) ->
     }
 
 
-def cycle_to_response(cycle: CropCycleModel, db: Session) -> CropCycleResponse:
-    """Convert SQLAlchemy model to response with computed fields"""
+def cycle_to_response(cycle: CropCycleModel) -> CropCycleResponse:
+    """
+    Convert SQLAlchemy model to response with computed fields.
+    Reads cycle.land and cycle.activity_logs, so the cycle must be loaded with
+    its activities (crud with_activities / listing functions) - no queries here.
+    """
     sowing = cycle.sowing_date
     days = (datetime.now() - sowing).days if sowing else 0
     growth_stage = calculate_growth_stage(cycle.crop, days)
@@ -209,12 +213,7 @@ def cycle_to_response(cycle: CropCycleModel, db: Session) -> CropCycleResponse:
     
     # Get activities from activity logs
     activities = []
-    from app.db.models import ActivityLog as ActivityLogModel
-    activity_logs = db.query(ActivityLogModel).filter(
-        ActivityLogModel.crop_cycle_id == cycle.id
-    ).order_by(ActivityLogModel.activity_date.desc()).all()
-    
-    for log in activity_logs:
+    for log in cycle.activity_logs:
         activities.append({
             "id": str(log.id),
             "type": log.activity_type,
@@ -247,7 +246,7 @@ def cycle_to_response(cycle: CropCycleModel, db: Session) -> CropCycleResponse:
 # ENDPOINTS - DATABASE PERSISTED
 # ==================================================
 @router.post("/start", response_model=CropCycleResponse)
-async def start_crop_cycle(cycle: CropCycleCreate, db: Session = Depends(get_db)):
+async def start_crop_cycle(cycle: CropCycleCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Start a new crop cycle for a land parcel. PERSISTED TO DATABASE.
     
@@ -256,7 +255,7 @@ async def start_crop_cycle(cycle: CropCycleCreate, db: Session = Depends(get_db)
     - Enables ML-powered alerts
     """
     # Find land by land_id
-    land = crud.get_land_by_id(db, cycle.land_id)
+    land = await crud.get_land_by_id(db, cycle.land_id)
     if not land:
         raise HTTPException(status_code=404, detail="Land not found")
     
@@ -270,7 +269,7 @@ async def start_crop_cycle(cycle: CropCycleCreate, db: Session = Depends(get_db)
         harvest = datetime.strptime(cycle.expected_harvest, "%Y-%m-%d")
     
     # Create in database
-    db_cycle = crud.create_crop_cycle(
+    db_cycle = await crud.create_crop_cycle(
         db=db,
         land_db_id=land.id,
         crop=cycle.crop,
@@ -279,39 +278,39 @@ async def start_crop_cycle(cycle: CropCycleCreate, db: Session = Depends(get_db)
         expected_harvest=harvest
     )
     
-    return cycle_to_response(db_cycle, db)
+    return cycle_to_response(db_cycle)
 
 
 @router.get("/{cycle_id}", response_model=CropCycleResponse)
-async def get_crop_cycle(cycle_id: str, db: Session = Depends(get_db)):
+async def get_crop_cycle(cycle_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get details of a specific crop cycle with updated ML insights - FROM DATABASE"""
-    cycle = crud.get_crop_cycle_by_id(db, cycle_id)
+    cycle = await crud.get_crop_cycle_by_id(db, cycle_id, with_activities=True)
     if not cycle:
         raise HTTPException(status_code=404, detail="Crop cycle not found")
     
-    return cycle_to_response(cycle, db)
+    return cycle_to_response(cycle)
 
 
 @router.get("/land/{land_id}")
-async def get_land_cycles(land_id: str, active_only: bool = True, db: Session = Depends(get_db)):
+async def get_land_cycles(land_id: str, active_only: bool = True, db: AsyncSession = Depends(get_async_db)):
     """Get all crop cycles for a land parcel - FROM DATABASE"""
-    land = crud.get_land_by_id(db, land_id)
+    land = await crud.get_land_by_id(db, land_id)
     if not land:
         raise HTTPException(status_code=404, detail="Land not found")
     
-    cycles = crud.get_land_crop_cycles(db, land.id, active_only=active_only)
+    cycles = await crud.get_land_crop_cycles(db, land.id, active_only=active_only)
     
     return {
         "land_id": land_id, 
         "total": len(cycles), 
-        "cycles": [cycle_to_response(c, db) for c in cycles]
+        "cycles": [cycle_to_response(c) for c in cycles]
     }
 
 
 @router.post("/{cycle_id}/activity")
-async def log_activity(cycle_id: str, activity: ActivityLog, db: Session = Depends(get_db)):
+async def log_activity(cycle_id: str, activity: ActivityLog, db: AsyncSession = Depends(get_async_db)):
     """Log farming activity (irrigation, fertilizer, etc.) - PERSISTED TO DATABASE"""
-    cycle = crud.get_crop_cycle_by_id(db, cycle_id)
+    cycle = await crud.get_crop_cycle_by_id(db, cycle_id)
     if not cycle:
         raise HTTPException(status_code=404, detail="Crop cycle not found")
     
@@ -322,7 +321,7 @@ async def log_activity(cycle_id: str, activity: ActivityLog, db: Session = Depen
         except:
             activity_date = datetime.now()
     
-    db_activity = crud.create_activity_log(
+    db_activity = await crud.create_activity_log(
         db=db,
         crop_cycle_db_id=cycle.id,
         activity_type=activity.activity_type,
@@ -338,7 +337,7 @@ async def log_activity(cycle_id: str, activity: ActivityLog, db: Session = Depen
             current = getattr(cycle, cost_field) or 0
             setattr(cycle, cost_field, current + activity.cost)
         cycle.total_cost = (cycle.total_cost or 0) + activity.cost
-        db.commit()
+        await db.commit()
     
     return {
         "message": "Activity logged", 
@@ -353,12 +352,12 @@ async def log_activity(cycle_id: str, activity: ActivityLog, db: Session = Depen
 
 
 @router.post("/{cycle_id}/report-disease")
-async def report_disease(cycle_id: str, report: DiseaseReport, db: Session = Depends(get_db)):
+async def report_disease(cycle_id: str, report: DiseaseReport, db: AsyncSession = Depends(get_async_db)):
     """
     Report disease detection from ML model. PERSISTED TO DATABASE.
     Updates health status and triggers alerts.
     """
-    cycle = crud.get_crop_cycle_by_id(db, cycle_id)
+    cycle = await crud.get_crop_cycle_by_id(db, cycle_id)
     if not cycle:
         raise HTTPException(status_code=404, detail="Crop cycle not found")
     
@@ -370,11 +369,11 @@ async def report_disease(cycle_id: str, report: DiseaseReport, db: Session = Dep
     else:
         new_health = cycle.health_status or "healthy"
     
-    crud.update_crop_cycle_health(db, cycle_id, new_health)
+    await crud.update_crop_cycle_health(db, cycle_id, new_health)
     
     # Log the disease detection
     farmer_id = cycle.land.farmer_id if cycle.land else None
-    crud.create_disease_log(
+    await crud.create_disease_log(
         db=db,
         disease_name=report.disease_name,
         confidence=report.confidence,
@@ -385,7 +384,7 @@ async def report_disease(cycle_id: str, report: DiseaseReport, db: Session = Dep
     )
     
     # Refresh cycle
-    db.refresh(cycle)
+    await db.refresh(cycle)
     
     growth_stage = calculate_growth_stage(cycle.crop, (datetime.now() - cycle.sowing_date).days)
     yield_pred = predict_yield_for_cycle(cycle.crop, new_health, growth_stage)
@@ -400,14 +399,14 @@ async def report_disease(cycle_id: str, report: DiseaseReport, db: Session = Dep
 
 
 @router.post("/{cycle_id}/update-health")
-async def update_health_status(cycle_id: str, status: HealthStatus, db: Session = Depends(get_db)):
+async def update_health_status(cycle_id: str, status: HealthStatus, db: AsyncSession = Depends(get_async_db)):
     """Manually update crop health status - PERSISTED TO DATABASE"""
-    cycle = crud.get_crop_cycle_by_id(db, cycle_id)
+    cycle = await crud.get_crop_cycle_by_id(db, cycle_id)
     if not cycle:
         raise HTTPException(status_code=404, detail="Crop cycle not found")
     
-    crud.update_crop_cycle_health(db, cycle_id, status.value)
-    db.refresh(cycle)
+    await crud.update_crop_cycle_health(db, cycle_id, status.value)
+    await db.refresh(cycle)
     
     growth_stage = calculate_growth_stage(cycle.crop, (datetime.now() - cycle.sowing_date).days)
     yield_pred = predict_yield_for_cycle(cycle.crop, status.value, growth_stage)
@@ -421,10 +420,10 @@ async def complete_crop_cycle(
     actual_yield: float = Query(..., description="Actual yield in kg"),
     selling_price: Optional[float] = Query(None, description="Selling price per kg"),
     notes: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark crop cycle as complete with actual yield data - PERSISTED TO DATABASE"""
-    cycle = crud.get_crop_cycle_by_id(db, cycle_id)
+    cycle = await crud.get_crop_cycle_by_id(db, cycle_id)
     if not cycle:
         raise HTTPException(status_code=404, detail="Crop cycle not found")
     
@@ -434,11 +433,11 @@ async def complete_crop_cycle(
     predicted_yield = predicted.get("predicted_yield_kg_per_acre", 0)
     
     # Complete the cycle
-    completed = crud.complete_crop_cycle(db, cycle_id, actual_yield, selling_price)
+    completed = await crud.complete_crop_cycle(db, cycle_id, actual_yield, selling_price)
     
     if notes:
         completed.notes = notes
-        db.commit()
+        await db.commit()
     
     # Calculate accuracy
     accuracy = (1 - abs(actual_yield - predicted_yield) / predicted_yield) * 100 if predicted_yield > 0 else 0
@@ -456,11 +455,11 @@ async def complete_crop_cycle(
 
 
 @router.get("/active/all")
-async def get_all_active_cycles(db: Session = Depends(get_db)):
+async def get_all_active_cycles(db: AsyncSession = Depends(get_async_db)):
     """Get all active crop cycles with alerts summary - FROM DATABASE"""
-    cycles = crud.get_active_crop_cycles(db, limit=100)
+    cycles = await crud.get_active_crop_cycles(db, limit=100)
     
-    responses = [cycle_to_response(c, db) for c in cycles]
+    responses = [cycle_to_response(c) for c in cycles]
     
     critical_alerts = []
     for c in responses:
@@ -10,14 +10,18 @@ from typing import List, Optional
 import io
 import base64
 from pathlib import Path
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+import logging
 
-from app.ml_service import predict_disease
-from app.db.database import get_db
-from app.db import crud
+from app.core.metrics import span
+from app.ml_service import predict_disease_async, get_model_version, require_model
+from app.db.database import get_async_db
+from app.db.writer import get_disease_log_writer
+from app.db import crud_async as crud
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 class DiseaseResult(BaseModel):
@@ -164,12 +168,12 @@ def format_disease_name(name: str) -> str:
     return name.replace("_", " ").replace("  ", " - ").title()
 
 
-@router.post("/detect", response_model=DiseaseResponse)
+@router.post("/detect", response_model=DiseaseResponse, dependencies=[Depends(require_model("disease"))])
 async def detect_disease(
     image: UploadFile = File(..., description="Plant leaf image (JPG/PNG)"),
     farmer_id: Optional[str] = Query(None, description="Farmer ID to log detection"),
     crop_cycle_id: Optional[str] = Query(None, description="Crop cycle ID to associate"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Detect plant diseases from leaf images using CNN.
@@ -177,25 +181,23 @@ async def detect_disease(
     PERSISTS DETECTION TO DATABASE for research and history.
     """
     
-    print(f"[DISEASE DETECT] Called with file: {image.filename}, content_type: {image.content_type}")
+    logger.debug(f"Disease detect: {image.filename} ({image.content_type})")
     # Validate file type - more lenient check
     valid_types = ["image/jpeg", "image/png", "image/jpg", "application/octet-stream"]
     filename_lower = (image.filename or "").lower()
     is_valid_extension = filename_lower.endswith(('.jpg', '.jpeg', '.png'))
     if image.content_type not in valid_types and not is_valid_extension:
-        print("[DISEASE DETECT] Invalid file type.")
         raise HTTPException(
             status_code=400, 
             detail="Invalid file type. Please upload JPG or PNG image."
         )
     try:
         # Read image
-        contents = await image.read()
-        print(f"[DISEASE DETECT] Image size: {len(contents)} bytes")
-        # Get ML predictions (Top-3)
-        from starlette.concurrency import run_in_threadpool
-        predictions = await run_in_threadpool(predict_disease, contents)
-        print(f"[DISEASE DETECT] Predictions: {predictions}")
+        with span("disease", "read"):
+            contents = await image.read()
+        # Get ML predictions (Top-3) - batched with concurrent uploads
+        predictions = await predict_disease_async(contents)
+        logger.debug(f"Disease detect: {len(contents)} bytes -> {predictions}")
         
         # Check if predictions are empty or all failed
         if not predictions or all(p.get('confidence', 0) <= 0 for p in predictions):
@@ -204,64 +206,75 @@ async def detect_disease(
                 detail="Disease detection model not available or failed to process image. Please check logs."
             )
         
-        # Process top prediction
-        top_pred = predictions[0] if predictions else {'disease_name': 'Unknown', 'confidence': 0.0}
-        disease_key = top_pred['disease_name']
-        
-        # Get disease info
-        info = DISEASE_INFO.get(disease_key, DEFAULT_INFO)
-        
-        is_healthy = 'healthy' in disease_key.lower()
-        
-        diseases_list = []
-        if not is_healthy:
-            diseases_list.append(DiseaseResult(
-                disease_name=format_disease_name(disease_key),
-                confidence=round(top_pred['confidence'], 3),
-                severity=info["severity"],
-                description=info["description"],
-                treatment=info["treatment"],
-                prevention=info["prevention"]
-            ))
-        
-        # Format Top-3 predictions for UI
-        top_3 = [
-            {
-                "disease": format_disease_name(p['disease_name']),
-                "confidence": round(p['confidence'] * 100, 1)
-            }
-            for p in predictions[:3]
-        ]
+        with span("disease", "lookup"):
+            # Process top prediction
+            top_pred = predictions[0] if predictions else {'disease_name': 'Unknown', 'confidence': 0.0}
+            disease_key = top_pred['disease_name']
+            
+            # Get disease info
+            info = DISEASE_INFO.get(disease_key, DEFAULT_INFO)
+            
+            is_healthy = 'healthy' in disease_key.lower()
+            
+            diseases_list = []
+            if not is_healthy:
+                diseases_list.append(DiseaseResult(
+                    disease_name=format_disease_name(disease_key),
+                    confidence=round(top_pred['confidence'], 3),
+                    severity=info["severity"],
+                    description=info["description"],
+                    treatment=info["treatment"],
+                    prevention=info["prevention"]
+                ))
+            
+            # Format Top-3 predictions for UI
+            top_3 = [
+                {
+                    "disease": format_disease_name(p['disease_name']),
+                    "confidence": round(p['confidence'] * 100, 1)
+                }
+                for p in predictions[:3]
+            ]
         
         # PERSIST TO DATABASE - Log detection for research
-        farmer_db_id = None
-        cycle_db_id = None
-        
-        if farmer_id:
-            farmer = crud.get_farmer_by_id(db, farmer_id)
-            if farmer:
-                farmer_db_id = farmer.id
-        
-        if crop_cycle_id:
-            cycle = crud.get_crop_cycle_by_id(db, crop_cycle_id)
-            if cycle:
-                cycle_db_id = cycle.id
-        
-        # Create disease log in database
-        try:
-            crud.create_disease_log(
-                db=db,
-                disease_name=disease_key,
-                confidence=top_pred['confidence'],
-                crop_cycle_db_id=cycle_db_id,
-                farmer_db_id=farmer_db_id,
-                disease_hindi=format_disease_name(disease_key),
-                severity=info["severity"],
-                treatment_recommended=info["treatment"][0] if info["treatment"] else None
-            )
-        except Exception as log_error:
-            # Don't fail detection if logging fails
-            print(f"Warning: Could not log disease detection: {log_error}")
+        log_fields = dict(
+            disease_name=disease_key,
+            confidence=top_pred['confidence'],
+            disease_hindi=format_disease_name(disease_key),
+            severity=info["severity"],
+            treatment_recommended=info["treatment"][0] if info["treatment"] else None,
+            model_version=get_model_version("disease")
+        )
+        writer = get_disease_log_writer()
+        if writer is not None:
+            # Write-behind: bulk-inserted off the request path
+            writer.enqueue(farmer_id=farmer_id, crop_cycle_id=crop_cycle_id, **log_fields)
+        else:
+            with span("disease", "db"):
+                farmer_db_id = None
+                cycle_db_id = None
+                
+                if farmer_id:
+                    farmer = await crud.get_farmer_by_id(db, farmer_id)
+                    if farmer:
+                        farmer_db_id = farmer.id
+                
+                if crop_cycle_id:
+                    cycle = await crud.get_crop_cycle_by_id(db, crop_cycle_id)
+                    if cycle:
+                        cycle_db_id = cycle.id
+                
+                # Create disease log in database
+                try:
+                    await crud.create_disease_log(
+                        db=db,
+                        crop_cycle_db_id=cycle_db_id,
+                        farmer_db_id=farmer_db_id,
+                        **log_fields
+                    )
+                except Exception as log_error:
+                    # Don't fail detection if logging fails
+                    logger.warning(f"⚠️ Could not log disease detection: {log_error}")
         
         return DiseaseResponse(
             success=True,
@@ -273,11 +286,11 @@ async def detect_disease(
         )
         
     except Exception as e:
-        print(f"[DISEASE DETECT] ERROR: {e}")
+        logger.error(f"❌ Disease detection failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/detect-base64")
+@router.post("/detect-base64", dependencies=[Depends(require_model("disease"))])
 async def detect_disease_base64(image_base64: str):
     """
     Detect disease from base64 encoded image.
@@ -287,9 +300,8 @@ async def detect_disease_base64(image_base64: str):
         # Decode base64
         image_data = base64.b64decode(image_base64)
         
-        # Get predictions
-        from starlette.concurrency import run_in_threadpool
-        predictions = await run_in_threadpool(predict_disease, image_data)
+        # Get predictions - batched with concurrent uploads
+        predictions = await predict_disease_async(image_data)
         
         # Format Top-3
         top_3 = [
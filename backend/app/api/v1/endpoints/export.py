@@ -4,31 +4,223 @@ GET /export/diseases - Export all disease detection logs
 GET /export/yields - Export all yield predictions
 GET /export/farmers - Export farmer statistics (admin only)
 
+Formats: csv (optionally gzipped), json, and the columnar parquet / arrow
+(Arrow IPC stream) for pandas/polars/duckdb - typed columns, repeated strings
+dictionary-encoded, no parsing on load.
+
 Professional feature for academic and research purposes
 """
 
 from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import Boolean, DateTime, Float, Integer, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Optional
 from datetime import datetime
+from enum import Enum
 import csv
 import io
+import zlib
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.db.database import get_async_db, AsyncSessionLocal
 from app.db.models import DiseaseLog, YieldPrediction, CropCycle, Farmer, Land
 from app.api.v1.endpoints.auth import get_current_user, require_role, UserInfo, optional_auth
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 router = APIRouter()
 
+# JSON exports are built in memory, so they keep the old row cap
+JSON_MAX_ROWS = 10000
+
+# Low-cardinality text columns, dictionary-encoded in parquet/arrow exports
+DICTIONARY_COLUMNS = {
+    "disease_name", "disease_hindi", "severity", "treatment_recommended",
+    "crop", "season", "growth_stage", "health_status",
+    "growth_stage_at_prediction", "model_version",
+}
+
+# Parquet rows buffered per row group (each row group is written as soon as it fills)
+PARQUET_ROW_GROUP_ROWS = 64 * 1024
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    JSON = "json"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+COLUMNAR_FORMATS = {
+    # format: (media type, file extension)
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+def cell(value):
+    """CSV/JSON cell: datetimes as ISO 8601, everything else as is (None -> empty)"""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def row_chunks(query) -> AsyncIterator[list]:
+    """
+    Rows of a select, EXPORT_CHUNK_ROWS at a time, from a streaming cursor
+    (yield_per) on the export's own session: the request session is closed
+    once the endpoint returns, and memory stays flat however many rows are
+    exported.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=settings.EXPORT_CHUNK_ROWS))
+        async for rows in result.partitions():
+            yield rows
+
+
+async def csv_chunks(query) -> AsyncIterator[bytes]:
+    """Encode the rows of a column select as CSV, one chunk per fetched partition"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(query.selected_columns.keys())
+    async for rows in row_chunks(query):
+        writer.writerows([cell(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+# ==================================================
+# COLUMNAR (PARQUET / ARROW)
+# ==================================================
+def arrow_schema(query) -> "pa.Schema":
+    """Arrow schema for a column select, from the SQLAlchemy column types"""
+    fields = []
+    for name, column in query.selected_columns.items():
+        if isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        elif name in DICTIONARY_COLUMNS:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
 
-def generate_csv(rows: list, headers: list) -> str:
-    """Generate CSV string from rows"""
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(headers)
-    writer.writerows(rows)
-    return output.getvalue()
+
+def record_batch(rows: list, schema: "pa.Schema") -> "pa.RecordBatch":
+    """One typed batch from a partition of rows (columns transposed once)"""
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file for pyarrow writers whose bytes are taken out after each write"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+async def arrow_chunks(query) -> AsyncIterator[bytes]:
+    """Arrow IPC stream: the schema, then one record batch per fetched partition"""
+    schema = arrow_schema(query)
+    sink = _DrainableSink()
+    # LZ4 buffer compression: a fraction of the size, still no parsing on load.
+    # Each batch carries its own dictionaries (replacements are valid in the stream format).
+    options = pa.ipc.IpcWriteOptions(compression="lz4")
+    with pa.ipc.new_stream(sink, schema, options=options) as writer:
+        async for rows in row_chunks(query):
+            writer.write_batch(record_batch(rows, schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+async def parquet_chunks(query) -> AsyncIterator[bytes]:
+    """Parquet file written row group by row group (PARQUET_ROW_GROUP_ROWS rows each)"""
+    schema = arrow_schema(query)
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd", use_dictionary=True)
+    try:
+        pending, pending_rows = [], 0
+        async for rows in row_chunks(query):
+            pending.append(record_batch(rows, schema))
+            pending_rows += len(rows)
+            if pending_rows >= PARQUET_ROW_GROUP_ROWS:
+                writer.write_table(pa.Table.from_batches(pending, schema), row_group_size=pending_rows)
+                pending, pending_rows = [], 0
+                yield sink.drain()
+        if pending:
+            writer.write_table(pa.Table.from_batches(pending, schema), row_group_size=pending_rows)
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip a byte stream on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(query, name: str, format: str = "csv", gzip: bool = False) -> StreamingResponse:
+    """
+    StreamingResponse exporting a column select as CSV (optionally .csv.gz),
+    Parquet or an Arrow IPC stream
+    """
+    stem = f"{name}_{datetime.now().strftime('%Y%m%d')}"
+    if format in COLUMNAR_FORMATS:
+        if not PYARROW_AVAILABLE:
+            raise HTTPException(status_code=501, detail=f"{format} export requires pyarrow on the server")
+        media_type, extension = COLUMNAR_FORMATS[format]
+        chunks = parquet_chunks(query) if format == "parquet" else arrow_chunks(query)
+        filename = f"{stem}.{extension}"
+    elif gzip:
+        media_type, chunks, filename = "application/gzip", gzip_chunks(csv_chunks(query)), f"{stem}.csv.gz"
+    else:
+        media_type, chunks, filename = "text/csv", csv_chunks(query), f"{stem}.csv"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+async def json_rows(db: AsyncSession, query, limit: int) -> list:
+    """Rows of a column select as dicts for the JSON format (capped at JSON_MAX_ROWS)"""
+    limit = min(limit or JSON_MAX_ROWS, JSON_MAX_ROWS)
+    rows = (await db.execute(query.limit(limit))).mappings().all()
+    return [{key: cell(value) for key, value in row.items()} for row in rows]
 
 
 @router.get("/diseases")
@@ -36,9 +228,10 @@ async def export_disease_logs(
     start_date: Optional[str] = Query(None, description="Filter from date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Filter to date (YYYY-MM-DD)"),
     plant_type: Optional[str] = Query(None, description="Filter by plant type"),
-    limit: int = Query(1000, le=10000, description="Max records"),
-    format: str = Query("csv", description="Export format: csv or json"),
-    db: Session = Depends(get_db),
+    limit: int = Query(1000, ge=0, description="Max records (0 = all; JSON is capped at 10000)"),
+    format: ExportFormat = Query(ExportFormat.CSV, description="Export format: csv, json, parquet or arrow"),
+    gzip: bool = Query(False, description="Gzip the CSV (.csv.gz)"),
+    db: AsyncSession = Depends(get_async_db),
     user: Optional[UserInfo] = Depends(optional_auth)
 ):
     """
@@ -52,85 +245,54 @@ async def export_disease_logs(
     Returns CSV with columns:
     - log_id, disease_name, confidence, severity, plant_type, detected_at
     """
-    query = db.query(DiseaseLog).order_by(DiseaseLog.detected_at.desc())
+    query = select(
+        DiseaseLog.log_id,
+        DiseaseLog.disease_name,
+        DiseaseLog.disease_hindi,
+        DiseaseLog.confidence,
+        DiseaseLog.severity,
+        DiseaseLog.affected_area_percent,
+        DiseaseLog.treatment_recommended,
+        DiseaseLog.detected_at
+    ).order_by(DiseaseLog.detected_at.desc())
     
     # Apply filters
     if start_date:
         try:
             start = datetime.strptime(start_date, "%Y-%m-%d")
-            query = query.filter(DiseaseLog.detected_at >= start)
+            query = query.where(DiseaseLog.detected_at >= start)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid start_date format. Use YYYY-MM-DD")
     
     if end_date:
         try:
             end = datetime.strptime(end_date, "%Y-%m-%d")
-            query = query.filter(DiseaseLog.detected_at <= end)
+            query = query.where(DiseaseLog.detected_at <= end)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid end_date format. Use YYYY-MM-DD")
     
     if plant_type:
-        query = query.filter(DiseaseLog.disease_name.ilike(f"%{plant_type}%"))
+        query = query.where(DiseaseLog.disease_name.ilike(f"%{plant_type}%"))
     
-    logs = query.limit(limit).all()
-    
-    if format == "json":
+    if format == ExportFormat.JSON:
+        data = await json_rows(db, query, limit)
         return {
             "export_type": "disease_detections",
             "generated_at": datetime.now().isoformat(),
-            "total_records": len(logs),
-            "data": [
-                {
-                    "log_id": log.log_id,
-                    "disease_name": log.disease_name,
-                    "disease_hindi": log.disease_hindi,
-                    "confidence": log.confidence,
-                    "severity": log.severity,
-                    "affected_area_percent": log.affected_area_percent,
-                    "treatment_recommended": log.treatment_recommended,
-                    "detected_at": log.detected_at.isoformat() if log.detected_at else None
-                }
-                for log in logs
-            ]
+            "total_records": len(data),
+            "data": data
         }
     
-    # Generate CSV
-    headers = [
-        "log_id", "disease_name", "disease_hindi", "confidence", 
-        "severity", "affected_area_percent", "treatment_recommended", "detected_at"
-    ]
-    
-    rows = [
-        [
-            log.log_id,
-            log.disease_name,
-            log.disease_hindi or "",
-            log.confidence,
-            log.severity or "",
-            log.affected_area_percent or "",
-            log.treatment_recommended or "",
-            log.detected_at.isoformat() if log.detected_at else ""
-        ]
-        for log in logs
-    ]
-    
-    csv_content = generate_csv(rows, headers)
-    
-    return StreamingResponse(
-        iter([csv_content]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=disease_logs_{datetime.now().strftime('%Y%m%d')}.csv"
-        }
-    )
+    return stream_export(query.limit(limit or None), "disease_logs", format.value, gzip)
 
 
 @router.get("/yields")
 async def export_yield_predictions(
     crop: Optional[str] = Query(None, description="Filter by crop"),
-    limit: int = Query(1000, le=10000, description="Max records"),
-    format: str = Query("csv", description="Export format: csv or json"),
-    db: Session = Depends(get_db),
+    limit: int = Query(1000, ge=0, description="Max records (0 = all; JSON is capped at 10000)"),
+    format: ExportFormat = Query(ExportFormat.CSV, description="Export format: csv, json, parquet or arrow"),
+    gzip: bool = Query(False, description="Gzip the CSV (.csv.gz)"),
+    db: AsyncSession = Depends(get_async_db),
     user: Optional[UserInfo] = Depends(optional_auth)
 ):
     """
@@ -144,62 +306,35 @@ async def export_yield_predictions(
     Returns CSV with columns:
     - prediction_id, crop, predicted_yield_kg, confidence, growth_stage, predicted_at
     """
-    query = db.query(YieldPrediction).join(CropCycle).order_by(YieldPrediction.predicted_at.desc())
+    query = (
+        select(
+            YieldPrediction.prediction_id,
+            CropCycle.crop,
+            YieldPrediction.predicted_yield_kg,
+            YieldPrediction.confidence,
+            YieldPrediction.growth_stage_at_prediction,
+            YieldPrediction.days_since_sowing,
+            YieldPrediction.model_version,
+            YieldPrediction.predicted_at
+        )
+        .select_from(YieldPrediction)
+        .join(YieldPrediction.crop_cycle)
+        .order_by(YieldPrediction.predicted_at.desc())
+    )
     
     if crop:
-        query = query.filter(CropCycle.crop.ilike(f"%{crop}%"))
-    
-    predictions = query.limit(limit).all()
+        query = query.where(CropCycle.crop.ilike(f"%{crop}%"))
     
-    if format == "json":
+    if format == ExportFormat.JSON:
+        data = await json_rows(db, query, limit)
         return {
             "export_type": "yield_predictions",
             "generated_at": datetime.now().isoformat(),
-            "total_records": len(predictions),
-            "data": [
-                {
-                    "prediction_id": pred.prediction_id,
-                    "crop": pred.crop_cycle.crop if pred.crop_cycle else None,
-                    "predicted_yield_kg": pred.predicted_yield_kg,
-                    "confidence": pred.confidence,
-                    "growth_stage_at_prediction": pred.growth_stage_at_prediction,
-                    "days_since_sowing": pred.days_since_sowing,
-                    "model_version": pred.model_version,
-                    "predicted_at": pred.predicted_at.isoformat() if pred.predicted_at else None
-                }
-                for pred in predictions
-            ]
+            "total_records": len(data),
+            "data": data
         }
     
-    # Generate CSV
-    headers = [
-        "prediction_id", "crop", "predicted_yield_kg", "confidence",
-        "growth_stage_at_prediction", "days_since_sowing", "model_version", "predicted_at"
-    ]
-    
-    rows = [
-        [
-            pred.prediction_id,
-            pred.crop_cycle.crop if pred.crop_cycle else "",
-            pred.predicted_yield_kg,
-            pred.confidence,
-            pred.growth_stage_at_prediction or "",
-            pred.days_since_sowing or "",
-            pred.model_version or "",
-            pred.predicted_at.isoformat() if pred.predicted_at else ""
-        ]
-        for pred in predictions
-    ]
-    
-    csv_content = generate_csv(rows, headers)
-    
-    return StreamingResponse(
-        iter([csv_content]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=yield_predictions_{datetime.now().strftime('%Y%m%d')}.csv"
-        }
-    )
+    return stream_export(query.limit(limit or None), "yield_predictions", format.value, gzip)
 
 
 @router.get("/crop-cycles")
@@ -207,9 +342,10 @@ async def export_crop_cycles(
     crop: Optional[str] = Query(None, description="Filter by crop"),
     season: Optional[str] = Query(None, description="Filter by season"),
     active_only: bool = Query(False, description="Only active cycles"),
-    limit: int = Query(1000, le=10000, description="Max records"),
-    format: str = Query("csv", description="Export format: csv or json"),
-    db: Session = Depends(get_db),
+    limit: int = Query(1000, ge=0, description="Max records (0 = all; JSON is capped at 10000)"),
+    format: ExportFormat = Query(ExportFormat.CSV, description="Export format: csv, json, parquet or arrow"),
+    gzip: bool = Query(False, description="Gzip the CSV (.csv.gz)"),
+    db: AsyncSession = Depends(get_async_db),
     user: Optional[UserInfo] = Depends(optional_auth)
 ):
     """
@@ -218,84 +354,45 @@ async def export_crop_cycles(
     Returns CSV with columns:
     - cycle_id, crop, season, sowing_date, expected_harvest, growth_stage, health_status, yield
     """
-    query = db.query(CropCycle).order_by(CropCycle.sowing_date.desc())
+    query = select(
+        CropCycle.cycle_id,
+        CropCycle.crop,
+        CropCycle.season,
+        CropCycle.sowing_date,
+        CropCycle.expected_harvest,
+        CropCycle.actual_harvest,
+        CropCycle.growth_stage,
+        CropCycle.health_status,
+        CropCycle.predicted_yield_kg,
+        CropCycle.actual_yield_kg,
+        CropCycle.total_cost,
+        CropCycle.total_revenue,
+        CropCycle.profit,
+        CropCycle.is_active
+    ).order_by(CropCycle.sowing_date.desc())
     
     if crop:
-        query = query.filter(CropCycle.crop.ilike(f"%{crop}%"))
+        query = query.where(CropCycle.crop.ilike(f"%{crop}%"))
     if season:
-        query = query.filter(CropCycle.season == season)
+        query = query.where(CropCycle.season == season)
     if active_only:
-        query = query.filter(CropCycle.is_active == True)
+        query = query.where(CropCycle.is_active == True)
     
-    cycles = query.limit(limit).all()
-    
-    if format == "json":
+    if format == ExportFormat.JSON:
+        data = await json_rows(db, query, limit)
         return {
             "export_type": "crop_cycles",
             "generated_at": datetime.now().isoformat(),
-            "total_records": len(cycles),
-            "data": [
-                {
-                    "cycle_id": cycle.cycle_id,
-                    "crop": cycle.crop,
-                    "season": cycle.season,
-                    "sowing_date": cycle.sowing_date.isoformat() if cycle.sowing_date else None,
-                    "expected_harvest": cycle.expected_harvest.isoformat() if cycle.expected_harvest else None,
-                    "actual_harvest": cycle.actual_harvest.isoformat() if cycle.actual_harvest else None,
-                    "growth_stage": cycle.growth_stage,
-                    "health_status": cycle.health_status,
-                    "predicted_yield_kg": cycle.predicted_yield_kg,
-                    "actual_yield_kg": cycle.actual_yield_kg,
-                    "total_cost": cycle.total_cost,
-                    "total_revenue": cycle.total_revenue,
-                    "profit": cycle.profit,
-                    "is_active": cycle.is_active
-                }
-                for cycle in cycles
-            ]
+            "total_records": len(data),
+            "data": data
         }
     
-    # Generate CSV
-    headers = [
-        "cycle_id", "crop", "season", "sowing_date", "expected_harvest", 
-        "actual_harvest", "growth_stage", "health_status", "predicted_yield_kg",
-        "actual_yield_kg", "total_cost", "total_revenue", "profit", "is_active"
-    ]
-    
-    rows = [
-        [
-            cycle.cycle_id,
-            cycle.crop,
-            cycle.season,
-            cycle.sowing_date.isoformat() if cycle.sowing_date else "",
-            cycle.expected_harvest.isoformat() if cycle.expected_harvest else "",
-            cycle.actual_harvest.isoformat() if cycle.actual_harvest else "",
-            cycle.growth_stage,
-            cycle.health_status,
-            cycle.predicted_yield_kg or "",
-            cycle.actual_yield_kg or "",
-            cycle.total_cost or "",
-            cycle.total_revenue or "",
-            cycle.profit or "",
-            cycle.is_active
-        ]
-        for cycle in cycles
-    ]
-    
-    csv_content = generate_csv(rows, headers)
-    
-    return StreamingResponse(
-        iter([csv_content]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=crop_cycles_{datetime.now().strftime('%Y%m%d')}.csv"
-        }
-    )
+    return stream_export(query.limit(limit or None), "crop_cycles", format.value, gzip)
 
 
 @router.get("/statistics")
 async def export_platform_statistics(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: Optional[UserInfo] = Depends(optional_auth)
 ):
     """
@@ -306,27 +403,28 @@ async def export_platform_statistics(
     - Disease detection counts by type
     - Yield prediction accuracy metrics
     """
-    from sqlalchemy import func
+    async def scalar(statement):
+        return (await db.execute(statement)).scalar()
     
     # Basic counts
-    farmer_count = db.query(func.count(Farmer.id)).scalar()
-    land_count = db.query(func.count(Land.id)).scalar()
-    cycle_count = db.query(func.count(CropCycle.id)).scalar()
-    active_cycles = db.query(func.count(CropCycle.id)).filter(CropCycle.is_active == True).scalar()
-    disease_count = db.query(func.count(DiseaseLog.id)).scalar()
-    yield_count = db.query(func.count(YieldPrediction.id)).scalar()
+    farmer_count = await scalar(select(func.count(Farmer.id)))
+    land_count = await scalar(select(func.count(Land.id)))
+    cycle_count = await scalar(select(func.count(CropCycle.id)))
+    active_cycles = await scalar(select(func.count(CropCycle.id)).where(CropCycle.is_active == True))
+    disease_count = await scalar(select(func.count(DiseaseLog.id)))
+    yield_count = await scalar(select(func.count(YieldPrediction.id)))
     
     # Disease distribution
-    disease_dist = db.query(
+    disease_dist = (await db.execute(select(
         DiseaseLog.disease_name,
         func.count(DiseaseLog.id).label('count')
-    ).group_by(DiseaseLog.disease_name).all()
+    ).group_by(DiseaseLog.disease_name))).all()
     
     # Crop distribution
-    crop_dist = db.query(
+    crop_dist = (await db.execute(select(
         CropCycle.crop,
         func.count(CropCycle.id).label('count')
-    ).group_by(CropCycle.crop).all()
+    ).group_by(CropCycle.crop))).all()
     
     return {
         "generated_at": datetime.now().isoformat(),
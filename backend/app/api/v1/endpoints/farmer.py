@@ -4,15 +4,18 @@ CRUD operations for farmer registration and land details
 PERSISTED TO DATABASE - No in-memory storage
 """
 
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.db.database import get_db
-from app.db import crud
+from app.db.database import get_async_db
+from app.db import crud_async as crud
 from app.db.models import Farmer as FarmerModel, Land as LandModel
+from app.api.v1.pagination import PageParams, fetch_page
 
 router = APIRouter()
 
@@ -132,7 +135,7 @@ def land_to_response(land: LandModel) -> LandResponse:
 # FARMER ENDPOINTS - DATABASE PERSISTED
 # ==================================================
 @router.post("/register", response_model=FarmerResponse)
-async def register_farmer(farmer: FarmerCreate, db: Session = Depends(get_db)):
+async def register_farmer(farmer: FarmerCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new farmer profile. PERSISTED TO DATABASE.
     
@@ -143,12 +146,12 @@ async def register_farmer(farmer: FarmerCreate, db: Session = Depends(get_db)):
     - **district**: District name
     """
     # Check if phone already registered
-    existing = crud.get_farmer_by_phone(db, farmer.phone)
+    existing = await crud.get_farmer_by_phone(db, farmer.phone)
     if existing:
         raise HTTPException(status_code=400, detail="Phone number already registered")
     
     # Create farmer in database
-    db_farmer = crud.create_farmer(
+    db_farmer = await crud.create_farmer(
         db=db,
         name=farmer.name,
         phone=farmer.phone,
@@ -161,34 +164,34 @@ async def register_farmer(farmer: FarmerCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/profile/{farmer_id}", response_model=FarmerResponse)
-async def get_farmer_profile(farmer_id: str, db: Session = Depends(get_db)):
+async def get_farmer_profile(farmer_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get farmer profile by ID - FROM DATABASE"""
-    farmer = crud.get_farmer_by_id(db, farmer_id)
+    farmer = await crud.get_farmer_by_id(db, farmer_id)
     if not farmer:
         raise HTTPException(status_code=404, detail="Farmer not found")
     return farmer_to_response(farmer)
 
 
 @router.get("/lookup")
-async def lookup_farmer(phone: str = Query(..., description="Phone number"), db: Session = Depends(get_db)):
+async def lookup_farmer(phone: str = Query(..., description="Phone number"), db: AsyncSession = Depends(get_async_db)):
     """Lookup farmer by phone number - FROM DATABASE"""
-    farmer = crud.get_farmer_by_phone(db, phone)
+    farmer = await crud.get_farmer_by_phone(db, phone)
     if not farmer:
         raise HTTPException(status_code=404, detail="Farmer not found")
     return farmer_to_response(farmer)
 
 
 @router.put("/profile/{farmer_id}")
-async def update_farmer(farmer_id: str, updates: dict, db: Session = Depends(get_db)):
+async def update_farmer(farmer_id: str, updates: dict, db: AsyncSession = Depends(get_async_db)):
     """Update farmer profile - PERSISTED TO DATABASE"""
-    farmer = crud.get_farmer_by_id(db, farmer_id)
+    farmer = await crud.get_farmer_by_id(db, farmer_id)
     if not farmer:
         raise HTTPException(status_code=404, detail="Farmer not found")
     
     allowed = ["name", "language", "state", "district"]
     update_data = {k: v for k, v in updates.items() if k in allowed}
     
-    updated_farmer = crud.update_farmer(db, farmer_id, **update_data)
+    updated_farmer = await crud.update_farmer(db, farmer_id, **update_data)
     return farmer_to_response(updated_farmer)
 
 
@@ -196,10 +199,10 @@ async def update_farmer(farmer_id: str, updates: dict, db: Session = Depends(get
 async def list_farmers(
     state: Optional[str] = None,
     limit: int = Query(default=50, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all registered farmers - FROM DATABASE"""
-    farmers = crud.get_farmers(db, limit=limit, state=state)
+    farmers = await crud.get_farmers(db, limit=limit, state=state)
     return {
         "total": len(farmers),
         "farmers": [farmer_to_response(f) for f in farmers]
@@ -208,25 +211,29 @@ async def list_farmers(
 
 @router.get("/all")
 async def get_all_farmers(
+    response: Response,
     district: Optional[str] = Query(None, description="Filter by district"),
     state: Optional[str] = Query(None, description="Filter by state"),
-    db: Session = Depends(get_db)
+    params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get all farmers, optionally filtered by district or state.
+    Get all farmers, optionally filtered by district or state, newest first.
     For admin dashboard - returns full farmer data with lands.
+    Paginated: pass the X-Next-Cursor header back as ?cursor= for the next page.
     """
-    query = db.query(FarmerModel)
+    query = select(FarmerModel).options(selectinload(FarmerModel.lands))
     
     if district:
-        query = query.filter(FarmerModel.district == district)
+        query = query.where(FarmerModel.district == district)
     if state:
-        query = query.filter(FarmerModel.state == state)
+        query = query.where(FarmerModel.state == state)
     
-    farmers = query.all()
+    page = await fetch_page(db, query, FarmerModel, params, response,
+                            count_key=("farmers", "all", district, state))
     
     result = []
-    for f in farmers:
+    for f in page.items:
         farmer_data = {
             "id": f.farmer_id,
             "name": f.name,
@@ -258,7 +265,7 @@ async def get_all_farmers(
 # LAND ENDPOINTS - DATABASE PERSISTED
 # ==================================================
 @router.post("/land/register", response_model=LandResponse)
-async def register_land(land: LandCreate, db: Session = Depends(get_db)):
+async def register_land(land: LandCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a land parcel for a farmer. PERSISTED TO DATABASE.
     
@@ -268,7 +275,7 @@ async def register_land(land: LandCreate, db: Session = Depends(get_db)):
     - **irrigation_type**: rainfed, canal, borewell, drip, sprinkler
     - **geo_location**: Optional coordinates {lat, lon}
     """
-    farmer = crud.get_farmer_by_id(db, land.farmer_id)
+    farmer = await crud.get_farmer_by_id(db, land.farmer_id)
     if not farmer:
         raise HTTPException(status_code=404, detail="Farmer not found")
     
@@ -276,7 +283,7 @@ async def register_land(land: LandCreate, db: Session = Depends(get_db)):
     lat = land.geo_location.get("lat") if land.geo_location else None
     lon = land.geo_location.get("lon") if land.geo_location else None
     
-    db_land = crud.create_land(
+    db_land = await crud.create_land(
         db=db,
         farmer_db_id=farmer.id,
         area_acres=land.area,
@@ -291,22 +298,22 @@ async def register_land(land: LandCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/land/{land_id}", response_model=LandResponse)
-async def get_land(land_id: str, db: Session = Depends(get_db)):
+async def get_land(land_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get land details by ID - FROM DATABASE"""
-    land = crud.get_land_by_id(db, land_id)
+    land = await crud.get_land_by_id(db, land_id)
     if not land:
         raise HTTPException(status_code=404, detail="Land not found")
     return land_to_response(land)
 
 
 @router.get("/land/farmer/{farmer_id}")
-async def get_farmer_lands(farmer_id: str, db: Session = Depends(get_db)):
+async def get_farmer_lands(farmer_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get all lands owned by a farmer - FROM DATABASE"""
-    farmer = crud.get_farmer_by_id(db, farmer_id)
+    farmer = await crud.get_farmer_by_id(db, farmer_id)
     if not farmer:
         raise HTTPException(status_code=404, detail="Farmer not found")
     
-    lands = crud.get_farmer_lands(db, farmer.id)
+    lands = await crud.get_farmer_lands(db, farmer.id)
     return {
         "farmer_id": farmer_id, 
         "total_lands": len(lands), 
@@ -315,9 +322,9 @@ async def get_farmer_lands(farmer_id: str, db: Session = Depends(get_db)):
 
 
 @router.post("/land/{land_id}/crop-history")
-async def add_crop_history(land_id: str, entry: CropHistoryEntry, db: Session = Depends(get_db)):
+async def add_crop_history(land_id: str, entry: CropHistoryEntry, db: AsyncSession = Depends(get_async_db)):
     """Add crop history entry to a land - via CropCycle creation"""
-    land = crud.get_land_by_id(db, land_id)
+    land = await crud.get_land_by_id(db, land_id)
     if not land:
         raise HTTPException(status_code=404, detail="Land not found")
     
@@ -325,7 +332,7 @@ async def add_crop_history(land_id: str, entry: CropHistoryEntry, db: Session =
     from datetime import datetime
     sowing_date = datetime(entry.year, 6 if entry.season.lower() == "kharif" else 11, 1)
     
-    cycle = crud.create_crop_cycle(
+    cycle = await crud.create_crop_cycle(
         db=db,
         land_db_id=land.id,
         crop=entry.crop,
@@ -335,15 +342,15 @@ async def add_crop_history(land_id: str, entry: CropHistoryEntry, db: Session =
     )
     
     if entry.yield_kg:
-        crud.complete_crop_cycle(db, cycle.cycle_id, entry.yield_kg)
+        await crud.complete_crop_cycle(db, cycle.cycle_id, entry.yield_kg)
     
     return {"message": "Crop history added", "land_id": land_id, "cycle_id": cycle.cycle_id}
 
 
 @router.get("/land/{land_id}/crop-history")
-async def get_crop_history(land_id: str, db: Session = Depends(get_db)):
+async def get_crop_history(land_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get crop history for a land - FROM DATABASE"""
-    land = crud.get_land_by_id(db, land_id)
+    land = await crud.get_land_by_id(db, land_id)
     if not land:
         raise HTTPException(status_code=404, detail="Land not found")
     
@@ -363,14 +370,14 @@ async def get_crop_history(land_id: str, db: Session = Depends(get_db)):
 
 
 @router.delete("/land/{land_id}")
-async def delete_land(land_id: str, db: Session = Depends(get_db)):
+async def delete_land(land_id: str, db: AsyncSession = Depends(get_async_db)):
     """Delete a land parcel - FROM DATABASE"""
-    land = crud.get_land_by_id(db, land_id)
+    land = await crud.get_land_by_id(db, land_id)
     if not land:
         raise HTTPException(status_code=404, detail="Land not found")
     
-    db.delete(land)
-    db.commit()
+    await db.delete(land)
+    await db.commit()
     return {"message": "Land deleted", "land_id": land_id}
 
 
@@ -378,22 +385,19 @@ async def delete_land(land_id: str, db: Session = Depends(get_db)):
 # STATISTICS - FROM DATABASE
 # ==================================================
 @router.get("/stats")
-async def get_stats(db: Session = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_async_db)):
     """Get platform statistics - FROM DATABASE"""
-    stats = crud.get_platform_stats(db)
+    stats = await crud.get_platform_stats(db)
     
     # Additional stats
-    from app.db.models import Land as LandModel, Farmer as FarmerModel
-    from sqlalchemy import func
+    total_area = (await db.execute(select(func.sum(LandModel.area_acres)))).scalar() or 0
     
-    total_area = db.query(func.sum(LandModel.area_acres)).scalar() or 0
-    
-    soil_dist = db.query(
+    soil_dist = (await db.execute(select(
         LandModel.soil_type, 
         func.count(LandModel.id)
-    ).group_by(LandModel.soil_type).all()
+    ).group_by(LandModel.soil_type))).all()
     
-    states = db.query(func.count(func.distinct(FarmerModel.state))).scalar() or 0
+    states = (await db.execute(select(func.count(func.distinct(FarmerModel.state))))).scalar() or 0
     
     return {
         "total_farmers": stats["total_farmers"],
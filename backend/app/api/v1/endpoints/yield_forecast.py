@@ -0,0 +1,170 @@
+"""
+Yield Forecasting Endpoints
+ML yield predictions for single fields and district-level tables
+"""
+
+import logging
+
+from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ml_service import predict_yield_async, predict_yield_many_async, get_model_version, require_model
+from app.db.database import get_async_db
+from app.db import crud_async as crud
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_ROWS = 10000
+
+
+# ==================================================
+# MODELS
+# ==================================================
+class YieldInput(BaseModel):
+    """One field / district-season row"""
+    crop: str = Field(..., description="Crop name as in the training data, e.g. Rice")
+    season: str = Field(..., description="Kharif, Rabi, Whole Year, ...")
+    state: str
+    area: float = Field(..., gt=0, description="Area in hectares")
+    rainfall: float = Field(..., ge=0, description="Annual rainfall in mm")
+    fertilizer: float = Field(..., ge=0, description="Fertilizer used in kg")
+    pesticide: float = Field(..., ge=0, description="Pesticide used in kg")
+    district: Optional[str] = None
+
+
+class YieldPrediction(BaseModel):
+    """Prediction for one row"""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    index: int
+    crop: str
+    district: Optional[str] = None
+    predicted_yield: float  # tonnes per hectare
+    estimated_production: float  # predicted_yield * area
+    confidence: float
+    error: Optional[str] = None
+    model_version: Optional[str] = None
+
+
+class DistrictSummary(BaseModel):
+    """Totals for one state/district across its rows"""
+    state: str
+    district: Optional[str] = None
+    rows: int
+    total_area: float
+    estimated_production: float
+
+
+class YieldBatchInput(BaseModel):
+    """Table of rows forecast in one request"""
+    rows: List[YieldInput] = Field(..., min_length=1, max_length=MAX_BATCH_ROWS)
+
+
+class YieldBatchResponse(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+    
+    success: bool
+    count: int
+    failed: int
+    predictions: List[YieldPrediction]
+    districts: List[DistrictSummary]
+    model_version: Optional[str] = None
+
+
+def _to_prediction(index: int, row: YieldInput, result: dict) -> YieldPrediction:
+    predicted = result.get('predicted_yield', 0.0)
+    return YieldPrediction(
+        index=index,
+        crop=row.crop,
+        district=row.district,
+        predicted_yield=round(predicted, 4),
+        estimated_production=round(predicted * row.area, 2),
+        confidence=result.get('confidence', 0.0),
+        error=result.get('error')
+    )
+
+
+# ==================================================
+# ENDPOINTS
+# ==================================================
+@router.post("/predict", response_model=YieldPrediction, dependencies=[Depends(require_model("yield"))])
+async def predict_yield_single(
+    row: YieldInput,
+    crop_cycle_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Forecast yield for a single field.
+    With a crop_cycle_id the forecast is saved to the cycle's yield history,
+    stamped with the model version that made it.
+    """
+    result = await predict_yield_async(
+        crop=row.crop, season=row.season, state=row.state, area=row.area,
+        rainfall=row.rainfall, fertilizer=row.fertilizer, pesticide=row.pesticide
+    )
+    prediction = _to_prediction(0, row, result)
+    prediction.model_version = get_model_version("yield")
+    
+    if crop_cycle_id and not prediction.error:
+        cycle = await crud.get_crop_cycle_by_id(db, crop_cycle_id)
+        if cycle is None:
+            raise HTTPException(status_code=404, detail="Crop cycle not found")
+        try:
+            await crud.create_yield_prediction(
+                db=db,
+                crop_cycle_db_id=cycle.id,
+                predicted_yield_kg=prediction.estimated_production * 1000,  # tonnes -> kg
+                confidence=prediction.confidence,
+                growth_stage_at_prediction=cycle.growth_stage,
+                health_status_at_prediction=cycle.health_status,
+                total_rainfall_mm=row.rainfall,
+                model_version=prediction.model_version
+            )
+        except Exception as log_error:
+            # Don't fail the forecast if logging fails
+            logger.warning(f"⚠️ Could not save yield prediction: {log_error}", exc_info=True)
+    
+    return prediction
+
+
+@router.post("/predict/batch", response_model=YieldBatchResponse, dependencies=[Depends(require_model("yield"))])
+async def predict_yield_batch(batch: YieldBatchInput):
+    """
+    District-level yield forecasting: up to 10,000 rows encoded, scaled and
+    predicted in a single pass, with per-district production totals.
+    """
+    rows = [
+        dict(crop=r.crop, season=r.season, state=r.state, area=r.area,
+             rainfall=r.rainfall, fertilizer=r.fertilizer, pesticide=r.pesticide)
+        for r in batch.rows
+    ]
+    try:
+        results = await predict_yield_many_async(rows)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch yield prediction failed: {e}")
+
+    predictions = [_to_prediction(i, row, result) for i, (row, result) in enumerate(zip(batch.rows, results))]
+
+    districts = {}
+    for row, prediction in zip(batch.rows, predictions):
+        if prediction.error:
+            continue
+        summary = districts.setdefault((row.state, row.district), DistrictSummary(
+            state=row.state, district=row.district, rows=0, total_area=0.0, estimated_production=0.0
+        ))
+        summary.rows += 1
+        summary.total_area += row.area
+        summary.estimated_production += prediction.estimated_production
+
+    failed = sum(1 for p in predictions if p.error)
+    return YieldBatchResponse(
+        success=failed < len(predictions),
+        count=len(predictions),
+        failed=failed,
+        predictions=predictions,
+        districts=list(districts.values()),
+        model_version=get_model_version("yield")
+    )
@@ -0,0 +1,39 @@
+"""
+Pagination Parameters
+Shared ?cursor=&limit=&include_total= query parameters for keyset-paginated
+list endpoints (see app/db/pagination.py)
+"""
+
+from typing import Hashable, Optional
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.pagination import InvalidCursor, Page, paginate
+
+
+class PageParams:
+    """Dependency: `params: PageParams = Depends()`"""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+        include_total: bool = Query(False, description="Send X-Total-Count (cached count)"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.include_total = include_total
+
+
+async def fetch_page(db: AsyncSession, statement, model, params: PageParams, response: Response,
+                     count_key: Hashable) -> Page:
+    """Run one page of `statement` and set its X-Next-Cursor / X-Total-Count headers"""
+    try:
+        page = await paginate(db, statement, model, params.cursor, params.limit,
+                              count_key=count_key if params.include_total else None)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers.update(page.headers())
+    return page
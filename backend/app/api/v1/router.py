@@ -6,7 +6,8 @@ ALL DATA IS PERSISTED TO DATABASE - No in-memory storage
 from fastapi import APIRouter
 from app.api.v1.endpoints import (
     auth, crop, disease, disease_history, weather, market, 
-    schemes, farmer, cropcycle, fertilizer, expense, ivr, export, complaints
+    schemes, farmer, cropcycle, fertilizer, expense, ivr, export, complaints,
+    yield_forecast
 )
 
 api_router = APIRouter()
@@ -16,6 +17,7 @@ api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(farmer.router, prefix="/farmer", tags=["Farmer Profile"])
 api_router.include_router(cropcycle.router, prefix="/cropcycle", tags=["Crop Lifecycle"])
 api_router.include_router(crop.router, prefix="/crop", tags=["Crop Advisory"])
+api_router.include_router(yield_forecast.router, prefix="/yield", tags=["Yield Forecasting"])
 api_router.include_router(fertilizer.router, prefix="/fertilizer", tags=["Fertilizer Advisory"])
 api_router.include_router(expense.router, prefix="/expense", tags=["Expense & Profit"])
 api_router.include_router(disease.router, prefix="/disease", tags=["Disease Detection"])
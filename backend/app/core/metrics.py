@@ -0,0 +1,143 @@
+"""
+Stage Timing Metrics
+Request-scoped timing spans aggregated into latency histograms
+
+    with span("disease", "decode"):
+        image = decode(contents)
+
+Every span is added to the (pipeline, stage) histogram served on /metrics in
+Prometheus text format. Inside a request (see the timing middleware in
+main.py) spans are also collected per request for the Server-Timing header.
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value_ms: float):
+        self.counts[bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (an estimate); None if empty or past the last bucket"""
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target and self.count:
+                return bound
+        return None
+
+
+class RequestTimings:
+    """Spans recorded while handling one request, in order"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []
+
+    def add(self, stage: str, duration_ms: float):
+        self.spans.append((stage, duration_ms))
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. 'read;dur=0.4, decode;dur=11.8, total;dur=40.2'"""
+        total = (time.perf_counter() - self.started) * 1000
+        parts = [f"{stage};dur={duration:.1f}" for stage, duration in self.spans]
+        parts.append(f"total;dur={total:.1f}")
+        return ", ".join(parts)
+
+
+_histograms: Dict[Tuple[str, str], Histogram] = {}
+_lock = threading.Lock()
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def observe(pipeline: str, stage: str, duration_ms: float):
+    """Record one stage duration in its histogram and, inside a request, in that request's timings"""
+    with _lock:
+        histogram = _histograms.get((pipeline, stage))
+        if histogram is None:
+            histogram = _histograms[(pipeline, stage)] = Histogram()
+        histogram.observe(duration_ms)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(stage, duration_ms)
+
+
+def reset():
+    """Drop all recorded histograms (e.g. after startup warmup traffic)"""
+    with _lock:
+        _histograms.clear()
+
+
+@contextmanager
+def span(pipeline: str, stage: str):
+    """Time the enclosed block as `stage` of `pipeline` (recorded even if it raises)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(pipeline, stage, (time.perf_counter() - started) * 1000)
+
+
+def start_request_timings() -> RequestTimings:
+    """Begin collecting spans for the current request (context-local, follows run_in_threadpool)"""
+    timings = RequestTimings()
+    _request_timings.set(timings)
+    return timings
+
+
+# ==================================================
+# EXPOSITION
+# ==================================================
+def _label(value: float) -> str:
+    return "+Inf" if value == float("inf") else f"{value:g}"
+
+
+def render_prometheus() -> str:
+    """All stage histograms in Prometheus text exposition format"""
+    name = "agrisahayak_stage_duration_ms"
+    lines = [f"# HELP {name} Duration of pipeline stages in milliseconds",
+             f"# TYPE {name} histogram"]
+    with _lock:
+        items = sorted((key, list(h.counts), h.count, h.sum, h.buckets) for key, h in _histograms.items())
+    for (pipeline, stage), counts, count, total, buckets in items:
+        labels = f'pipeline="{pipeline}",stage="{stage}"'
+        cumulative = 0
+        for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{labels},le="{_label(bound)}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {total:.3f}")
+        lines.append(f"{name}_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def stage_summary() -> Dict:
+    """{pipeline: {stage: count, mean_ms, p50_ms, p99_ms}} - quantiles are bucket upper bounds"""
+    summary: Dict[str, Dict] = {}
+    with _lock:
+        for (pipeline, stage), h in sorted(_histograms.items()):
+            summary.setdefault(pipeline, {})[stage] = {
+                "count": h.count,
+                "mean_ms": round(h.sum / h.count, 3) if h.count else None,
+                "p50_ms": h.quantile(0.5),
+                "p99_ms": h.quantile(0.99),
+            }
+    return summary
@@ -4,8 +4,11 @@ Database package initialization
 
 from app.db.database import (
     engine,
+    async_engine,
     SessionLocal,
+    AsyncSessionLocal,
     get_db,
+    get_async_db,
     get_db_session,
     create_tables,
     drop_tables,
@@ -29,8 +32,11 @@ from app.db.models import (
 __all__ = [
     # Database
     "engine",
+    "async_engine",
     "SessionLocal",
+    "AsyncSessionLocal",
     "get_db",
+    "get_async_db",
     "get_db_session", 
     "create_tables",
     "drop_tables",
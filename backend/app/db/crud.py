@@ -27,8 +27,13 @@ def generate_land_id() -> str:
 def generate_cycle_id() -> str:
     return f"CC{str(uuid.uuid4())[:6].upper()}"
 
-def generate_log_id(prefix: str = "LOG") -> str:
-    return f"{prefix}{str(uuid.uuid4())[:6].upper()}"
+# Disease logs are written in high volume (and in bulk), so their ids are longer:
+# 6 hex digits give 16^6 (~16.7M) ids and collide after a few thousand rows (birthday bound),
+# 12 give 16^12 (~2.8e14), so collisions stay unlikely until ~10^7 rows
+DISEASE_LOG_ID_LENGTH = 12
+
+def generate_log_id(prefix: str = "LOG", length: int = 6) -> str:
+    return f"{prefix}{uuid.uuid4().hex[:length].upper()}"
 
 
 # ==================================================
@@ -214,7 +219,7 @@ def create_disease_log(db: Session, disease_name: str, confidence: float,
                        crop_cycle_db_id: int = None, farmer_db_id: int = None, **kwargs) -> DiseaseLog:
     """Log a disease detection"""
     log = DiseaseLog(
-        log_id=generate_log_id("DIS"),
+        log_id=generate_log_id("DIS", DISEASE_LOG_ID_LENGTH),
         disease_name=disease_name,
         confidence=confidence,
         crop_cycle_id=crop_cycle_db_id,
@@ -227,6 +232,30 @@ def create_disease_log(db: Session, disease_name: str, confidence: float,
     return log
 
 
+def create_disease_logs_bulk(db: Session, records: List[Dict[str, Any]]) -> int:
+    """
+    Insert many disease detections in one transaction.
+    Records carry public farmer_id / crop_cycle_id strings; they are resolved
+    to row ids with one query each (unknown ids are stored as NULL).
+    """
+    if not records:
+        return 0
+    farmer_ids = {r["farmer_id"] for r in records if r.get("farmer_id")}
+    cycle_ids = {r["crop_cycle_id"] for r in records if r.get("crop_cycle_id")}
+    farmers = dict(db.query(Farmer.farmer_id, Farmer.id).filter(Farmer.farmer_id.in_(farmer_ids)).all()) if farmer_ids else {}
+    cycles = dict(db.query(CropCycle.cycle_id, CropCycle.id).filter(CropCycle.cycle_id.in_(cycle_ids)).all()) if cycle_ids else {}
+
+    rows = []
+    for record in records:
+        row = dict(record)
+        row["farmer_id"] = farmers.get(record.get("farmer_id"))
+        row["crop_cycle_id"] = cycles.get(record.get("crop_cycle_id"))
+        rows.append(row)
+    db.bulk_insert_mappings(DiseaseLog, rows)
+    db.commit()
+    return len(rows)
+
+
 def get_disease_logs_for_cycle(db: Session, crop_cycle_db_id: int) -> List[DiseaseLog]:
     """Get all disease logs for a crop cycle"""
     return db.query(DiseaseLog).filter(DiseaseLog.crop_cycle_id == crop_cycle_db_id).all()
@@ -0,0 +1,315 @@
+"""
+Async CRUD Operations
+AsyncSession counterparts of app/db/crud.py, used by the API endpoints
+
+Same names and arguments as the sync functions, awaited. AsyncSession cannot
+lazy-load relationships, so lookups eager-load the ones responses read:
+farmer.lands, land.farmer / land.crop_cycles and crop_cycle.land. Functions
+whose cycles are rendered with their activities (crop cycle endpoints) also
+load crop_cycle.activity_logs, one IN query for the whole result.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.db.crud import generate_farmer_id, generate_land_id, generate_cycle_id, generate_log_id, DISEASE_LOG_ID_LENGTH
+from app.db.pagination import invalidate_counts
+from app.db.models import (
+    Farmer, Land, CropCycle, DiseaseLog, YieldPrediction, ActivityLog
+)
+
+# Relationships loaded with each model
+FARMER_LOAD = (selectinload(Farmer.lands),)
+LAND_LOAD = (joinedload(Land.farmer), selectinload(Land.crop_cycles))
+CYCLE_LOAD = (joinedload(CropCycle.land),)
+CYCLE_ACTIVITIES_LOAD = CYCLE_LOAD + (selectinload(CropCycle.activity_logs),)
+
+
+def _farmers(*criteria):
+    return select(Farmer).options(*FARMER_LOAD).where(*criteria)
+
+
+def _lands(*criteria):
+    return select(Land).options(*LAND_LOAD).where(*criteria)
+
+
+def _cycles(*criteria, with_activities: bool = False):
+    load = CYCLE_ACTIVITIES_LOAD if with_activities else CYCLE_LOAD
+    return select(CropCycle).options(*load).where(*criteria)
+
+
+async def _first(db: AsyncSession, statement):
+    return (await db.execute(statement.limit(1))).scalars().first()
+
+
+async def _reload(db: AsyncSession, statement):
+    """Re-read a row after commit: columns and eager relationships (refresh() would expire relationships)"""
+    return await _first(db, statement.execution_options(populate_existing=True))
+
+
+async def _all(db: AsyncSession, statement) -> list:
+    return list((await db.execute(statement)).scalars().all())
+
+
+async def _count(db: AsyncSession, model, *criteria) -> int:
+    return (await db.execute(select(func.count()).select_from(model).where(*criteria))).scalar_one()
+
+
+# ==================================================
+# FARMER CRUD
+# ==================================================
+async def create_farmer(db: AsyncSession, name: str, phone: str, state: str, district: str, **kwargs) -> Farmer:
+    """Create a new farmer"""
+    farmer = Farmer(
+        farmer_id=generate_farmer_id(),
+        name=name,
+        phone=phone,
+        state=state,
+        district=district,
+        **kwargs
+    )
+    db.add(farmer)
+    await db.commit()
+    invalidate_counts("farmers")
+    return await _reload(db, _farmers(Farmer.id == farmer.id))
+
+
+async def get_farmer_by_id(db: AsyncSession, farmer_id: str) -> Optional[Farmer]:
+    """Get farmer by farmer_id (e.g., F123ABC)"""
+    return await _first(db, _farmers(Farmer.farmer_id == farmer_id))
+
+
+async def get_farmer_by_phone(db: AsyncSession, phone: str) -> Optional[Farmer]:
+    """Get farmer by phone number"""
+    return await _first(db, _farmers(Farmer.phone == phone))
+
+
+async def get_farmer_by_username(db: AsyncSession, username: str) -> Optional[Farmer]:
+    """Get farmer by username"""
+    return await _first(db, _farmers(Farmer.username == username.lower()))
+
+
+async def get_farmers(db: AsyncSession, skip: int = 0, limit: int = 100, state: Optional[str] = None) -> List[Farmer]:
+    """Get list of farmers with optional filtering"""
+    statement = _farmers(Farmer.is_active == True)
+    if state:
+        statement = statement.where(Farmer.state == state)
+    return await _all(db, statement.offset(skip).limit(limit))
+
+
+async def update_farmer(db: AsyncSession, farmer_id: str, **kwargs) -> Optional[Farmer]:
+    """Update farmer details"""
+    farmer = await get_farmer_by_id(db, farmer_id)
+    if farmer:
+        for key, value in kwargs.items():
+            if hasattr(farmer, key) and value is not None:
+                setattr(farmer, key, value)
+        await db.commit()
+        invalidate_counts("farmers")
+        farmer = await _reload(db, _farmers(Farmer.id == farmer.id))
+    return farmer
+
+
+# ==================================================
+# LAND CRUD
+# ==================================================
+async def create_land(db: AsyncSession, farmer_db_id: int, area_acres: float, **kwargs) -> Land:
+    """Create a new land parcel"""
+    land = Land(
+        land_id=generate_land_id(),
+        farmer_id=farmer_db_id,
+        area_acres=area_acres,
+        **kwargs
+    )
+    db.add(land)
+    await db.commit()
+    return await _reload(db, _lands(Land.id == land.id))
+
+
+async def get_land_by_id(db: AsyncSession, land_id: str) -> Optional[Land]:
+    """Get land by land_id"""
+    return await _first(db, _lands(Land.land_id == land_id))
+
+
+async def get_farmer_lands(db: AsyncSession, farmer_db_id: int) -> List[Land]:
+    """Get all lands for a farmer"""
+    return await _all(db, _lands(Land.farmer_id == farmer_db_id))
+
+
+async def update_land_soil(db: AsyncSession, land_id: str, nitrogen: float, phosphorus: float,
+                           potassium: float, ph: float, **kwargs) -> Optional[Land]:
+    """Update land soil test data"""
+    land = await get_land_by_id(db, land_id)
+    if land:
+        land.nitrogen = nitrogen
+        land.phosphorus = phosphorus
+        land.potassium = potassium
+        land.ph = ph
+        land.last_soil_test_date = datetime.now()
+        for key, value in kwargs.items():
+            if hasattr(land, key):
+                setattr(land, key, value)
+        await db.commit()
+        land = await _reload(db, _lands(Land.id == land.id))
+    return land
+
+
+# ==================================================
+# CROP CYCLE CRUD
+# ==================================================
+async def create_crop_cycle(db: AsyncSession, land_db_id: int, crop: str, season: str,
+                            sowing_date: datetime, expected_harvest: datetime = None, **kwargs) -> CropCycle:
+    """Start a new crop cycle"""
+    cycle = CropCycle(
+        cycle_id=generate_cycle_id(),
+        land_id=land_db_id,
+        crop=crop,
+        season=season,
+        sowing_date=sowing_date,
+        expected_harvest=expected_harvest,
+        **kwargs
+    )
+    db.add(cycle)
+    await db.commit()
+    return await _reload(db, _cycles(CropCycle.id == cycle.id, with_activities=True))
+
+
+async def get_crop_cycle_by_id(db: AsyncSession, cycle_id: str, with_activities: bool = False) -> Optional[CropCycle]:
+    """Get crop cycle by cycle_id"""
+    return await _first(db, _cycles(CropCycle.cycle_id == cycle_id, with_activities=with_activities))
+
+
+async def get_land_crop_cycles(db: AsyncSession, land_db_id: int, active_only: bool = True) -> List[CropCycle]:
+    """Get all crop cycles for a land, with their activity logs"""
+    statement = _cycles(CropCycle.land_id == land_db_id, with_activities=True)
+    if active_only:
+        statement = statement.where(CropCycle.is_active == True)
+    return await _all(db, statement.order_by(CropCycle.sowing_date.desc()))
+
+
+async def get_active_crop_cycles(db: AsyncSession, limit: int = 100) -> List[CropCycle]:
+    """Get all active crop cycles, with their activity logs"""
+    return await _all(db, _cycles(CropCycle.is_active == True, with_activities=True).limit(limit))
+
+
+async def update_crop_cycle_stage(db: AsyncSession, cycle_id: str, growth_stage: str) -> Optional[CropCycle]:
+    """Update crop cycle growth stage"""
+    cycle = await get_crop_cycle_by_id(db, cycle_id)
+    if cycle:
+        cycle.growth_stage = growth_stage
+        await db.commit()
+        cycle = await _reload(db, _cycles(CropCycle.id == cycle.id))
+    return cycle
+
+
+async def update_crop_cycle_health(db: AsyncSession, cycle_id: str, health_status: str) -> Optional[CropCycle]:
+    """Update crop cycle health status"""
+    cycle = await get_crop_cycle_by_id(db, cycle_id)
+    if cycle:
+        cycle.health_status = health_status
+        await db.commit()
+        cycle = await _reload(db, _cycles(CropCycle.id == cycle.id))
+    return cycle
+
+
+async def complete_crop_cycle(db: AsyncSession, cycle_id: str, actual_yield_kg: float,
+                              selling_price_per_kg: float = None) -> Optional[CropCycle]:
+    """Complete a crop cycle with harvest data"""
+    cycle = await get_crop_cycle_by_id(db, cycle_id)
+    if cycle:
+        cycle.is_active = False
+        cycle.actual_harvest = datetime.now()
+        cycle.actual_yield_kg = actual_yield_kg
+        cycle.growth_stage = "harvest"
+        if selling_price_per_kg:
+            cycle.selling_price_per_kg = selling_price_per_kg
+            cycle.total_revenue = actual_yield_kg * selling_price_per_kg
+            cycle.profit = cycle.total_revenue - (cycle.total_cost or 0)
+        await db.commit()
+        cycle = await _reload(db, _cycles(CropCycle.id == cycle.id))
+    return cycle
+
+
+# ==================================================
+# DISEASE LOG CRUD
+# ==================================================
+async def create_disease_log(db: AsyncSession, disease_name: str, confidence: float,
+                             crop_cycle_db_id: int = None, farmer_db_id: int = None, **kwargs) -> DiseaseLog:
+    """Log a disease detection"""
+    log = DiseaseLog(
+        log_id=generate_log_id("DIS", DISEASE_LOG_ID_LENGTH),
+        disease_name=disease_name,
+        confidence=confidence,
+        crop_cycle_id=crop_cycle_db_id,
+        farmer_id=farmer_db_id,
+        **kwargs
+    )
+    db.add(log)
+    await db.commit()
+    await db.refresh(log)
+    return log
+
+
+async def get_disease_logs_for_cycle(db: AsyncSession, crop_cycle_db_id: int) -> List[DiseaseLog]:
+    """Get all disease logs for a crop cycle"""
+    return await _all(db, select(DiseaseLog).where(DiseaseLog.crop_cycle_id == crop_cycle_db_id))
+
+
+async def get_recent_disease_logs(db: AsyncSession, limit: int = 50) -> List[DiseaseLog]:
+    """Get recent disease detections"""
+    return await _all(db, select(DiseaseLog).order_by(DiseaseLog.detected_at.desc()).limit(limit))
+
+
+# ==================================================
+# YIELD PREDICTION CRUD
+# ==================================================
+async def create_yield_prediction(db: AsyncSession, crop_cycle_db_id: int, predicted_yield_kg: float,
+                                  confidence: float, **kwargs) -> YieldPrediction:
+    """Record a yield prediction"""
+    prediction = YieldPrediction(
+        prediction_id=generate_log_id("YLD"),
+        crop_cycle_id=crop_cycle_db_id,
+        predicted_yield_kg=predicted_yield_kg,
+        confidence=confidence,
+        **kwargs
+    )
+    db.add(prediction)
+    await db.commit()
+    await db.refresh(prediction)
+    return prediction
+
+
+# ==================================================
+# ACTIVITY LOG CRUD
+# ==================================================
+async def create_activity_log(db: AsyncSession, crop_cycle_db_id: int, activity_type: str,
+                              activity_date: datetime, **kwargs) -> ActivityLog:
+    """Log a farming activity"""
+    activity = ActivityLog(
+        crop_cycle_id=crop_cycle_db_id,
+        activity_type=activity_type,
+        activity_date=activity_date,
+        **kwargs
+    )
+    db.add(activity)
+    await db.commit()
+    await db.refresh(activity)
+    return activity
+
+
+# ==================================================
+# STATISTICS
+# ==================================================
+async def get_platform_stats(db: AsyncSession) -> Dict[str, Any]:
+    """Get platform-wide statistics"""
+    return {
+        "total_farmers": await _count(db, Farmer, Farmer.is_active == True),
+        "total_lands": await _count(db, Land),
+        "active_crop_cycles": await _count(db, CropCycle, CropCycle.is_active == True),
+        "total_disease_detections": await _count(db, DiseaseLog),
+        "total_yield_predictions": await _count(db, YieldPrediction)
+    }
@@ -3,7 +3,7 @@ SQLAlchemy Database Models for AgriSahayak
 Tables: farmers, lands, crop_cycles, disease_logs, yield_predictions
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -61,6 +61,13 @@ class IrrigationType(str, enum.Enum):
 class Farmer(Base):
     """Farmer profile table"""
     __tablename__ = "farmers"
+    __table_args__ = (
+        # Admin lists / complaint lookups by district; farmer list filtered by state
+        Index("ix_farmers_district", "district"),
+        Index("ix_farmers_state_active", "state", "is_active"),
+        # Keyset pagination of admin listings (newest first)
+        Index("ix_farmers_created_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     farmer_id = Column(String(20), unique=True, index=True, nullable=False)
@@ -144,6 +151,12 @@ class Land(Base):
 class CropCycle(Base):
     """Crop lifecycle tracking table"""
     __tablename__ = "crop_cycles"
+    __table_args__ = (
+        # Cycles of a land (active only), newest sowing first
+        Index("ix_crop_cycles_land_active_sowing", "land_id", "is_active", "sowing_date"),
+        # Active cycles dashboard / export
+        Index("ix_crop_cycles_active_sowing", "is_active", "sowing_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     cycle_id = Column(String(20), unique=True, index=True, nullable=False)
@@ -187,6 +200,8 @@ class CropCycle(Base):
     land = relationship("Land", back_populates="crop_cycles")
     disease_logs = relationship("DiseaseLog", back_populates="crop_cycle", cascade="all, delete-orphan")
     yield_predictions = relationship("YieldPrediction", back_populates="crop_cycle", cascade="all, delete-orphan")
+    activity_logs = relationship("ActivityLog", back_populates="crop_cycle", cascade="all, delete-orphan",
+                                 order_by="desc(ActivityLog.activity_date)")
     
     def __repr__(self):
         return f"<CropCycle {self.cycle_id}: {self.crop}>"
@@ -195,6 +210,12 @@ class CropCycle(Base):
 class DiseaseLog(Base):
     """Disease detection logs table"""
     __tablename__ = "disease_logs"
+    __table_args__ = (
+        # Export date ranges / recent detections, disease distribution, logs of a cycle
+        Index("ix_disease_logs_detected_at", "detected_at"),
+        Index("ix_disease_logs_disease_name", "disease_name"),
+        Index("ix_disease_logs_crop_cycle", "crop_cycle_id", "detected_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     log_id = Column(String(20), unique=True, index=True, nullable=False)
@@ -216,6 +237,9 @@ class DiseaseLog(Base):
     treatment_date = Column(DateTime, nullable=True)
     recovery_date = Column(DateTime, nullable=True)
     
+    # Model info (registry version that made the detection)
+    model_version = Column(String(20), nullable=True)
+    
     detected_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -264,6 +288,10 @@ class YieldPrediction(Base):
 class ActivityLog(Base):
     """Farming activity logs"""
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        # Activities of a cycle, newest first
+        Index("ix_activity_logs_cycle_date", "crop_cycle_id", "activity_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     crop_cycle_id = Column(Integer, ForeignKey("crop_cycles.id", ondelete="CASCADE"), nullable=False)
@@ -275,6 +303,9 @@ class ActivityLog(Base):
     
     activity_date = Column(DateTime, nullable=False)
     logged_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    crop_cycle = relationship("CropCycle", back_populates="activity_logs")
 
 
 class MarketPriceLog(Base):
@@ -315,6 +346,15 @@ class ComplaintUrgency(str, enum.Enum):
 class Complaint(Base):
     """Farmer complaints for admin review"""
     __tablename__ = "complaints"
+    __table_args__ = (
+        # A farmer's complaints newest first; per-status counts for a district's farmers;
+        # admin list filtered by status
+        Index("ix_complaints_farmer_created", "farmer_id", "created_at"),
+        Index("ix_complaints_farmer_status", "farmer_id", "status"),
+        Index("ix_complaints_status_created", "status", "created_at"),
+        # Keyset pagination of admin listings (newest first)
+        Index("ix_complaints_created_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     complaint_id = Column(String(20), unique=True, index=True, nullable=False)
@@ -0,0 +1,121 @@
+"""
+Keyset Pagination
+Cursor pages over (created_at, id), newest first, for admin listings
+
+    page = await paginate(db, select(Farmer).where(...), Farmer, cursor, limit)
+    page.items, page.next_cursor
+
+Each page continues strictly after the last row of the previous one, using
+the (created_at, id) indexes. Its cost does not depend on how deep the
+page is, unlike OFFSET. Cursors are opaque URL-safe tokens. Totals are
+optional and come from a short-lived per-query counter cache, so paging
+does not run COUNT(*) every time.
+"""
+
+import json
+import time
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import String, and_, func, or_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+class InvalidCursor(ValueError):
+    """Cursor token that was not produced by this module (or is corrupted)"""
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str] = None  # None on the last page
+    total: Optional[int] = None  # only when requested
+
+    def headers(self) -> Dict[str, str]:
+        """X-Next-Cursor / X-Total-Count response headers for list endpoints"""
+        headers = {}
+        if self.next_cursor:
+            headers["X-Next-Cursor"] = self.next_cursor
+        if self.total is not None:
+            headers["X-Total-Count"] = str(self.total)
+        return headers
+
+
+def _sort_key(model, dialect: str):
+    # SQLite keeps DateTime as text, and server-default timestamps
+    # ("2026-01-01 10:00:00") are formatted differently from bound datetimes
+    # ("2026-01-01 10:00:00.000000"). So the cursor carries the stored text,
+    # which compares exactly.
+    if dialect == "sqlite":
+        return type_coerce(model.created_at, String)
+    return model.created_at
+
+
+def encode_cursor(created_at: Any, row_id: int) -> str:
+    value = created_at if isinstance(created_at, str) else created_at.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, dialect: str) -> Tuple[Any, int]:
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if not isinstance(value, str) or not isinstance(row_id, int):
+            raise ValueError("unexpected cursor payload")
+        return (value if dialect == "sqlite" else datetime.fromisoformat(value)), row_id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {token!r}") from e
+
+
+def keyset_statement(statement, model, cursor: Optional[str], limit: int, dialect: str):
+    """`statement` ordered newest first, after `cursor`, with the sort key as an extra column"""
+    key = _sort_key(model, dialect)
+    paged = statement.add_columns(key.label("keyset_created_at")).order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        after, after_id = decode_cursor(cursor, dialect)
+        paged = paged.where(or_(key < after, and_(key == after, model.id < after_id)))
+    return paged.limit(limit)
+
+
+async def paginate(db: AsyncSession, statement, model, cursor: Optional[str] = None,
+                   limit: int = 50, count_key: Optional[Hashable] = None) -> Page:
+    """
+    One page of `statement` (a select of `model`, with its filters/options),
+    newest first. Pass `count_key` (a hashable description of the filters)
+    to also get the total, served from the counter cache.
+    """
+    rows = (await db.execute(keyset_statement(statement, model, cursor, limit + 1, db.bind.dialect.name))).all()
+    page = Page(items=[row[0] for row in rows[:limit]])
+    if len(rows) > limit:
+        last, last_key = rows[limit - 1]
+        page.next_cursor = encode_cursor(last_key, last.id)
+    if count_key is not None:
+        page.total = await cached_count(db, statement.with_only_columns(func.count(model.id)), count_key)
+    return page
+
+
+# ==================================================
+# COUNTER CACHE
+# ==================================================
+COUNT_CACHE: Dict[Hashable, Dict] = {}
+
+
+async def cached_count(db: AsyncSession, count_statement, key: Hashable) -> int:
+    """Result of a COUNT statement, cached per key for PAGINATION_COUNT_CACHE_SECONDS"""
+    cached = COUNT_CACHE.get(key)
+    if cached and time.monotonic() - cached["timestamp"] < settings.PAGINATION_COUNT_CACHE_SECONDS:
+        return cached["count"]
+    count = (await db.execute(count_statement)).scalar_one()
+    if settings.PAGINATION_COUNT_CACHE_SECONDS > 0:
+        COUNT_CACHE[key] = {"count": count, "timestamp": time.monotonic()}
+    return count
+
+
+def invalidate_counts(table: str):
+    """Drop cached totals for a table (keys start with the table name) after inserts/updates"""
+    for key in [k for k in COUNT_CACHE if isinstance(k, tuple) and k and k[0] == table]:
+        COUNT_CACHE.pop(key, None)
@@ -0,0 +1,376 @@
+"""
+Write-Behind Disease Log Writer
+Buffers disease detections in memory and persists them in bulk inserts off the
+request path, so /disease/detect never waits on the database.
+
+A background thread flushes when DISEASE_LOG_BATCH_SIZE records are pending or
+the oldest has waited DISEASE_LOG_FLUSH_INTERVAL_MS. Records that cannot be
+written at shutdown (or overflow DISEASE_LOG_MAX_BUFFER while the database is
+down) are appended to DISEASE_LOG_SPILL_PATH as JSON lines and inserted on the
+next startup. If a batch is rejected because of its contents (constraint or
+data errors), it is inserted row by row. Rows that still fail are moved to
+DISEASE_LOG_DEAD_LETTER_PATH, so one bad record cannot block the queue.
+"""
+
+import json
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.core.config import settings
+from app.core.metrics import observe
+from app.db import crud
+
+logger = logging.getLogger(__name__)
+
+
+class DiseaseLogWriter:
+    """
+    Background bulk writer for DiseaseLog rows.
+
+    `enqueue()` only appends to an in-memory buffer. The writer thread takes
+    everything pending and inserts it with `crud.create_disease_logs_bulk` in
+    one transaction. If the database is unavailable, the flush keeps the
+    records and retries with exponential backoff (up to MAX_RETRY_SECONDS). If
+    a batch is rejected for bad rows, the rows are written one by one, and the
+    ones that fail are dead-lettered.
+    """
+
+    MAX_RETRY_SECONDS = 30.0
+    BAD_ROW_ERRORS = (IntegrityError, DataError)
+
+    def __init__(self, session_factory: Callable, batch_size: int = 100, flush_interval_ms: float = 1000,
+                 max_buffer: int = 10000, spill_path: Optional[Path] = None,
+                 dead_letter_path: Optional[Path] = None):
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.01, flush_interval_ms / 1000.0)
+        self.max_buffer = max(self.batch_size, max_buffer)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.dead_letter_path = Path(dead_letter_path) if dead_letter_path else None
+
+        self._buffer: List[Tuple[float, Dict[str, Any]]] = []  # (enqueued monotonic time, record)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Counters
+        self._enqueued = 0
+        self._written = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._consecutive_failures = 0
+        self._spilled = 0
+        self._replayed = 0
+        self._dead_lettered = 0
+        self._last_flush_lag_ms = 0.0
+        self._max_flush_lag_ms = 0.0
+        self._last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Insert records spilled by the previous run, then start the writer thread"""
+        self._replay_spill()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="disease-log-writer", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, disease_name: str, confidence: float, farmer_id: Optional[str] = None,
+                crop_cycle_id: Optional[str] = None, **fields) -> str:
+        """Buffer one detection (farmer_id / crop_cycle_id are public ids); returns its log_id"""
+        record = {
+            "log_id": crud.generate_log_id("DIS", crud.DISEASE_LOG_ID_LENGTH),
+            "disease_name": disease_name,
+            "confidence": confidence,
+            "farmer_id": farmer_id,
+            "crop_cycle_id": crop_cycle_id,
+            "detected_at": datetime.now(timezone.utc),
+            **fields,
+        }
+        with self._lock:
+            self._buffer.append((time.monotonic(), record))
+            self._enqueued += 1
+            pending = len(self._buffer)
+        if pending >= self.batch_size:
+            self._wake.set()
+        return record["log_id"]
+
+    def flush(self) -> int:
+        """Write everything pending now; returns rows written (0 if the database was unavailable)"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            written, done, rejected, error = self._write([record for _, record in batch])
+            if rejected:
+                self._dead_letter(rejected)
+            if error is not None:
+                unwritten = batch[done:]
+                with self._lock:
+                    # Keep order: the unwritten records go back in front of anything enqueued meanwhile
+                    self._buffer = unwritten + self._buffer
+                    self._written += written
+                    self._failed_flushes += 1
+                    self._consecutive_failures += 1
+                    self._last_error = str(error)
+                    overflow = len(self._buffer) - self.max_buffer
+                    if overflow > 0:
+                        spilled, self._buffer = self._buffer[:overflow], self._buffer[overflow:]
+                    else:
+                        spilled = []
+                logger.warning(f"⚠️ Disease log flush of {len(unwritten)} records failed: {error}")
+                if spilled:
+                    self._spill(spilled)
+                return written
+
+            now = time.monotonic()
+            observe("disease_log", "flush", (time.perf_counter() - started) * 1000)
+            lags = [(now - enqueued_at) * 1000 for enqueued_at, _ in batch]
+            for lag in lags:
+                observe("disease_log", "flush_lag", lag)
+            with self._lock:
+                self._written += written
+                self._flushes += 1
+                self._consecutive_failures = 0
+                self._last_flush_lag_ms = max(lags)
+                self._max_flush_lag_ms = max(self._max_flush_lag_ms, self._last_flush_lag_ms)
+                self._last_error = None
+            return written
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Stop the thread, flush what is left and spill anything that still cannot be written"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+        with self._lock:
+            remaining, self._buffer = self._buffer, []
+        if remaining:
+            self._spill(remaining)
+
+    def stats(self) -> Dict:
+        """Writer counters and flush lag for health/diagnostics endpoints"""
+        with self._lock:
+            oldest = self._buffer[0][0] if self._buffer else None
+            return {
+                "running": self.running,
+                "pending": len(self._buffer),
+                "oldest_pending_ms": round((time.monotonic() - oldest) * 1000, 1) if oldest is not None else 0.0,
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "flushes": self._flushes,
+                "failed_flushes": self._failed_flushes,
+                "spilled": self._spilled,
+                "replayed": self._replayed,
+                "dead_lettered": self._dead_lettered,
+                "last_flush_lag_ms": round(self._last_flush_lag_ms, 1),
+                "max_flush_lag_ms": round(self._max_flush_lag_ms, 1),
+                "last_error": self._last_error,
+                "batch_size": self.batch_size,
+                "flush_interval_ms": self.flush_interval * 1000,
+            }
+
+    # ==================================================
+    # INTERNALS
+    # ==================================================
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self._next_wait())
+            self._wake.clear()
+            if self._stopping:
+                break
+            with self._lock:
+                due = self._buffer and (len(self._buffer) >= self.batch_size or
+                                        time.monotonic() - self._buffer[0][0] >= self.flush_interval)
+            if due:
+                self.flush()
+            if self._consecutive_failures:
+                # Database unavailable - back off instead of retrying on every wakeup
+                backoff = min(self.MAX_RETRY_SECONDS, self.flush_interval * 2 ** self._consecutive_failures)
+                if self._wake.wait(backoff):
+                    self._wake.clear()
+
+    def _write(self, records: List[Dict[str, Any]]) -> Tuple[int, int, List[Tuple[Dict[str, Any], str]], Optional[Exception]]:
+        """
+        Insert records, isolating bad rows.
+
+        Returns (rows written, records handled, rejected (record, error) pairs,
+        error). The error is set when the database failed for reasons that are
+        not about the rows. In that case records[handled:] were not written and
+        should be retried.
+        """
+        try:
+            db = self.session_factory()
+        except Exception as e:
+            return 0, 0, [], e
+        try:
+            try:
+                return crud.create_disease_logs_bulk(db, records), len(records), [], None
+            except self.BAD_ROW_ERRORS as e:
+                db.rollback()
+                if len(records) == 1:
+                    return self._write_one(db, records[0])
+                logger.warning(f"⚠️ Disease log batch of {len(records)} rejected, inserting row by row: {e}")
+            except Exception as e:
+                return 0, 0, [], e
+
+            written, rejected = 0, []
+            for i, record in enumerate(records):
+                count, _, bad, error = self._write_one(db, record)
+                if error is not None:
+                    return written, i, rejected, error
+                written += count
+                rejected += bad
+            return written, len(records), rejected, None
+        finally:
+            db.close()
+
+    def _write_one(self, db, record: Dict[str, Any]) -> Tuple[int, int, List[Tuple[Dict[str, Any], str]], Optional[Exception]]:
+        """Insert one record; on a unique violation retry once with a fresh log_id (a collision)"""
+        attempt = record
+        for retry in range(2):
+            try:
+                return crud.create_disease_logs_bulk(db, [attempt]), 1, [], None
+            except IntegrityError as e:
+                db.rollback()
+                if retry:
+                    return 0, 1, [(record, str(e))], None
+                attempt = {**record, "log_id": crud.generate_log_id("DIS", crud.DISEASE_LOG_ID_LENGTH)}
+            except DataError as e:
+                db.rollback()
+                return 0, 1, [(record, str(e))], None
+            except Exception as e:
+                return 0, 0, [], e
+
+    def _next_wait(self) -> float:
+        """Seconds until the oldest pending record reaches the flush interval"""
+        with self._lock:
+            if not self._buffer:
+                return self.flush_interval
+            return max(0.0, self.flush_interval - (time.monotonic() - self._buffer[0][0]))
+
+    @staticmethod
+    def _append_lines(path: Path, records: List[Dict[str, Any]], mode: str = "a"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, mode, encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps({**record, "detected_at": record["detected_at"].isoformat()}) + "\n")
+            f.flush()
+
+    def _spill(self, batch: List[Tuple[float, Dict[str, Any]]]):
+        if self.spill_path is None:
+            logger.error(f"❌ Dropping {len(batch)} unwritten disease logs (no DISEASE_LOG_SPILL_PATH)")
+            return
+        try:
+            self._append_lines(self.spill_path, [record for _, record in batch])
+        except OSError as e:
+            logger.error(f"❌ Could not spill {len(batch)} disease logs to {self.spill_path}: {e}")
+            return
+        with self._lock:
+            self._spilled += len(batch)
+        logger.warning(f"⚠️ Spilled {len(batch)} unwritten disease logs to {self.spill_path}")
+
+    def _dead_letter(self, rejected: List[Tuple[Dict[str, Any], str]]):
+        """Quarantine records the database refuses, with the error, so they are never retried"""
+        with self._lock:
+            self._dead_lettered += len(rejected)
+        logger.error(f"❌ {len(rejected)} disease logs rejected by the database: {rejected[0][1]}")
+        if self.dead_letter_path is None:
+            return
+        try:
+            self._append_lines(self.dead_letter_path, [{**record, "error": error} for record, error in rejected])
+        except OSError as e:
+            logger.error(f"❌ Could not dead-letter {len(rejected)} disease logs to {self.dead_letter_path}: {e}")
+
+    def _replay_spill(self):
+        """
+        Insert a previous run's spill file (bad rows are dead-lettered). If the
+        database is unavailable, the unwritten records are kept for the next start.
+        """
+        if self.spill_path is None or not self.spill_path.is_file():
+            return
+        records = []
+        with open(self.spill_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    record["detected_at"] = datetime.fromisoformat(record["detected_at"])
+                except (ValueError, KeyError):
+                    # Torn last line from a crash mid-write
+                    continue
+                records.append(record)
+        written, done, rejected, error = self._write(records)
+        if rejected:
+            self._dead_letter(rejected)
+        with self._lock:
+            self._replayed += written
+        if error is not None:
+            # Rewrite the file with only the unwritten records so they are not inserted twice
+            self._append_lines(self.spill_path, records[done:], mode="w")
+            logger.warning(f"⚠️ Could not replay {len(records) - done} spilled disease logs, will retry next start: {error}")
+            return
+        self.spill_path.unlink()
+        logger.info(f"✅ Replayed {written} spilled disease logs from {self.spill_path}")
+
+
+# ==================================================
+# PROCESS-WIDE WRITER
+# ==================================================
+_writer: Optional[DiseaseLogWriter] = None
+
+
+def start_disease_log_writer() -> Optional[DiseaseLogWriter]:
+    """Start the shared writer if DISEASE_LOG_WRITE_BEHIND is on"""
+    global _writer
+    if not settings.DISEASE_LOG_WRITE_BEHIND or _writer is not None:
+        return _writer
+    from app.db.database import SessionLocal
+
+    _writer = DiseaseLogWriter(
+        SessionLocal,
+        batch_size=settings.DISEASE_LOG_BATCH_SIZE,
+        flush_interval_ms=settings.DISEASE_LOG_FLUSH_INTERVAL_MS,
+        max_buffer=settings.DISEASE_LOG_MAX_BUFFER,
+        spill_path=Path(settings.DISEASE_LOG_SPILL_PATH) if settings.DISEASE_LOG_SPILL_PATH else None,
+        dead_letter_path=Path(settings.DISEASE_LOG_DEAD_LETTER_PATH) if settings.DISEASE_LOG_DEAD_LETTER_PATH else None,
+    )
+    _writer.start()
+    logger.info(f"✅ Disease log writer started (batch {_writer.batch_size}, "
+                f"every {settings.DISEASE_LOG_FLUSH_INTERVAL_MS:.0f} ms)")
+    return _writer
+
+
+def stop_disease_log_writer():
+    """Flush and stop the shared writer (spilling to disk whatever cannot be written)"""
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+def get_disease_log_writer() -> Optional[DiseaseLogWriter]:
+    """The running writer, or None when detections should be written inline"""
+    return _writer if _writer is not None and _writer.running else None
+
+
+def disease_log_writer_stats() -> Dict:
+    if _writer is None:
+        return {"enabled": settings.DISEASE_LOG_WRITE_BEHIND, "running": False}
+    return {"enabled": True, **_writer.stats()}
@@ -3,18 +3,26 @@ AgriSahayak - FastAPI Backend
 AI-Powered Smart Agriculture Platform
 """
 
-from fastapi import FastAPI
+from app.ml.threads import apply_thread_env
+apply_thread_env()  # OMP/BLAS thread counts must be set before numpy/torch are imported
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
-import torch
 import os
 
 from app.api.v1.router import api_router
 from app.core.config import settings
-from app.ml_service import load_all_models
+from app.core.metrics import start_request_timings, render_prometheus, stage_summary
+from app.ml_service import (
+    load_all_models, start_background_loading, all_models_ready, get_readiness, get_model_load_status, get_device_info,
+    get_inference_stats, stop_worker_pool, stop_model_registry
+)
 from app.db import create_tables, get_db_info
+from app.db.database import dispose_async_engine
+from app.db.writer import start_disease_log_writer, stop_disease_log_writer, disease_log_writer_stats
 
 
 @asynccontextmanager
@@ -22,22 +30,31 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
     print("🚀 Starting AgriSahayak Backend...")
-    print(f"🔥 CUDA Available: {torch.cuda.is_available()}")
-    if torch.cuda.is_available():
-        print(f"🎮 GPU: {torch.cuda.get_device_name(0)}")
+    device = get_device_info()
+    print(f"🔥 CUDA Available: {device['cuda']}")
+    if device['cuda']:
+        print(f"🎮 GPU: {device['gpu']}")
     
     # Initialize database
     print("📦 Initializing database...")
     create_tables()
     db_info = get_db_info()
     print(f"✅ Database ready: {db_info['engine']}")
+    start_disease_log_writer()
     
-    # Load all ML models
-    load_all_models()
+    # Load all ML models - in the background unless startup should wait for them
+    if settings.BACKGROUND_MODEL_LOADING:
+        start_background_loading()
+    else:
+        load_all_models()
     
     yield
     # Shutdown
     print("👋 Shutting down AgriSahayak...")
+    stop_model_registry()
+    stop_worker_pool()
+    stop_disease_log_writer()
+    await dispose_async_engine()
 
 
 app = FastAPI(
@@ -54,8 +71,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],  # keyset-paginated listings
 )
 
+# Per-stage timing spans for each request (optionally sent back as Server-Timing)
+@app.middleware("http")
+async def stage_timing(request: Request, call_next):
+    timings = start_request_timings()
+    response = await call_next(request)
+    if settings.SERVER_TIMING_ENABLED and timings.spans:
+        response.headers["Server-Timing"] = timings.server_timing()
+    return response
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -73,7 +100,7 @@ async def root():
     return {
         "message": "🌾 AgriSahayak API - Smart Agriculture Platform",
         "version": "1.0.0",
-        "cuda_available": torch.cuda.is_available(),
+        "cuda_available": get_device_info()["cuda"],
         "docs": "/docs"
     }
 
@@ -91,8 +118,38 @@ async def health_check():
     db_info = get_db_info()
     return {
         "status": "healthy",
-        "cuda": torch.cuda.is_available(),
-        "gpu": torch.cuda.get_device_name(0) if torch.cuda.is_available() else None,
-        "database": db_info
+        **get_device_info(),
+        "database": db_info,
+        "disease_log_writer": disease_log_writer_stats(),
+        "models_ready": all_models_ready(),
+        "models": get_model_load_status(),
+        "ml": get_inference_stats()
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Load-balancer readiness: 503 until models are loaded, or if warmup exceeded a latency SLO"""
+    ready, reasons = get_readiness()
+    return JSONResponse(status_code=200 if ready else 503, content={"ready": ready, "reasons": reasons})
+
+
+@app.get("/diagnostics/warmup")
+async def warmup_diagnostics():
+    """Warmup latencies (p50/p99 per batch size) measured when each model loaded"""
+    return {
+        name: {key: state.get(key) for key in ("state", "load_seconds", "warmup", "slo_breach")}
+        for name, state in get_model_load_status().items()
     }
 
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Stage latency histograms in Prometheus text format"""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/diagnostics/stages")
+async def stage_diagnostics():
+    """Per-stage request counts, mean and approximate p50/p99 (histogram bucket bounds)"""
+    return stage_summary()
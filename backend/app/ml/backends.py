@@ -0,0 +1,270 @@
+"""
+Inference Backends for the Disease Classifier
+Eager PyTorch, frozen TorchScript and ONNX Runtime runners behind one interface
+
+Export compiled artifacts (run from backend/):
+    python -m app.ml.backends --backend onnx
+    python -m app.ml.backends --backend torchscript
+
+The INT8 graph for the `onnx-int8` backend is written by `python -m app.ml.quantize disease`.
+
+Both HuggingFace classifiers and plain PyTorch modules (a local `.pth`) are
+supported. Plain modules are called positionally and must carry an
+`id2label` attribute, which ml_service sets from a `<name>.labels.json`
+sidecar next to the `.pth`.
+"""
+
+import copy
+import json
+import argparse
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+logger = logging.getLogger(__name__)
+
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+
+# Artifacts live next to the original weights in ml/models/
+ARTIFACTS = {
+    "torchscript": "disease_detector.torchscript.pt",
+    "onnx": "disease_detector.onnx",
+    "onnx-int8": "disease_detector.int8.onnx",
+}
+EXPORTABLE = ("torchscript", "onnx")
+LABELS_FILE = "disease_detector.labels.json"
+DEFAULT_IMAGE_SIZE = 224
+
+
+# ==================================================
+# RUNNERS - pixel_values (N, 3, H, W) -> logits (N, C)
+# ==================================================
+def model_id2label(model: nn.Module) -> Dict[int, str]:
+    """Class labels of a HuggingFace classifier (config.id2label) or a plain module (id2label attribute)"""
+    config = getattr(model, "config", None)
+    labels = getattr(config, "id2label", None) or getattr(model, "id2label", None)
+    if not labels:
+        raise ValueError(f"{type(model).__name__} has no class labels (config.id2label or id2label attribute)")
+    return {int(k): v for k, v in labels.items()}
+
+
+def _logits(model: nn.Module, pixel_values: torch.Tensor) -> torch.Tensor:
+    """HuggingFace classifiers take pixel_values= and return .logits; plain modules return logits"""
+    if getattr(model, "config", None) is not None:
+        outputs = model(pixel_values=pixel_values)
+    else:
+        outputs = model(pixel_values)
+    return outputs.logits if hasattr(outputs, "logits") else outputs
+
+
+class _LogitsOnly(nn.Module):
+    """Wraps a classifier so tracing/export sees a plain tensor output"""
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        return _logits(self.model, pixel_values)
+
+
+class EagerBackend:
+    """Runs the loaded PyTorch model directly"""
+
+    name = "eager"
+
+    def __init__(self, model: nn.Module, device: torch.device = None):
+        self.model = model
+        self.device = device or torch.device("cpu")
+        self.id2label = model_id2label(model)
+
+    def __call__(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        with torch.no_grad():
+            return _logits(self.model, pixel_values.to(self.device))
+
+
+class TorchScriptBackend:
+    """Runs a frozen TorchScript module exported by `export_disease_model`"""
+
+    name = "torchscript"
+
+    def __init__(self, path: Path, id2label: Dict[int, str]):
+        module = torch.jit.load(str(path), map_location="cpu")
+        module.eval()
+        try:
+            module = torch.jit.optimize_for_inference(module)
+        except Exception as e:
+            logger.warning(f"⚠️ optimize_for_inference skipped for {path.name}: {e}")
+        self.module = module
+        self.id2label = id2label
+
+    def __call__(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        with torch.no_grad():
+            return self.module(pixel_values.cpu())
+
+
+class OnnxBackend:
+    """Runs an ONNX graph on the ONNX Runtime CPU execution provider"""
+
+    def __init__(self, path: Path, id2label: Dict[int, str], intra_op_threads: int = 0, name: str = "onnx"):
+        self.name = name
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.id2label = id2label
+
+    def __call__(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        inputs = np.ascontiguousarray(pixel_values.cpu().numpy(), dtype=np.float32)
+        logits = self.session.run(None, {self.input_name: inputs})[0]
+        return torch.from_numpy(logits)
+
+
+# ==================================================
+# EXPORT
+# ==================================================
+def _write_labels(model: nn.Module, output_dir: Path, image_size: int):
+    id2label = model_id2label(model)
+    with open(output_dir / LABELS_FILE, "w") as f:
+        json.dump({"id2label": id2label, "image_size": image_size}, f, indent=2)
+
+
+def read_labels(model_dir: Path, filename: str = LABELS_FILE) -> Optional[Dict]:
+    """Labels and input size stored alongside exported artifacts (or a .pth sidecar)"""
+    path = model_dir / filename
+    if not path.exists():
+        return None
+    with open(path) as f:
+        data = json.load(f)
+    data["id2label"] = {int(k): v for k, v in data["id2label"].items()}
+    return data
+
+
+def export_disease_model(model: nn.Module, backend: str, output_dir: Path,
+                         image_size: int = DEFAULT_IMAGE_SIZE) -> Path:
+    """Export the loaded eager model to a TorchScript or ONNX artifact (from a CPU copy, the live model is untouched)"""
+    if backend not in EXPORTABLE:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from: {list(EXPORTABLE)}")
+
+    wrapper = _LogitsOnly(copy.deepcopy(model).cpu()).eval()
+    example = torch.randn(1, 3, image_size, image_size)
+    path = output_dir / ARTIFACTS[backend]
+
+    with torch.no_grad():
+        if backend == "torchscript":
+            traced = torch.jit.trace(wrapper, example)
+            frozen = torch.jit.freeze(traced)
+            torch.jit.save(frozen, str(path))
+        else:
+            torch.onnx.export(
+                wrapper, example, str(path),
+                input_names=["pixel_values"],
+                output_names=["logits"],
+                dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}},
+                opset_version=17,
+                do_constant_folding=True,
+            )
+
+    _write_labels(model, output_dir, image_size)
+    logger.info(f"✅ Exported disease model ({backend}) to {path}")
+    return path
+
+
+# ==================================================
+# LOADING & PARITY
+# ==================================================
+def load_compiled_disease_model(backend: str, model_dir: Path, intra_op_threads: int = 0):
+    """Load an exported artifact, or None if it is missing or the runtime is unavailable"""
+    if backend not in ARTIFACTS:
+        logger.warning(f"⚠️ Unknown disease backend '{backend}', using eager")
+        return None
+
+    path = model_dir / ARTIFACTS[backend]
+    labels = read_labels(model_dir)
+    if not path.exists() or labels is None:
+        logger.warning(f"⚠️ {backend} artifact not found at {path}")
+        return None
+
+    if backend.startswith("onnx") and not ORT_AVAILABLE:
+        logger.warning("⚠️ onnxruntime not installed, using eager")
+        return None
+
+    try:
+        if backend == "torchscript":
+            runner = TorchScriptBackend(path, labels["id2label"])
+        else:
+            runner = OnnxBackend(path, labels["id2label"], intra_op_threads, name=backend)
+        logger.info(f"✅ Loaded {backend} disease backend from {path}")
+        return runner
+    except Exception as e:
+        logger.error(f"❌ Failed to load {backend} backend: {e}", exc_info=True)
+        return None
+
+
+def check_parity(reference, candidate, batch_size: int = 4, image_size: int = DEFAULT_IMAGE_SIZE,
+                 atol: float = 1e-3, seed: int = 0) -> Dict:
+    """Compare a compiled runner against eager mode on the same random inputs"""
+    generator = torch.Generator().manual_seed(seed)
+    pixel_values = torch.randn(batch_size, 3, image_size, image_size, generator=generator)
+
+    expected = reference(pixel_values).float().cpu()
+    actual = candidate(pixel_values).float().cpu()
+
+    max_abs_diff = float((expected - actual).abs().max())
+    top1_agreement = float((expected.argmax(dim=1) == actual.argmax(dim=1)).float().mean())
+
+    return {
+        "backend": candidate.name,
+        "max_abs_diff": max_abs_diff,
+        "top1_agreement": top1_agreement,
+        "ok": max_abs_diff <= atol and top1_agreement == 1.0,
+    }
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description="Export the disease classifier to a compiled CPU backend")
+    parser.add_argument("--backend", choices=list(EXPORTABLE) + ["all"], default="onnx")
+    parser.add_argument("--image-size", type=int, default=DEFAULT_IMAGE_SIZE)
+    parser.add_argument("--skip-parity", action="store_true", help="Skip the eager-vs-compiled check")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    from app.ml_service import load_disease_model, get_model_path
+
+    model, _ = load_disease_model()
+    if model is None:
+        raise SystemExit("❌ Disease model could not be loaded - nothing to export")
+
+    model_dir = get_model_path("")
+    backends = list(EXPORTABLE) if args.backend == "all" else [args.backend]
+    eager = EagerBackend(model.cpu().eval())
+
+    for backend in backends:
+        export_disease_model(model, backend, model_dir, args.image_size)
+        if args.skip_parity:
+            continue
+        runner = load_compiled_disease_model(backend, model_dir)
+        if runner is None:
+            continue
+        report = check_parity(eager, runner, image_size=args.image_size)
+        status = "✅" if report["ok"] else "❌"
+        print(f"{status} {backend}: max |Δlogit| = {report['max_abs_diff']:.2e}, "
+              f"top-1 agreement = {report['top1_agreement'] * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
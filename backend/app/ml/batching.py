@@ -0,0 +1,162 @@
+"""
+Dynamic Micro-Batching for Model Inference
+Queues incoming input tensors and runs them through the model in shared batches
+"""
+
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _BatchRequest:
+    """A single caller's input waiting to be packed into a batch"""
+
+    __slots__ = ("tensor", "future", "enqueued_at")
+
+    def __init__(self, tensor: torch.Tensor):
+        self.tensor = tensor
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+    @property
+    def rows(self) -> int:
+        return self.tensor.shape[0]
+
+
+class MicroBatcher:
+    """
+    Packs concurrent inference requests into batches.
+
+    Callers `submit()` a tensor whose first dimension is the batch dimension and
+    get a Future back. Worker threads drain the queue, wait up to `max_wait_ms`
+    for more requests (or until `max_batch_size` rows are collected), run
+    `run_batch` once on the concatenated tensor and hand every caller the
+    results for its own rows.
+
+    `run_batch` must return one result per input row.
+    """
+
+    def __init__(self, run_batch: Callable[[torch.Tensor], List[Any]],
+                 max_batch_size: int = 16, max_wait_ms: float = 5.0,
+                 num_workers: int = 1, name: str = "batcher"):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Counters
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+        self._queue_wait_total = 0.0
+
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"{name}-{i}", daemon=True)
+            for i in range(max(1, num_workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, tensor: torch.Tensor) -> Future:
+        """Queue a tensor for inference; the Future resolves to its list of results"""
+        if self._closed:
+            raise RuntimeError(f"{self.name} is shut down")
+        request = _BatchRequest(tensor)
+        self._queue.put(request)
+        return request.future
+
+    def _collect(self, first: _BatchRequest) -> Tuple[List[_BatchRequest], bool]:
+        """Gather requests until the batch is full or the wait deadline passes"""
+        batch = [first]
+        rows = first.rows
+        deadline = time.monotonic() + self.max_wait
+        stop = False
+
+        while rows < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is _STOP:
+                stop = True
+                break
+            batch.append(request)
+            rows += request.rows
+
+        return batch, stop
+
+    def _worker(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch, stop = self._collect(first)
+            self._run(batch)
+            if stop:
+                return
+
+    def _run(self, batch: List[_BatchRequest]):
+        # Drop callers that gave up while queued
+        batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        started = time.monotonic()
+        try:
+            inputs = batch[0].tensor if len(batch) == 1 else torch.cat([r.tensor for r in batch], dim=0)
+            results = self.run_batch(inputs)
+        except Exception as e:
+            logger.error(f"{self.name}: batch of {len(batch)} failed: {e}", exc_info=True)
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(results[offset:offset + request.rows])
+            offset += request.rows
+
+        with self._lock:
+            self._batches += 1
+            self._items += offset
+            self._largest_batch = max(self._largest_batch, offset)
+            self._queue_wait_total += sum(started - r.enqueued_at for r in batch)
+
+    def stats(self) -> Dict:
+        """Batching counters for health/diagnostics endpoints"""
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "largest_batch": self._largest_batch,
+                "avg_queue_wait_ms": round(self._queue_wait_total / self._items * 1000, 3) if self._items else 0.0,
+                "queued": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+    def shutdown(self, timeout: Optional[float] = 5.0):
+        """Stop accepting work and let workers finish what is queued"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout=timeout)
@@ -0,0 +1,202 @@
+"""
+Content-Hash Prediction Cache
+Bounded LRU of model results keyed by a hash of the input bytes plus model version,
+with TTL expiry and an optional on-disk tier that survives restarts
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(data: bytes, model_version: str) -> str:
+    """Cache key for an input payload under a given model version"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(model_version.encode())
+    digest.update(b"\0")
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """
+    LRU cache for JSON-serializable prediction results.
+
+    The memory tier is bounded by `max_mb` (measured on the serialized result).
+    When `disk_dir` is set, entries are also written there as small JSON files,
+    bounded by `disk_max_mb`; a memory miss that hits disk is promoted back
+    into memory. Entries older than `ttl_seconds` are treated as misses.
+    """
+
+    def __init__(self, max_mb: float = 32, ttl_seconds: float = 86400,
+                 disk_dir: Optional[str] = None, disk_max_mb: float = 256):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.ttl = ttl_seconds
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = int(disk_max_mb * 1024 * 1024)
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, size, payload)
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._disk_size = 0
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_size = sum(p.stat().st_size for p in self.disk_dir.glob("*.json"))
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, size, payload = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(payload)
+                self._drop(key)
+                self.expirations += 1
+
+        payload = self._disk_get(key, now)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, payload, now)
+        return json.loads(payload)
+
+    def put(self, key: str, value: Any):
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._store(key, payload, now)
+        self._disk_put(key, payload, now)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+            self._disk_size = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_mb": round(self._size / 1024 / 1024, 3),
+                "max_mb": round(self.max_bytes / 1024 / 1024, 3),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "ttl_seconds": self.ttl,
+                "disk_tier": str(self.disk_dir) if self.disk_dir else None,
+            }
+
+    # --------------------------------------------------
+    # Memory tier (call with lock held)
+    # --------------------------------------------------
+    def _store(self, key: str, payload: str, now: float):
+        size = len(payload) + len(key)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (now + self.ttl, size, payload)
+        self._size += size
+        while self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    # --------------------------------------------------
+    # Disk tier
+    # --------------------------------------------------
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.json"
+
+    def _disk_get(self, key: str, now: float) -> Optional[str]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path) as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Dropping unreadable cache file {path.name}: {e}")
+            self._disk_remove(path)
+            return None
+
+        if record.get("expires_at", 0) <= now:
+            self._disk_remove(path)
+            return None
+        return record["payload"]
+
+    def _disk_remove(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        self._disk_size = max(0, self._disk_size - size)
+
+    def _disk_put(self, key: str, payload: str, now: float):
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        tmp = path.with_suffix(".tmp")
+        record = json.dumps({"expires_at": now + self.ttl, "payload": payload})
+        try:
+            with open(tmp, "w") as f:
+                f.write(record)
+            try:
+                replaced = path.stat().st_size  # overwriting the same key
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+            self._disk_size += len(record) - replaced
+            if self._disk_size > self.disk_max_bytes:
+                self._disk_trim()
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write prediction cache file: {e}")
+
+    def _disk_trim(self):
+        files = [(p.stat().st_mtime, p.stat().st_size, p) for p in self.disk_dir.glob("*.json")]
+        total = sum(size for _, size, _ in files)
+        # Oldest first, trim to 90% so we don't rescan on every write
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes * 0.9:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._disk_size = total
@@ -50,6 +50,32 @@ class CropRecommendationNet(nn.Module):
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         return self.network(x)
     
+    def quantize_dynamic(self) -> nn.Module:
+        """INT8 dynamic quantization of the Linear layers (BatchNorm stays fp32, CPU only)"""
+        self.eval()
+        return torch.ao.quantization.quantize_dynamic(self, {nn.Linear}, dtype=torch.qint8)
+    
+    @classmethod
+    def from_checkpoint(cls, path: str, quantized: bool = False) -> "CropRecommendationNet":
+        """
+        Load weights saved by ml/training/crop_recommendation/train.py.
+        With quantized=True, loads the INT8 checkpoint written by
+        `python -m app.ml.quantize crop` instead.
+        """
+        checkpoint = torch.load(path, map_location='cpu')
+        state_dict = checkpoint['model_state_dict']
+        hidden_size = checkpoint.get('hidden_size') or state_dict['network.0.weight'].shape[0]
+        
+        model = cls(hidden_size=hidden_size, num_classes=checkpoint['num_classes'])
+        if checkpoint.get('label_encoder_classes'):
+            model.crop_names = list(checkpoint['label_encoder_classes'])
+        model.eval()
+        
+        if quantized:
+            model = model.quantize_dynamic()
+        model.load_state_dict(state_dict)
+        return model
+    
     def predict(self, features: dict, device: str = 'cuda') -> list:
         """
         Predict top crops for given soil and weather features
@@ -0,0 +1,112 @@
+"""
+Fast Image Preprocessing for Disease Detection
+Reduced-scale JPEG decoding and a single resize straight to the model input
+"""
+
+import io
+import math
+import logging
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class FastImagePreprocessor:
+    """
+    Equivalent of the HuggingFace image processor pipeline
+    (shortest-edge resize -> center crop -> rescale -> normalize), tuned for
+    large phone photos:
+
+    - JPEGs are decoded with `Image.draft`, letting libjpeg downscale by
+      1/2, 1/4 or 1/8 during decode instead of materializing all 12MP
+    - resize and center crop are a single `Image.resize(box=...)` call that
+      only samples the cropped region
+    - rescale and normalize are fused into one multiply-add on a float32
+      array, and the tensor shares memory with it (no extra copies)
+    """
+
+    def __init__(self, crop_size: Tuple[int, int] = (224, 224), shortest_edge: Optional[int] = 256,
+                 image_mean: Sequence[float] = (0.5, 0.5, 0.5), image_std: Sequence[float] = (0.5, 0.5, 0.5),
+                 rescale_factor: float = 1 / 255, resample: int = Image.BILINEAR):
+        self.crop_height, self.crop_width = crop_size
+        self.shortest_edge = shortest_edge
+        self.resample = resample
+
+        mean = np.asarray(image_mean, dtype=np.float32)
+        std = np.asarray(image_std, dtype=np.float32)
+        self.scale = (rescale_factor / std).astype(np.float32)
+        self.offset = (-mean / std).astype(np.float32)
+
+    @classmethod
+    def from_hf_processor(cls, processor) -> Optional["FastImagePreprocessor"]:
+        """Build from a HuggingFace image processor, or None if its config is not supported"""
+        try:
+            size = processor.size if processor.do_resize else None
+            crop = processor.crop_size if getattr(processor, "do_center_crop", False) else None
+
+            if size and "shortest_edge" in size:
+                shortest_edge = size["shortest_edge"]
+            elif size and "height" in size and crop is None:
+                shortest_edge, crop = None, size
+            else:
+                return None
+            if crop is None:
+                return None
+
+            return cls(
+                crop_size=(crop["height"], crop["width"]),
+                shortest_edge=shortest_edge,
+                image_mean=processor.image_mean if processor.do_normalize else (0.0, 0.0, 0.0),
+                image_std=processor.image_std if processor.do_normalize else (1.0, 1.0, 1.0),
+                rescale_factor=processor.rescale_factor if processor.do_rescale else 1.0,
+                resample=int(processor.resample),
+            )
+        except (AttributeError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️ Fast preprocessing unavailable for {type(processor).__name__}: {e}")
+            return None
+
+    def _source_box(self, width: int, height: int) -> Tuple[float, float, float, float]:
+        """Region of the source image that ends up in the center crop"""
+        if self.shortest_edge is None:
+            return 0.0, 0.0, float(width), float(height)
+
+        # Same rounding as the HF shortest-edge resize
+        if width <= height:
+            resized_w, resized_h = self.shortest_edge, int(self.shortest_edge * height / width)
+        else:
+            resized_w, resized_h = int(self.shortest_edge * width / height), self.shortest_edge
+
+        top = (resized_h - self.crop_height) // 2
+        left = (resized_w - self.crop_width) // 2
+        sx, sy = width / resized_w, height / resized_h
+        return left * sx, top * sy, (left + self.crop_width) * sx, (top + self.crop_height) * sy
+
+    def decode(self, image_bytes: bytes) -> Image.Image:
+        """Decode to RGB at the smallest scale that still covers the model input"""
+        image = Image.open(io.BytesIO(image_bytes))
+
+        if image.format == "JPEG":
+            width, height = image.size
+            needed = self.shortest_edge or max(self.crop_height, self.crop_width)
+            ratio = needed / min(width, height)
+            if ratio < 1:
+                image.draft("RGB", (math.ceil(width * ratio), math.ceil(height * ratio)))
+
+        return image.convert("RGB")
+
+    def __call__(self, image_bytes: bytes) -> torch.Tensor:
+        """Image bytes -> (1, 3, crop_height, crop_width) float32 pixel tensor"""
+        return self.transform(self.decode(image_bytes))
+
+    def transform(self, image: Image.Image) -> torch.Tensor:
+        """Decoded RGB image -> (1, 3, crop_height, crop_width) float32 pixel tensor"""
+        box = self._source_box(*image.size)
+        image = image.resize((self.crop_width, self.crop_height), self.resample, box=box)
+
+        pixels = np.asarray(image, dtype=np.float32)
+        pixels = pixels * self.scale + self.offset
+        return torch.from_numpy(np.ascontiguousarray(pixels.transpose(2, 0, 1)))[None]
@@ -0,0 +1,253 @@
+"""
+INT8 Quantization for the Disease and Crop Models
+Writes quantized artifacts next to the originals in ml/models/ and reports
+the top-1/top-3 accuracy delta against the fp32 model
+
+Usage (run from backend/):
+    python -m app.ml.quantize disease --images /path/to/leaf_images
+    python -m app.ml.quantize crop --csv /path/to/Crop_recommendation.csv
+
+Disease: static INT8 (QDQ, per-channel weights) of the ONNX graph with ONNX
+Runtime, calibrated on the sample image folder. If the folder uses the
+ImageFolder layout (one sub-folder per class) the class names are used as
+ground truth, otherwise the fp32 predictions are.
+
+Crop: dynamic INT8 quantization of the CropRecommendationNet Linear layers.
+"""
+
+import json
+import argparse
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+CROP_NN_FILE = "crop_recommender_nn.pth"
+CROP_NN_INT8_FILE = "crop_recommender_nn.int8.pth"
+
+
+# ==================================================
+# ACCURACY REPORT
+# ==================================================
+def topk_report(reference_topk: np.ndarray, quantized_topk: np.ndarray,
+                targets: Optional[np.ndarray] = None) -> Dict:
+    """
+    Top-1/top-3 accuracy of the fp32 and int8 models and their delta.
+    Without targets the fp32 top-1 prediction is used as the label.
+    """
+    label_source = "dataset"
+    if targets is None:
+        targets = reference_topk[:, 0]
+        label_source = "fp32"
+
+    report = {"samples": int(len(targets)), "label_source": label_source}
+    for name, topk in (("fp32", reference_topk), ("int8", quantized_topk)):
+        report[f"{name}_top1"] = float(np.mean(topk[:, 0] == targets))
+        report[f"{name}_top3"] = float(np.mean((topk[:, :3] == targets[:, None]).any(axis=1)))
+
+    report["top1_delta"] = report["int8_top1"] - report["fp32_top1"]
+    report["top3_delta"] = report["int8_top3"] - report["fp32_top3"]
+    report["top1_agreement"] = float(np.mean(reference_topk[:, 0] == quantized_topk[:, 0]))
+    return report
+
+
+def _topk(logits: np.ndarray, k: int = 3) -> np.ndarray:
+    return np.argsort(-logits, axis=1)[:, :k]
+
+
+def _file_mb(path: Path) -> float:
+    return round(path.stat().st_size / 1024 / 1024, 2)
+
+
+def _save_report(report: Dict, artifact: Path):
+    with open(artifact.with_suffix(".json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def print_report(title: str, report: Dict):
+    print(f"\n📊 {title} ({report['samples']} samples, labels from {report['label_source']})")
+    print(f"   fp32  top-1 {report['fp32_top1'] * 100:6.2f}%   top-3 {report['fp32_top3'] * 100:6.2f}%")
+    print(f"   int8  top-1 {report['int8_top1'] * 100:6.2f}%   top-3 {report['int8_top3'] * 100:6.2f}%")
+    print(f"   delta top-1 {report['top1_delta'] * 100:+6.2f}pp top-3 {report['top3_delta'] * 100:+6.2f}pp")
+    print(f"   size  {report['fp32_mb']} MB -> {report['int8_mb']} MB")
+
+
+# ==================================================
+# DISEASE MODEL - ONNX Runtime static quantization
+# ==================================================
+def find_images(folder: Path) -> List[Tuple[Path, Optional[str]]]:
+    """Image files under folder, labelled by their class sub-folder if any"""
+    samples = []
+    for path in sorted(folder.rglob("*")):
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            label = path.parent.name if path.parent != folder else None
+            samples.append((path, label))
+    return samples
+
+
+def quantize_disease_model(images_dir: Path, calibration_limit: int = 200,
+                           per_channel: bool = True) -> Dict:
+    """Calibrate on images_dir and write disease_detector.int8.onnx"""
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_static
+    )
+    from app.ml_service import load_disease_model, preprocess_disease_image, get_model_path
+    from app.ml.backends import ARTIFACTS, OnnxBackend, export_disease_model
+
+    model, processor = load_disease_model()
+    if model is None or processor is None:
+        raise SystemExit("❌ Disease model could not be loaded")
+
+    model_dir = get_model_path("")
+    fp32_path = model_dir / ARTIFACTS["onnx"]
+    int8_path = model_dir / ARTIFACTS["onnx-int8"]
+    if not fp32_path.exists():
+        export_disease_model(model, "onnx", model_dir)
+
+    samples = find_images(images_dir)
+    if not samples:
+        raise SystemExit(f"❌ No images found in {images_dir}")
+
+    tensors, labels = [], []
+    for path, label in samples:
+        try:
+            tensors.append(preprocess_disease_image(path.read_bytes()).numpy())
+            labels.append(label)
+        except Exception as e:
+            logger.warning(f"⚠️ Skipping {path}: {e}")
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self, batches):
+            self._batches = iter(batches)
+
+        def get_next(self):
+            batch = next(self._batches, None)
+            return None if batch is None else {"pixel_values": batch}
+
+    print(f"🔧 Calibrating on {min(len(tensors), calibration_limit)} images...")
+    quantize_static(
+        str(fp32_path), str(int8_path),
+        _Reader(tensors[:calibration_limit]),
+        quant_format=QuantFormat.QDQ,
+        per_channel=per_channel,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+    )
+
+    # Evaluate both graphs on every sample
+    id2label = {int(k): v for k, v in model.config.id2label.items()}
+    fp32 = OnnxBackend(fp32_path, id2label)
+    int8 = OnnxBackend(int8_path, id2label, name="onnx-int8")
+    batch = torch.from_numpy(np.concatenate(tensors))
+    reference_logits = np.concatenate([fp32(chunk).numpy() for chunk in batch.split(32)])
+    quantized_logits = np.concatenate([int8(chunk).numpy() for chunk in batch.split(32)])
+
+    label2id = {v: k for k, v in id2label.items()}
+    targets = None
+    if all(label in label2id for label in labels):
+        targets = np.array([label2id[label] for label in labels])
+    elif any(labels):
+        logger.warning("⚠️ Folder names do not match the model's classes - using fp32 predictions as labels")
+
+    report = topk_report(_topk(reference_logits), _topk(quantized_logits), targets)
+    report.update({"artifact": int8_path.name, "fp32_mb": _file_mb(fp32_path), "int8_mb": _file_mb(int8_path)})
+    _save_report(report, int8_path)
+    print_report("Disease model (ONNX static INT8)", report)
+    return report
+
+
+# ==================================================
+# CROP MODEL - dynamic quantization
+# ==================================================
+def _crop_features(checkpoint: Dict, model_dir: Path, csv_path: Optional[Path],
+                   crop_names: List[str]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Scaled evaluation features (and labels when a dataset CSV is given)"""
+    if csv_path is None:
+        # Synthetic samples in the network's standardized input space
+        return np.random.default_rng(0).standard_normal((2000, 7)).astype(np.float32), None
+
+    import pandas as pd
+    import joblib
+    from sklearn.preprocessing import StandardScaler
+
+    df = pd.read_csv(csv_path)
+    feature_cols = checkpoint.get("feature_cols", ["N", "P", "K", "temperature", "humidity", "ph", "rainfall"])
+    X = df[feature_cols].values
+
+    rf_path = model_dir / "crop_recommender_rf.pkl"
+    scaler = joblib.load(rf_path).get("scaler") if rf_path.exists() else None
+    X = scaler.transform(X) if scaler is not None else StandardScaler().fit_transform(X)
+
+    index = {name: i for i, name in enumerate(crop_names)}
+    targets = np.array([index.get(label, -1) for label in df["label"]]) if "label" in df else None
+    return X.astype(np.float32), targets
+
+
+def quantize_crop_model(csv_path: Optional[Path] = None) -> Dict:
+    """Write crop_recommender_nn.int8.pth and compare it against the fp32 network"""
+    from app.ml_service import get_model_path
+    from app.ml.models.crop_model import CropRecommendationNet
+
+    model_dir = get_model_path("")
+    fp32_path = model_dir / CROP_NN_FILE
+    int8_path = model_dir / CROP_NN_INT8_FILE
+    if not fp32_path.exists():
+        raise SystemExit(f"❌ Crop network not found at {fp32_path}")
+
+    checkpoint = torch.load(fp32_path, map_location="cpu")
+    fp32 = CropRecommendationNet.from_checkpoint(str(fp32_path))
+    int8 = fp32.quantize_dynamic()
+
+    torch.save({
+        "model_state_dict": int8.state_dict(),
+        "hidden_size": fp32.network[0].out_features,
+        "num_classes": fp32.num_classes,
+        "label_encoder_classes": fp32.crop_names,
+        "feature_cols": checkpoint.get("feature_cols"),
+        "quantization": "dynamic-int8",
+    }, int8_path)
+
+    X, targets = _crop_features(checkpoint, model_dir, csv_path, fp32.crop_names)
+    with torch.no_grad():
+        inputs = torch.from_numpy(X)
+        reference_logits = fp32(inputs).numpy()
+        quantized_logits = int8(inputs).numpy()
+
+    report = topk_report(_topk(reference_logits), _topk(quantized_logits), targets)
+    report.update({"artifact": int8_path.name, "fp32_mb": _file_mb(fp32_path), "int8_mb": _file_mb(int8_path)})
+    _save_report(report, int8_path)
+    print_report("Crop network (dynamic INT8)", report)
+    return report
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description="Quantize AgriSahayak models to INT8")
+    sub = parser.add_subparsers(dest="model", required=True)
+
+    disease = sub.add_parser("disease", help="Static INT8 quantization of the disease classifier")
+    disease.add_argument("--images", type=Path, required=True, help="Folder of sample leaf images")
+    disease.add_argument("--calibration-limit", type=int, default=200)
+    disease.add_argument("--per-tensor", action="store_true", help="Per-tensor instead of per-channel weights")
+
+    crop = sub.add_parser("crop", help="Dynamic INT8 quantization of CropRecommendationNet")
+    crop.add_argument("--csv", type=Path, default=None, help="Crop_recommendation.csv for labelled accuracy")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.model == "disease":
+        quantize_disease_model(args.images, args.calibration_limit, per_channel=not args.per_tensor)
+    else:
+        quantize_crop_model(args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Model Registry
+Discovers versioned artifacts in ml/models/ and hot-swaps newer versions in the background
+
+Artifacts are published next to the originals as `<stem>-v<N><suffix>`, e.g.
+    crop_recommender_rf-v3.pkl
+    yield_predictor-v2.joblib
+    disease_detector-v5/          (HuggingFace save_pretrained directory)
+
+The highest N wins. The unversioned original (if any) is served as "base".
+
+Publish with an atomic rename: copy to a name that does not match the
+pattern (e.g. `.disease_detector-v5.tmp/`), then `mv` it into place. In-place
+`cp`/`rsync` copies are tolerated. An artifact modified within the last poll
+interval is not loaded yet. An artifact that failed to load is retried once
+its files change.
+"""
+
+import re
+import time
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+Fingerprint = Tuple[int, int, float]  # (files, total bytes, newest mtime)
+
+logger = logging.getLogger(__name__)
+
+BASE_VERSION = "base"
+
+
+class ArtifactSpec:
+    """
+    How one model is found, loaded and swapped in.
+
+    `load(path)` returns a ready-to-serve model object (warmed up),
+    `install(model, version, path)` atomically makes it the live model.
+    `base` is the unversioned fallback file name, if the model has one.
+    """
+
+    def __init__(self, name: str, stem: str, suffix: str, load: Callable[[Path], Any],
+                 install: Callable[[Any, str, Path], None], base: Optional[str] = None):
+        self.name = name
+        self.stem = stem
+        self.suffix = suffix
+        self.load = load
+        self.install = install
+        self.base = base
+        self.pattern = re.compile(rf"^{re.escape(stem)}-v(\d+){re.escape(suffix)}$")
+
+
+class ModelRegistry:
+    """
+    Tracks the live version of each registered model and, when polling is
+    started, loads newer versions on a background thread and swaps them in.
+    Serving never blocks on a reload: requests keep using the old model
+    until `install` replaces it.
+    """
+
+    def __init__(self, model_dir: Path, poll_seconds: float = 30.0):
+        self.model_dir = Path(model_dir)
+        self.poll_seconds = poll_seconds
+        self._specs: Dict[str, ArtifactSpec] = {}
+        self._live: Dict[str, Dict] = {}
+        self._failed: Dict[str, Tuple[str, Fingerprint]] = {}  # name -> (artifact, fingerprint) that failed to load
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, spec: ArtifactSpec):
+        self._specs[spec.name] = spec
+
+    # --------------------------------------------------
+    # Discovery
+    # --------------------------------------------------
+    def latest(self, name: str) -> Optional[Tuple[int, Path]]:
+        """Highest-numbered versioned artifact for a model, if any"""
+        spec = self._specs[name]
+        best = None
+        if self.model_dir.exists():
+            for path in self.model_dir.iterdir():
+                match = spec.pattern.match(path.name)
+                if match and (best is None or int(match.group(1)) > best[0]):
+                    best = (int(match.group(1)), path)
+        return best
+
+    @staticmethod
+    def fingerprint(path: Path) -> Fingerprint:
+        """File count, size and newest mtime of an artifact (file or directory); changes while it is being written"""
+        files = [p for p in path.rglob("*") if p.is_file()] if path.is_dir() else [path]
+        stats = [p.stat() for p in files]
+        return len(stats), sum(st.st_size for st in stats), max((st.st_mtime for st in stats), default=0.0)
+
+    def resolve(self, name: str) -> Tuple[Optional[Path], str]:
+        """Artifact to load at startup: newest version, else the unversioned base file"""
+        spec = self._specs[name]
+        latest = self.latest(name)
+        if latest is not None:
+            return latest[1], f"v{latest[0]}"
+        base = self.model_dir / spec.base if spec.base else None
+        return base, BASE_VERSION
+
+    # --------------------------------------------------
+    # Live versions
+    # --------------------------------------------------
+    def record(self, name: str, version: str, artifact: str, load_seconds: float):
+        """Note which version is now serving (called by loaders and after swaps)"""
+        with self._lock:
+            self._live[name] = {
+                "version": version,
+                "artifact": artifact,
+                "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "load_seconds": round(load_seconds, 3),
+            }
+
+    def version(self, name: str) -> Optional[str]:
+        with self._lock:
+            live = self._live.get(name)
+        return live["version"] if live else None
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {name: dict(live) for name, live in self._live.items()}
+
+    # --------------------------------------------------
+    # Hot reload
+    # --------------------------------------------------
+    def check_for_updates(self) -> Dict[str, str]:
+        """Load and swap in any model with a newer versioned artifact. Returns {name: new_version}"""
+        swapped = {}
+        with self._reload_lock:
+            for name, spec in self._specs.items():
+                latest = self.latest(name)
+                if latest is None:
+                    continue
+                number, path = latest
+                version = f"v{number}"
+                current = self.version(name)
+                if current is not None and current != BASE_VERSION and int(current[1:]) >= number:
+                    continue
+                try:
+                    fingerprint = self.fingerprint(path)
+                except OSError:
+                    continue  # renamed or deleted while scanning
+                if time.time() - fingerprint[2] < self.poll_seconds:
+                    logger.info(f"⏳ {name} model {version} was modified recently, waiting for the copy to finish")
+                    continue
+                if self._failed.get(name) == (path.name, fingerprint):
+                    continue
+
+                logger.info(f"📥 Loading {name} model {version} from {path.name}")
+                started = time.perf_counter()
+                try:
+                    model = spec.load(path)
+                except Exception as e:
+                    logger.error(f"❌ {name} model {version} failed to load, keeping {current}: {e}", exc_info=True)
+                    self._failed[name] = (path.name, fingerprint)
+                    continue
+
+                spec.install(model, version, path)
+                self.record(name, version, path.name, time.perf_counter() - started)
+                logger.info(f"✅ Swapped {name} model {current} -> {version}")
+                swapped[name] = version
+        return swapped
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.check_for_updates()
+            except Exception as e:
+                logger.error(f"❌ Model registry poll failed: {e}", exc_info=True)
+
+    def start(self):
+        """Start polling model_dir every poll_seconds"""
+        if self._thread is not None or self.poll_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name="model-registry", daemon=True)
+        self._thread.start()
+        logger.info(f"👀 Watching {self.model_dir} for new model versions every {self.poll_seconds:g}s")
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,144 @@
+"""
+Offline Disease Model Snapshot
+Stores the HuggingFace disease model under ml/models/ in safetensors format and
+loads it back memory-mapped, so no network is needed at startup and every
+process on the host maps the same physical weight pages.
+
+Create the snapshot once (needs network access, run from backend/):
+    python -m app.ml.snapshot
+    python -m app.ml.snapshot --model linkanjarad/mobilenet_v2_1.0_224-plant-disease-identification
+"""
+
+import json
+import mmap
+import time
+import argparse
+import logging
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = "disease_detector_hf"
+WEIGHTS_FILE = "model.safetensors"
+SOURCE_FILE = "snapshot.json"
+
+_DTYPES = {
+    "F64": torch.float64, "F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16,
+    "I64": torch.int64, "I32": torch.int32, "I16": torch.int16, "I8": torch.int8,
+    "U8": torch.uint8, "BOOL": torch.bool,
+}
+
+
+# ==================================================
+# MEMORY-MAPPED SAFETENSORS
+# ==================================================
+def mmap_safetensors(path: Path) -> Dict[str, torch.Tensor]:
+    """
+    Tensors viewing a memory-mapped .safetensors file - no copy into private memory.
+
+    The file is mapped copy-on-write: processes reading the weights share the
+    page cache, and an accidental in-place write only copies the touched page.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    header_size = int.from_bytes(mapped[:8], "little")
+    header = json.loads(mapped[8:8 + header_size])
+    header.pop("__metadata__", None)
+    data_start = 8 + header_size
+
+    tensors = {}
+    for name, info in header.items():
+        dtype = _DTYPES[info["dtype"]]
+        begin, end = info["data_offsets"]
+        offset = data_start + begin
+        count = (end - begin) // dtype.itemsize
+        if offset % dtype.itemsize:
+            # Misaligned entries cannot be viewed in place - copy just this one
+            tensor = torch.frombuffer(bytearray(mapped[offset:offset + end - begin]), dtype=dtype)
+        elif count == 0:
+            tensor = torch.empty(0, dtype=dtype)
+        else:
+            tensor = torch.frombuffer(mapped, dtype=dtype, count=count, offset=offset)
+        tensors[name] = tensor.reshape(info["shape"])
+    return tensors
+
+
+def load_snapshot_model(path: Path):
+    """
+    Image classifier from a save_pretrained directory with model.safetensors,
+    its parameters backed by the memory-mapped file. Returns None if the
+    weights do not cover the whole model (callers use from_pretrained instead).
+    """
+    from transformers import AutoConfig, AutoModelForImageClassification
+
+    weights = Path(path) / WEIGHTS_FILE
+    if not weights.is_file():
+        return None
+
+    config = AutoConfig.from_pretrained(path)
+    # Build on the meta device: no random init, no allocation - the mmap'd
+    # tensors become the parameters via assign=True
+    with torch.device("meta"):
+        model = AutoModelForImageClassification.from_config(config)
+    result = model.load_state_dict(mmap_safetensors(weights), strict=False, assign=True)
+
+    unfilled = [name for name, tensor in chain(model.named_parameters(), model.named_buffers()) if tensor.is_meta]
+    if result.missing_keys or unfilled:
+        logger.warning(f"⚠️ {weights} does not cover {len(unfilled) or len(result.missing_keys)} tensors - not memory-mapping")
+        return None
+    return model.eval()
+
+
+def snapshot_source(path: Path) -> Optional[str]:
+    """HuggingFace model name the snapshot was taken from"""
+    try:
+        return json.loads((Path(path) / SOURCE_FILE).read_text())["source"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# ==================================================
+# SNAPSHOT CLI
+# ==================================================
+def save_snapshot(model_name: str, out_dir: Path) -> Path:
+    """Download model + processor once and store them for offline, mmap-able loading"""
+    from transformers import AutoImageProcessor, AutoModelForImageClassification
+
+    processor = AutoImageProcessor.from_pretrained(model_name)
+    model = AutoModelForImageClassification.from_pretrained(model_name)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    model.save_pretrained(out_dir, safe_serialization=True)
+    processor.save_pretrained(out_dir)
+    (out_dir / SOURCE_FILE).write_text(json.dumps({
+        "source": model_name,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }, indent=2))
+    return out_dir
+
+
+def main():
+    from app.ml_service import HF_DISEASE_MODEL, get_model_path
+
+    parser = argparse.ArgumentParser(description="Snapshot the HuggingFace disease model for offline serving")
+    parser.add_argument("--model", default=HF_DISEASE_MODEL, help="HuggingFace model id")
+    parser.add_argument("--out", type=Path, default=None, help=f"Output directory (default: ml/models/{SNAPSHOT_DIR})")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    out_dir = save_snapshot(args.model, args.out or get_model_path(SNAPSHOT_DIR))
+
+    model = load_snapshot_model(out_dir)
+    if model is None:
+        raise SystemExit(f"❌ Snapshot written to {out_dir} but it cannot be memory-mapped")
+    size_mb = (out_dir / WEIGHTS_FILE).stat().st_size / 2**20
+    print(f"✅ Snapshot of {args.model} written to {out_dir} ({size_mb:.1f} MB, {len(model.config.id2label)} classes)")
+
+
+if __name__ == "__main__":
+    main()
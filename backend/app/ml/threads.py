@@ -0,0 +1,125 @@
+"""
+Thread Budget for CPU Inference
+Splits the host's cores between server workers and sets torch, OpenMP and BLAS
+thread counts so concurrent forward passes do not oversubscribe the CPU.
+
+Must not import torch or numpy: `apply_thread_env()` has to run before either
+is imported, since OpenMP and BLAS read their thread counts once at load.
+"""
+
+import os
+import sys
+import logging
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Read once by OpenMP / MKL / OpenBLAS / Accelerate / numexpr when they load
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+                   "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+_budget: Optional[Dict] = None
+
+
+def available_cores() -> int:
+    """Cores this process may run on (respects taskset / container CPU sets)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def server_workers() -> int:
+    """Server processes on this host: SERVER_WORKERS, else WEB_CONCURRENCY (uvicorn/gunicorn), else 1"""
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    try:
+        return max(1, int(os.environ.get("WEB_CONCURRENCY", "1")))
+    except ValueError:
+        return 1
+
+
+def plan_threads(cores: int, workers: int, ml_worker_processes: int, batching: bool) -> Dict:
+    """
+    Intra-/inter-op threads for one server process.
+
+    Each server process gets cores // workers. With ML worker processes the
+    inference runs there (one thread each, see app/ml/workers.py), so this
+    process keeps a single thread. With the micro-batcher a single thread
+    runs forward passes, so it may use the whole share; without it the
+    threadpool runs overlapping forward passes, which get half each.
+    """
+    share = max(1, cores // max(1, workers))
+    if ml_worker_processes > 0:
+        intra = 1
+    elif batching:
+        intra = share
+    else:
+        intra = max(1, share // 2)
+    return {"cores": cores, "server_workers": workers, "cores_per_worker": share,
+            "intra_op": intra, "inter_op": 1}
+
+
+def get_thread_budget() -> Dict:
+    """Planned budget from settings; TORCH_INTRA_OP_THREADS / TORCH_INTER_OP_THREADS override it"""
+    global _budget
+    if _budget is None:
+        budget = plan_threads(available_cores(), server_workers(),
+                              settings.ML_WORKER_PROCESSES, settings.DISEASE_BATCHING_ENABLED)
+        if settings.TORCH_INTRA_OP_THREADS > 0:
+            budget["intra_op"] = settings.TORCH_INTRA_OP_THREADS
+        if settings.TORCH_INTER_OP_THREADS > 0:
+            budget["inter_op"] = settings.TORCH_INTER_OP_THREADS
+        _budget = budget
+    return _budget
+
+
+def apply_thread_env():
+    """
+    Export OMP/MKL/BLAS thread counts for the budget. Variables already set
+    in the environment win. Only effective before numpy/torch are imported.
+    """
+    if not settings.THREAD_BUDGET_ENABLED:
+        return
+    budget = get_thread_budget()
+    if "env_applied" in budget:
+        return
+    budget["env_applied"] = "torch" not in sys.modules and "numpy" not in sys.modules
+    for name in THREAD_ENV_VARS:
+        os.environ.setdefault(name, str(budget["intra_op"]))
+
+
+def apply_torch_threads():
+    """Set torch intra-/inter-op threads (inter-op only takes effect before the first parallel op)"""
+    import torch
+
+    if not settings.THREAD_BUDGET_ENABLED:
+        return
+    budget = get_thread_budget()
+    torch.set_num_threads(budget["intra_op"])
+    try:
+        torch.set_num_interop_threads(budget["inter_op"])
+    except RuntimeError:
+        # Already started - torch only allows setting it once
+        pass
+    if budget["server_workers"] * max(1, settings.ML_WORKER_PROCESSES) > budget["cores"]:
+        logger.warning(f"⚠️ {budget['server_workers']} server workers x {settings.ML_WORKER_PROCESSES} ML workers "
+                       f"exceed {budget['cores']} cores - expect CPU contention")
+    logger.info(f"✅ Thread budget: {budget['intra_op']} intra-op / {budget['inter_op']} inter-op threads "
+                f"({budget['cores']} cores, {budget['server_workers']} server workers)")
+
+
+def thread_stats() -> Dict:
+    """Effective thread settings for /health"""
+    import torch
+
+    budget = dict(get_thread_budget())
+    budget.update(
+        enabled=settings.THREAD_BUDGET_ENABLED,
+        torch_intra_op=torch.get_num_threads(),
+        torch_inter_op=torch.get_num_interop_threads(),
+        env={name: os.environ.get(name) for name in THREAD_ENV_VARS},
+    )
+    return budget
@@ -0,0 +1,260 @@
+"""
+Compiled Tree-Ensemble Inference
+Flattens fitted sklearn forests into contiguous NumPy node arrays and evaluates
+them with a vectorized, level-synchronous traversal - no per-call input
+validation or joblib setup, so single-row predictions take microseconds.
+
+Outputs are bit-for-bit identical to sklearn evaluated sequentially
+(n_jobs=1): inputs are cast to float32 like sklearn does, splits compare
+float32 features against float64 thresholds, and per-tree outputs are summed
+in estimator order. Batches above LARGE_BATCH_ROWS are handed to that
+sequential sklearn model. `compile_model` verifies the compiled path on
+random inputs and returns None (keep using sklearn) if anything differs.
+"""
+
+import copy
+import logging
+from typing import Optional
+
+import numpy as np
+import sklearn
+from sklearn.ensemble import (
+    ExtraTreesClassifier, ExtraTreesRegressor, GradientBoostingRegressor,
+    RandomForestClassifier, RandomForestRegressor
+)
+from sklearn.preprocessing import StandardScaler
+
+logger = logging.getLogger(__name__)
+
+# Above this many rows sklearn's compiled loops win over per-level NumPy calls,
+# so large batches go to the (sequential, hence identical) sklearn model
+LARGE_BATCH_ROWS = 1000
+
+# Before sklearn 1.4 tree_.value held weighted counts that predict_proba normalized
+_VALUE_IS_FRACTION = tuple(int(v) for v in sklearn.__version__.split(".")[:2]) >= (1, 4)
+
+
+# ==================================================
+# NODE ARRAYS
+# ==================================================
+class _FlatTrees:
+    """
+    All trees of an ensemble in one node-record array (threshold, feature,
+    left, right), so each traversal step is one gather per (row, tree).
+    Leaves point to themselves, so iterating `depth` times from the roots
+    lands every row on its leaf without checking for leaves.
+    """
+
+    NODE = np.dtype([("threshold", np.float64), ("feature", np.intp), ("left", np.intp), ("right", np.intp)])
+
+    def __init__(self, trees, leaf_values):
+        records, values, roots = [], [], []
+        offset = 0
+        depth = 0
+        for tree, value in zip(trees, leaf_values):
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            record = np.empty(tree.node_count, dtype=self.NODE)
+            record["threshold"] = np.where(is_leaf, np.inf, tree.threshold)
+            record["feature"] = np.where(is_leaf, 0, tree.feature)
+            record["left"] = np.where(is_leaf, nodes, tree.children_left) + offset
+            record["right"] = np.where(is_leaf, nodes, tree.children_right) + offset
+            records.append(record)
+            values.append(value)
+            roots.append(offset)
+            depth = max(depth, tree.max_depth)
+            offset += tree.node_count
+
+        self.nodes = np.concatenate(records)
+        self.value = np.ascontiguousarray(np.concatenate(values))
+        self.roots = np.array(roots, dtype=np.intp)
+        self.depth = depth
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node index of every (row, tree) pair, shape (n_rows, n_trees)"""
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = (np.arange(n_rows) * n_features)[:, None] if n_rows > 1 else 0
+        nodes = np.repeat(self.roots[None, :], n_rows, axis=0)
+        for _ in range(self.depth):
+            record = self.nodes.take(nodes)
+            go_right = flat_X.take(record["feature"] + row_offsets) > record["threshold"]
+            nodes = np.where(go_right, record["right"], record["left"])
+        return nodes
+
+    def accumulate(self, X: np.ndarray, start: np.ndarray) -> np.ndarray:
+        """start + tree_0 + tree_1 + ... per row, accumulated in estimator order"""
+        per_tree = self.value[self.apply(X)]
+        # cumsum adds strictly left to right, matching sklearn's sequential sum
+        stacked = np.concatenate([start[:, None], per_tree], axis=1)
+        return np.cumsum(stacked, axis=1)[:, -1]
+
+
+def _sequential(model):
+    """Shallow copy sharing the fitted trees but evaluating them in order (n_jobs=1)"""
+    model = copy.copy(model)
+    if hasattr(model, "n_jobs"):
+        model.n_jobs = 1
+    return model
+
+
+def _as_float32(X) -> np.ndarray:
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    return X.reshape(1, -1) if X.ndim == 1 else X
+
+
+# ==================================================
+# COMPILED MODELS (sklearn-compatible predict API)
+# ==================================================
+class CompiledForestClassifier:
+    """RandomForest/ExtraTrees classifier: predict_proba averages per-tree class fractions"""
+
+    def __init__(self, model):
+        self.sklearn = _sequential(model)
+        self.classes_ = model.classes_
+        self.n_classes_ = model.n_classes_
+        self.n_features_in_ = model.n_features_in_
+        self.n_estimators = len(model.estimators_)
+
+        values = []
+        for estimator in model.estimators_:
+            value = estimator.tree_.value[:, 0, :self.n_classes_]
+            if not _VALUE_IS_FRACTION:
+                normalizer = value.sum(axis=1)[:, None]
+                normalizer[normalizer == 0.0] = 1.0
+                value = value / normalizer
+            values.append(value)
+        self.trees = _FlatTrees([e.tree_ for e in model.estimators_], values)
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = _as_float32(X)
+        if X.shape[0] > LARGE_BATCH_ROWS:
+            return self.sklearn.predict_proba(X)
+        proba = self.trees.accumulate(X, np.zeros((X.shape[0], self.n_classes_)))
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+class CompiledForestRegressor:
+    """RandomForest/ExtraTrees regressor: predict averages per-tree leaf values"""
+
+    def __init__(self, model):
+        self.sklearn = _sequential(model)
+        self.n_features_in_ = model.n_features_in_
+        self.n_estimators = len(model.estimators_)
+        values = [e.tree_.value[:, 0, 0] for e in model.estimators_]
+        self.trees = _FlatTrees([e.tree_ for e in model.estimators_], values)
+
+    def predict(self, X) -> np.ndarray:
+        X = _as_float32(X)
+        if X.shape[0] > LARGE_BATCH_ROWS:
+            return self.sklearn.predict(X)
+        y = self.trees.accumulate(X, np.zeros(X.shape[0]))
+        y /= self.n_estimators
+        return y
+
+
+class CompiledGradientBoostingRegressor:
+    """GradientBoosting regressor: init prediction + learning_rate * leaf value per stage"""
+
+    def __init__(self, model):
+        self.sklearn = _sequential(model)
+        self.n_features_in_ = model.n_features_in_
+        # Constant init (mean / zero); verified against sklearn in compile_model
+        probe = np.zeros((1, model.n_features_in_), dtype=np.float32)
+        self.init = float(model._raw_predict_init(probe)[0, 0])
+
+        trees = [stage[0].tree_ for stage in model.estimators_]
+        values = [model.learning_rate * tree.value[:, 0, 0] for tree in trees]
+        self.trees = _FlatTrees(trees, values)
+
+    def predict(self, X) -> np.ndarray:
+        X = _as_float32(X)
+        if X.shape[0] > LARGE_BATCH_ROWS:
+            return self.sklearn.predict(X)
+        return self.trees.accumulate(X, np.full(X.shape[0], self.init))
+
+
+class CompiledStandardScaler:
+    """StandardScaler.transform without input validation (same float64 ops)"""
+
+    def __init__(self, scaler: StandardScaler):
+        self.mean = scaler.mean_ if scaler.with_mean else None
+        self.scale = scaler.scale_ if scaler.with_std else None
+
+    def transform(self, X) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        return X
+
+
+# ==================================================
+# COMPILE + VERIFY
+# ==================================================
+def _compile(model):
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        if model.n_outputs_ == 1:
+            return CompiledForestClassifier(model)
+    elif isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)):
+        if model.n_outputs_ == 1:
+            return CompiledForestRegressor(model)
+    elif isinstance(model, GradientBoostingRegressor):
+        if model.init_ == "zero" or type(model.init_).__name__ == "DummyRegressor":
+            return CompiledGradientBoostingRegressor(model)
+    elif isinstance(model, StandardScaler):
+        return CompiledStandardScaler(model)
+    return None
+
+
+def _reference(model, X: np.ndarray) -> np.ndarray:
+    """sklearn output with deterministic (sequential) tree accumulation"""
+    model = _sequential(model)
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(X)
+    if hasattr(model, "transform"):
+        return model.transform(X)
+    return model.predict(X)
+
+
+def compile_model(model, verify_rows: int = 512, seed: int = 0):
+    """
+    Compiled equivalent of a fitted forest / gradient boosting regressor /
+    StandardScaler, or None if the model is unsupported or the compiled
+    outputs are not bit-identical to sklearn on random inputs.
+    """
+    try:
+        compiled = _compile(model)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not compile {type(model).__name__}: {e}")
+        return None
+    if compiled is None:
+        return None
+
+    n_features = getattr(model, "n_features_in_", None)
+    if n_features is None:
+        return None
+
+    # Spread inputs over standardized and raw feature ranges so many branches are hit
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((verify_rows, n_features)) * rng.choice([1.0, 3.0, 1000.0], size=(verify_rows, 1))
+    if not isinstance(model, StandardScaler):
+        X = X.astype(np.float32).astype(np.float64)
+
+    expected = _reference(model, X)
+    if isinstance(compiled, CompiledStandardScaler):
+        actual = compiled.transform(X)
+    elif isinstance(compiled, CompiledForestClassifier):
+        actual = compiled.predict_proba(X)
+    else:
+        actual = compiled.predict(X)
+
+    if not np.array_equal(expected, actual):
+        logger.warning(f"⚠️ Compiled {type(model).__name__} differs from sklearn - keeping sklearn")
+        return None
+    return compiled
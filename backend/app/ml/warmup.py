@@ -0,0 +1,59 @@
+"""
+Model Warmup
+Runs synthetic batches through a freshly loaded model and records p50/p99 latency
+"""
+
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def parse_batch_sizes(value: str) -> List[int]:
+    """'1,4,16' -> [1, 4, 16] (invalid and non-positive entries are dropped)"""
+    sizes = []
+    for part in value.split(","):
+        part = part.strip()
+        if part.isdigit() and int(part) > 0:
+            sizes.append(int(part))
+    return sorted(set(sizes))
+
+
+def run_warmup(predict: Callable[[int], Any], batch_sizes: Iterable[int], iterations: int = 10) -> Dict:
+    """
+    Call `predict(batch_size)` once untimed (lazy kernel init, allocator growth),
+    then `iterations` timed times per batch size.
+    Returns {batch_size: {p50_ms, p99_ms, max_ms, iterations}}.
+    """
+    report = {}
+    for batch_size in batch_sizes:
+        predict(batch_size)
+        timings = []
+        for _ in range(max(1, iterations)):
+            started = time.perf_counter()
+            predict(batch_size)
+            timings.append((time.perf_counter() - started) * 1000)
+        report[batch_size] = {
+            "p50_ms": round(float(np.percentile(timings, 50)), 3),
+            "p99_ms": round(float(np.percentile(timings, 99)), 3),
+            "max_ms": round(max(timings), 3),
+            "iterations": len(timings),
+        }
+    return report
+
+
+def check_slo(report: Dict, slo_ms: float) -> Optional[str]:
+    """
+    Compare single-request (smallest batch) p99 latency with the SLO.
+    Returns a description of the breach, or None when within the SLO or no SLO is set.
+    """
+    if slo_ms <= 0 or not report:
+        return None
+    batch_size = min(report)
+    p99 = report[batch_size]["p99_ms"]
+    if p99 > slo_ms:
+        return f"p99 {p99:.1f}ms at batch size {batch_size} exceeds SLO {slo_ms:g}ms"
+    return None
@@ -0,0 +1,272 @@
+"""
+Process-Pool Inference Workers
+Runs model inference in worker processes started with forkserver (or spawn)
+
+Workers are never forked from the server process. By the time the pool starts,
+it runs the writer, batcher, registry and torch threads, and a fork can
+copy a lock held by one of them into the child, which then deadlocks. Each
+worker is a clean interpreter that loads the models itself in `init`.
+Memory-mapped safetensors weights (MMAP_MODEL_WEIGHTS) are still shared
+through the page cache.
+"""
+
+import os
+import time
+import queue
+import itertools
+import threading
+import logging
+import multiprocessing as mp
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+START_METHOD = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+
+
+class WorkerPoolBroken(RuntimeError):
+    """A worker process died; pending and future tasks fail until the pool is restarted"""
+
+
+def _worker_main(tasks, results, ready, handlers: Dict[str, Callable],
+                 batch_handlers: Dict[str, Callable], init: Optional[Callable],
+                 max_batch_size: int, max_wait: float):
+    """Worker loop: load models (init), then pull tasks, run handlers, push (task_id, ok, value) back"""
+    # Parallelism comes from the number of processes - one intra-op thread each
+    torch.set_num_threads(1)
+    try:
+        if init is not None:
+            init()
+    except Exception as e:
+        ready.put((os.getpid(), f"{type(e).__name__}: {e}"))
+        return
+    ready.put((os.getpid(), None))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+
+        pending = [task]
+        stop = False
+        if task[1] in batch_handlers:
+            # Pack queued tasks of the same kind into one call, like MicroBatcher
+            deadline = time.monotonic() + max_wait
+            while len(pending) < max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    extra = tasks.get(timeout=remaining) if remaining > 0 else tasks.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is None:
+                    stop = True
+                    break
+                pending.append(extra)
+
+        for kind, group in itertools.groupby(pending, key=lambda t: t[1]):
+            group = list(group)
+            if kind in batch_handlers:
+                _run_batch(batch_handlers[kind], group, results)
+            else:
+                for task_id, _, payload in group:
+                    _run_one(handlers[kind], task_id, payload, results)
+
+        if stop:
+            return
+
+
+def _run_one(handler: Callable, task_id: int, payload: Any, results):
+    try:
+        results.put((task_id, True, handler(payload)))
+    except Exception as e:
+        results.put((task_id, False, _portable(e)))
+
+
+def _run_batch(handler: Callable, group: List, results):
+    try:
+        outputs = handler([payload for _, _, payload in group])
+    except Exception as e:
+        outputs = [e] * len(group)
+    for (task_id, _, _), output in zip(group, outputs):
+        if isinstance(output, Exception):
+            results.put((task_id, False, _portable(output)))
+        else:
+            results.put((task_id, True, output))
+
+
+def _portable(error: Exception) -> Exception:
+    """Exceptions cross the result queue pickled - keep only the message"""
+    return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+class InferenceProcessPool:
+    """
+    Pool of worker processes for CPU-bound inference.
+
+    Callers `submit(kind, payload)` and get a Future; tasks travel over a
+    multiprocessing queue and `handlers[kind]` runs in whichever worker picks
+    them up. Kinds listed in `batch_handlers` are packed into batches of up
+    to `max_batch_size` inside the worker.
+
+    Workers start as fresh interpreters (`start_method`, forkserver where
+    available), so handlers and `init` must be importable module-level
+    functions. `init` runs once in each worker and loads what the handlers
+    need; `start()` returns when every worker has finished it.
+    """
+
+    def __init__(self, handlers: Dict[str, Callable[[Any], Any]],
+                 batch_handlers: Optional[Dict[str, Callable[[List[Any]], List[Any]]]] = None,
+                 num_processes: int = 0, init: Optional[Callable] = None,
+                 max_batch_size: int = 16, max_wait_ms: float = 5.0, name: str = "ml-worker",
+                 start_method: str = START_METHOD):
+        self.handlers = handlers
+        self.batch_handlers = batch_handlers or {}
+        self.num_processes = num_processes or os.cpu_count() or 1
+        self.init = init
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+
+        self._ctx = mp.get_context(start_method)
+        self._tasks = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._ready = self._ctx.Queue()
+        self._processes: List = []
+        self._futures: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+        self._broken: Optional[str] = None
+
+        # Counters
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+
+    # --------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------
+    def start(self, timeout: Optional[float] = 300.0):
+        """Start the workers and wait until each has run `init` (raises if one fails or times out)"""
+        known = set(self.handlers) | set(self.batch_handlers)
+        for i in range(self.num_processes):
+            process = self._ctx.Process(
+                target=_worker_main, name=f"{self.name}-{i}", daemon=True,
+                args=(self._tasks, self._results, self._ready, self.handlers, self.batch_handlers,
+                      self.init, self.max_batch_size, self.max_wait)
+            )
+            process.start()
+            self._processes.append(process)
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for _ in self._processes:
+            try:
+                _, error = self._ready.get(timeout=max(0.0, deadline - time.monotonic()) if deadline else None)
+            except queue.Empty:
+                error = f"workers not ready after {timeout:g}s"
+            if error is not None:
+                self.shutdown(timeout=1.0)
+                raise RuntimeError(f"{self.name}: worker failed to start: {error}")
+
+        self._dispatcher = threading.Thread(target=self._dispatch, name=f"{self.name}-results", daemon=True)
+        self._dispatcher.start()
+        logger.info(f"✅ Started {self.num_processes} inference worker processes ({', '.join(sorted(known))})")
+
+    def shutdown(self, timeout: Optional[float] = 5.0):
+        """Stop accepting work, let workers drain the queue and exit"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout=timeout)
+        self._fail_pending("inference pool shut down")
+
+    @property
+    def healthy(self) -> bool:
+        return not self._closed and self._broken is None
+
+    # --------------------------------------------------
+    # Submission & results
+    # --------------------------------------------------
+    def submit(self, kind: str, payload: Any) -> Future:
+        """Queue a task for the workers; the Future resolves to the handler's result"""
+        if kind not in self.handlers and kind not in self.batch_handlers:
+            raise ValueError(f"{self.name}: no handler for '{kind}'")
+        if not self.healthy:
+            raise WorkerPoolBroken(self._broken or f"{self.name} is shut down")
+
+        future: Future = Future()
+        with self._lock:
+            task_id = next(self._ids)
+            self._futures[task_id] = future
+            self._submitted += 1
+        self._tasks.put((task_id, kind, payload))
+        return future
+
+    def _dispatch(self):
+        last_check = time.monotonic()
+        while True:
+            if time.monotonic() - last_check > 1.0:
+                self._check_workers()
+                last_check = time.monotonic()
+            try:
+                task_id, ok, value = self._results.get(timeout=1.0)
+            except queue.Empty:
+                if self._closed:
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+
+            with self._lock:
+                future = self._futures.pop(task_id, None)
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+            if future is None:
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _check_workers(self):
+        dead = [p for p in self._processes if not p.is_alive()]
+        if dead and self._broken is None and not self._closed:
+            codes = ", ".join(f"{p.name} exit {p.exitcode}" for p in dead)
+            self._broken = f"{self.name}: worker died ({codes})"
+            logger.error(f"❌ {self._broken} - failing pending tasks")
+            self._fail_pending(self._broken)
+
+    def _fail_pending(self, reason: str):
+        with self._lock:
+            pending, self._futures = self._futures, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(WorkerPoolBroken(reason))
+
+    def stats(self) -> Dict:
+        """Pool counters for health/diagnostics endpoints"""
+        with self._lock:
+            in_flight = len(self._futures)
+        return {
+            "processes": self.num_processes,
+            "alive": sum(p.is_alive() for p in self._processes),
+            "healthy": self.healthy,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "in_flight": in_flight,
+            "max_batch_size": self.max_batch_size,
+        }
@@ -3,6 +3,9 @@ ML Inference Service with Pre-trained Hugging Face Models
 Uses pre-trained plant disease detection model with 95%+ accuracy
 """
 
+from app.ml.threads import apply_thread_env, apply_torch_threads, thread_stats
+apply_thread_env()  # before torch/numpy load OpenMP and BLAS
+
 import torch
 import torch.nn as nn
 from torchvision import transforms, models
@@ -10,13 +13,34 @@ from PIL import Image
 import joblib
 import numpy as np
 from pathlib import Path
-from typing import List, Dict
+from typing import Any, List, Dict, NamedTuple, Optional, Tuple
+import threading
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
+import time
 import io
 
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import span, reset as reset_metrics
+from app.ml.batching import MicroBatcher
+from app.ml.backends import ARTIFACTS, EagerBackend, load_compiled_disease_model, check_parity, read_labels
+from app.ml.cache import PredictionCache, content_key
+from app.ml.preprocess import FastImagePreprocessor
+from app.ml.workers import InferenceProcessPool
+from app.ml.trees import compile_model
+from app.ml.registry import ArtifactSpec, ModelRegistry, BASE_VERSION
+from app.ml.warmup import parse_batch_sizes, run_warmup, check_slo
+from app.ml.snapshot import SNAPSHOT_DIR, WEIGHTS_FILE, load_snapshot_model, snapshot_source
+
 # Setup logger
 logger = logging.getLogger(__name__)
 
+apply_torch_threads()
+
 # Hugging Face Transformers for pre-trained model
 try:
     from transformers import AutoImageProcessor, AutoModelForImageClassification
@@ -25,12 +49,19 @@ except ImportError:
     HF_AVAILABLE = False
     logger.warning("⚠️ Hugging Face transformers not installed")
 
+HF_DISEASE_MODEL = "linkanjarad/mobilenet_v2_1.0_224-plant-disease-identification"
+
 # Global model instances
 _crop_model = None
-_disease_model = None
-_disease_processor = None
+_disease = None  # DiseaseModel
+_disease_lock = threading.Lock()
+_prediction_cache = None
 _yield_model = None
 _device = None
+_disease_batcher = None
+_disease_batcher_lock = threading.Lock()
+_worker_pool = None
+_registry = None
 
 
 def get_device():
@@ -52,6 +83,35 @@ def get_model_path(model_name: str) -> Path:
     return Path(__file__).parent.parent.parent / 'ml' / 'models' / model_name
 
 
+# ==================================================
+# MODEL REGISTRY - versioned artifacts & hot reload
+# ==================================================
+def get_model_registry() -> ModelRegistry:
+    """Registry of the crop/yield/disease versions published in ml/models/"""
+    global _registry
+    if _registry is None:
+        registry = ModelRegistry(get_model_path(""), settings.MODEL_RELOAD_INTERVAL_SECONDS)
+        registry.register(ArtifactSpec("crop", "crop_recommender_rf", ".pkl",
+                                       _load_crop_artifact, _install_crop_model, base="crop_recommender_rf.pkl"))
+        registry.register(ArtifactSpec("yield", "yield_predictor", ".joblib",
+                                       _load_yield_artifact, _install_yield_model, base="yield_predictor.joblib"))
+        registry.register(ArtifactSpec("disease", "disease_detector", "",
+                                       _load_disease_artifact, _install_disease_model))
+        _registry = registry
+    return _registry
+
+
+def get_model_version(name: str) -> Optional[str]:
+    """Serving version of 'crop', 'yield' or 'disease' (v<N> or 'base'), None if not loaded"""
+    return _registry.version(name) if _registry is not None else None
+
+
+def stop_model_registry():
+    """Stop watching for new model versions (app shutdown)"""
+    if _registry is not None:
+        _registry.stop()
+
+
 # ==================================================
 # CROP RECOMMENDATION MODEL
 # ==================================================
@@ -59,11 +119,14 @@ def load_crop_model():
     """Load crop recommendation model"""
     global _crop_model
     if _crop_model is None:
-        model_path = get_model_path('crop_recommender_rf.pkl')
+        registry = get_model_registry()
+        model_path, version = registry.resolve("crop")
         if model_path.exists():
             try:
-                _crop_model = joblib.load(model_path)
-                logger.info(f"✅ Loaded crop model from {model_path}")
+                started = time.perf_counter()
+                _crop_model = _load_crop_artifact(model_path)
+                registry.record("crop", version, model_path.name, time.perf_counter() - started)
+                logger.info(f"✅ Loaded crop model {version} from {model_path}")
             except Exception as e:
                 logger.error(f"❌ Failed to load crop model: {e}", exc_info=True)
                 _crop_model = None
@@ -72,64 +135,120 @@ def load_crop_model():
     return _crop_model
 
 
-def predict_crop(nitrogen: float, phosphorus: float, potassium: float,
-                 temperature: float, humidity: float, ph: float, 
-                 rainfall: float) -> List[Dict]:
-    """Predict best crops based on soil and climate parameters."""
-    model_data = load_crop_model()
+def _load_crop_artifact(path: Path) -> Dict:
+    """Load, prepare and warm up a crop model file"""
+    model_data = _prepare_crop_model(joblib.load(path))
+    _predict_crop_with(model_data, np.zeros((1, 7)))
+    return model_data
+
+
+def _install_crop_model(model_data: Dict, version: str, path: Path):
+    global _crop_model
+    _crop_model = model_data
+
+
+def _prepare_crop_model(model_data) -> Dict:
+    """
+    Normalize the saved crop model into a dict and decode its class labels
+    once, so predictions index a name array instead of calling the label
+    encoder per recommendation.
+    """
+    if not isinstance(model_data, dict):
+        model_data = {'model': model_data}
     
-    if model_data is None:
-        return _fallback_crop_recommendation(nitrogen, phosphorus, potassium, 
-                                              temperature, humidity, ph, rainfall)
-    
-    # Extract model components from the saved dict
-    if isinstance(model_data, dict):
-        model = model_data.get('model')
-        scaler = model_data.get('scaler')
-        label_encoder = model_data.get('label_encoder')
-    else:
-        model = model_data
-        scaler = None
-        label_encoder = None
+    model = model_data.get('model')
+    label_encoder = model_data.get('label_encoder')
+    classes = getattr(model, 'classes_', None)
     
-    if model is None:
-        return _fallback_crop_recommendation(nitrogen, phosphorus, potassium, 
-                                              temperature, humidity, ph, rainfall)
+    if classes is not None:
+        names = np.asarray(classes)
+        if label_encoder is not None and hasattr(label_encoder, 'inverse_transform'):
+            try:
+                names = label_encoder.inverse_transform(classes)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not decode crop labels, using raw classes: {e}")
+        model_data['class_names'] = np.array([str(name) for name in names], dtype=object)
+        model_data['class_index'] = {cls: i for i, cls in enumerate(classes.tolist())}
     
-    features = np.array([[nitrogen, phosphorus, potassium, temperature, 
-                          humidity, ph, rainfall]])
+    return _compile_tree_models(model_data, 'crop')
+
+
+def _compile_tree_models(model_data: Dict, name: str) -> Dict:
+    """
+    Swap the sklearn forest and scaler for compiled NumPy equivalents
+    (bit-identical outputs, no per-call sklearn overhead) when COMPILED_TREES
+    is on. The originals stay available under sklearn_model/sklearn_scaler.
+    """
+    if not settings.COMPILED_TREES:
+        return model_data
+    
+    for key in ('model', 'scaler'):
+        original = model_data.get(key)
+        if original is None:
+            continue
+        compiled = compile_model(original)
+        if compiled is not None:
+            model_data[f'sklearn_{key}'] = original
+            model_data[key] = compiled
+    
+    if 'sklearn_model' in model_data:
+        logger.info(f"✅ Compiled {name} model ({type(model_data['sklearn_model']).__name__}) to NumPy node arrays")
+    return model_data
+
+
+def predict_crop_many(features: np.ndarray, top_k: int = 3) -> List[List[Dict]]:
+    """
+    Recommend crops for a batch of samples in one pass.
+    `features` is (n, 7): N, P, K, temperature, humidity, ph, rainfall.
+    Returns the top_k crops for every row.
+    """
+    return _predict_crop_with(load_crop_model(), features, top_k)
+
+
+def _predict_crop_with(model_data: Optional[Dict], features: np.ndarray, top_k: int = 3) -> List[List[Dict]]:
+    features = np.asarray(features, dtype=np.float64).reshape(-1, 7)
+    model = model_data.get('model') if model_data is not None else None
     
-    # Scale features if scaler exists
+    if model is None:
+        return [_fallback_crop_recommendation(*row) for row in features.tolist()]
+    
+    scaler = model_data.get('scaler')
     if scaler is not None:
         features = scaler.transform(features)
     
-    if hasattr(model, 'predict_proba'):
-        probs = model.predict_proba(features)[0]
-        classes = model.classes_
-        top_indices = np.argsort(probs)[::-1][:3]
-        recommendations = []
-        for idx in top_indices:
-            crop_name = classes[idx]
-            # Decode label if encoder exists
-            if label_encoder is not None and hasattr(label_encoder, 'inverse_transform'):
-                try:
-                    crop_name = label_encoder.inverse_transform([crop_name])[0]
-                except:
-                    pass
-            recommendations.append({
-                'crop_name': str(crop_name),
-                'confidence': float(probs[idx])
-            })
-        return recommendations
-    else:
-        pred = model.predict(features)[0]
-        crop_name = pred
-        if label_encoder is not None and hasattr(label_encoder, 'inverse_transform'):
-            try:
-                crop_name = label_encoder.inverse_transform([pred])[0]
-            except:
-                pass
-        return [{'crop_name': str(crop_name), 'confidence': 0.95}]
+    class_names = model_data.get('class_names')
+    
+    if not hasattr(model, 'predict_proba') or class_names is None:
+        preds = model.predict(features)
+        if class_names is not None:
+            index = model_data['class_index']
+            preds = [class_names[index[pred]] for pred in preds.tolist()]
+        return [[{'crop_name': str(pred), 'confidence': 0.95}] for pred in preds]
+    
+    probs = model.predict_proba(features)
+    k = min(top_k, probs.shape[1])
+    
+    # Unordered top-k per row, then sort just those k columns
+    top = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+    top_probs = np.take_along_axis(probs, top, axis=1)
+    order = np.argsort(-top_probs, axis=1, kind='stable')
+    top = np.take_along_axis(top, order, axis=1)
+    top_probs = np.take_along_axis(top_probs, order, axis=1)
+    top_names = class_names[top]
+    
+    return [
+        [{'crop_name': name, 'confidence': prob} for name, prob in zip(names, row_probs)]
+        for names, row_probs in zip(top_names.tolist(), top_probs.tolist())
+    ]
+
+
+def predict_crop(nitrogen: float, phosphorus: float, potassium: float,
+                 temperature: float, humidity: float, ph: float, 
+                 rainfall: float) -> List[Dict]:
+    """Predict best crops based on soil and climate parameters."""
+    features = np.array([[nitrogen, phosphorus, potassium, temperature, 
+                          humidity, ph, rainfall]])
+    return predict_crop_many(features)[0]
 
 
 def _fallback_crop_recommendation(n, p, k, temp, humidity, ph, rainfall):
@@ -148,49 +267,351 @@ def _fallback_crop_recommendation(n, p, k, temp, humidity, ph, rainfall):
 # ==================================================
 # DISEASE DETECTION - Hugging Face Pre-trained Model
 # ==================================================
+class DiseaseModel(NamedTuple):
+    """
+    One disease model version with everything derived from it. It is replaced
+    as a whole by a single assignment, and each request reads it once, so a
+    request never mixes one version's processor with another version's runner
+    or cache key.
+    """
+    model: Any
+    processor: Any  # HuggingFace image processor, None for a local .pth module
+    runner: Any
+    preprocessor: Optional[FastImagePreprocessor]
+    weights: str  # identifies the weights (artifact@mtime or hub id)
+    weights_path: Optional[Path] = None  # published version directory, if any
+
+    @property
+    def version(self) -> str:
+        """Weights and backend serving predictions (part of the cache key)"""
+        return f"{self.weights}+{self.runner.name}"
+
+
+def get_disease_model() -> Optional[DiseaseModel]:
+    """The live disease model, loaded on first use; None if no model could be loaded"""
+    global _disease
+    
+    if _disease is None:
+        with _disease_lock:
+            if _disease is None:
+                loaded = _read_disease_weights()
+                if loaded is not None:
+                    _disease = _build_disease_model(*loaded)
+    return _disease
+
+
 def load_disease_model():
-    """Load pre-trained disease detection model from Hugging Face or local file"""
-    global _disease_model, _disease_processor
-    
-    if _disease_model is None:
-        # Try local model files FIRST
-        local_paths = [
-            get_model_path('disease_detector_goated.pth'),
-            get_model_path('disease_detector.pth')
-        ]
-        
-        for local_path in local_paths:
-            if local_path.exists():
-                try:
-                    logger.info(f"📥 Loading local disease model from {local_path}")
-                    _disease_model = torch.load(local_path, map_location=get_device())
-                    _disease_model.eval()
-                    logger.info(f"✅ Loaded local disease detection model")
-                    return _disease_model, None  # No processor needed for local model
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to load local model {local_path}: {e}")
-        
-        # Fall back to HuggingFace only if local models don't exist
-        if HF_AVAILABLE:
+    """(model, processor) of the live disease model, (None, None) if unavailable"""
+    disease = get_disease_model()
+    return (disease.model, disease.processor) if disease is not None else (None, None)
+
+
+def _read_disease_weights() -> Optional[Tuple[Any, Any, str, Optional[Path]]]:
+    """
+    Load pre-trained disease detection weights from a published version, a
+    local file, the offline snapshot or Hugging Face.
+    Returns (model, processor, weights id, published version path).
+    """
+    # A published version (disease_detector-v<N>/, save_pretrained format) wins
+    registry = get_model_registry()
+    latest = registry.latest("disease")
+    if latest is not None and HF_AVAILABLE:
+        version, path = f"v{latest[0]}", latest[1]
+        try:
+            started = time.perf_counter()
+            model, processor = _read_disease_artifact(path)
+            registry.record("disease", version, path.name, time.perf_counter() - started)
+            logger.info(f"✅ Loaded disease model {version} from {path}")
+            return model, processor, f"{path.name}@{int(path.stat().st_mtime)}", path
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load disease model {version} from {path}: {e}")
+    
+    # Try local model files FIRST
+    local_paths = [
+        get_model_path('disease_detector_goated.pth'),
+        get_model_path('disease_detector.pth')
+    ]
+    
+    for local_path in local_paths:
+        if local_path.exists():
             try:
-                model_name = "linkanjarad/mobilenet_v2_1.0_224-plant-disease-identification"
-                logger.info(f"📥 Loading pre-trained model from HuggingFace: {model_name}")
-                
-                _disease_processor = AutoImageProcessor.from_pretrained(model_name)
-                _disease_model = AutoModelForImageClassification.from_pretrained(model_name)
-                _disease_model.to(get_device())
-                _disease_model.eval()
-                
-                logger.info(f"✅ Loaded HuggingFace plant disease model (95%+ accuracy)")
-                logger.info(f"   Classes: {len(_disease_model.config.id2label)}")
+                logger.info(f"📥 Loading local disease model from {local_path}")
+                model = torch.load(local_path, map_location=get_device())
+                model.eval()
+                if getattr(model, "config", None) is None:
+                    # Plain torchvision-style module: class names come from a sidecar
+                    labels = read_labels(local_path.parent, f"{local_path.stem}.labels.json")
+                    if labels is None:
+                        logger.warning(f"⚠️ {local_path.name} has no {local_path.stem}.labels.json - skipping")
+                        continue
+                    model.id2label = labels["id2label"]
+                registry.record("disease", BASE_VERSION, local_path.name, 0.0)
+                logger.info(f"✅ Loaded local disease detection model")
+                # No processor needed for local model
+                return model, None, f"{local_path.name}@{int(local_path.stat().st_mtime)}", None
             except Exception as e:
-                logger.error(f"⚠️ Failed to load HuggingFace model: {e}", exc_info=True)
-                _disease_model = None
-                _disease_processor = None
+                logger.warning(f"⚠️ Failed to load local model {local_path}: {e}")
+    
+    # Offline snapshot (python -m app.ml.snapshot), weights memory-mapped
+    snapshot = get_model_path(SNAPSHOT_DIR)
+    if HF_AVAILABLE and (snapshot / WEIGHTS_FILE).is_file():
+        try:
+            started = time.perf_counter()
+            model, processor = _read_disease_artifact(snapshot)
+            registry.record("disease", BASE_VERSION, snapshot.name, time.perf_counter() - started)
+            logger.info(f"✅ Loaded disease model snapshot from {snapshot}")
+            logger.info(f"   Classes: {len(model.config.id2label)}")
+            weights = f"{snapshot_source(snapshot) or snapshot.name}@{int((snapshot / WEIGHTS_FILE).stat().st_mtime)}"
+            return model, processor, weights, None
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load disease model snapshot {snapshot}: {e}")
+    
+    # Fall back to HuggingFace only if local models don't exist
+    if HF_AVAILABLE:
+        try:
+            model_name = HF_DISEASE_MODEL
+            logger.info(f"📥 Loading pre-trained model from HuggingFace: {model_name}")
+            started = time.perf_counter()
+            
+            processor = AutoImageProcessor.from_pretrained(model_name)
+            model = AutoModelForImageClassification.from_pretrained(model_name)
+            model.to(get_device())
+            model.eval()
+            registry.record("disease", BASE_VERSION, model_name, time.perf_counter() - started)
+            
+            logger.info(f"✅ Loaded HuggingFace plant disease model (95%+ accuracy)")
+            logger.info(f"   Classes: {len(model.config.id2label)}")
+            return model, processor, model_name, None
+        except Exception as e:
+            logger.error(f"⚠️ Failed to load HuggingFace model: {e}", exc_info=True)
+    else:
+        logger.warning("⚠️ Transformers not available, using fallback")
+    
+    return None
+
+
+def _build_disease_model(model, processor, weights: str, weights_path: Optional[Path] = None) -> DiseaseModel:
+    """Runner and fast decode path for freshly loaded weights"""
+    preprocessor = None
+    if processor is not None and settings.FAST_IMAGE_DECODE:
+        preprocessor = FastImagePreprocessor.from_hf_processor(processor)
+    return DiseaseModel(model, processor, _build_disease_runner(model, weights_path), preprocessor,
+                        weights, weights_path)
+
+
+def _read_disease_artifact(path: Path):
+    """
+    (model, processor) from a HuggingFace save_pretrained directory.
+    safetensors weights are memory-mapped when MMAP_MODEL_WEIGHTS is on, so
+    processes on one host share a single copy of the weights.
+    """
+    processor = AutoImageProcessor.from_pretrained(path)
+    model = load_snapshot_model(path) if settings.MMAP_MODEL_WEIGHTS else None
+    if model is None:
+        model = AutoModelForImageClassification.from_pretrained(path)
+    model.to(get_device())
+    model.eval()
+    return model, processor
+
+
+def _load_disease_artifact(path: Path) -> DiseaseModel:
+    """Load a new disease version with its own runner and decode path, warmed up"""
+    if not HF_AVAILABLE:
+        raise RuntimeError("transformers is not installed")
+    model, processor = _read_disease_artifact(path)
+    disease = _build_disease_model(model, processor, f"{path.name}@{int(path.stat().st_mtime)}", path)
+    
+    disease.runner(processor(images=Image.new('RGB', (256, 256)), return_tensors="pt")["pixel_values"])
+    return disease
+
+
+def _install_disease_model(disease: DiseaseModel, version: str, path: Path):
+    """
+    Make a new disease version live in one assignment. Requests already in
+    flight finish on the version they read. The new version gets new
+    prediction-cache keys and its own micro-batcher. Worker processes are
+    restarted so they serve it too.
+    """
+    global _disease, _disease_batcher
+    
+    with _disease_batcher_lock:
+        _disease = disease
+        retired, _disease_batcher = _disease_batcher, None
+    if retired is not None:
+        retired.shutdown()  # drains what was queued for the old version
+    _restart_worker_pool()
+
+
+def preprocess_disease_image(image_bytes: bytes, disease: Optional[DiseaseModel] = None) -> Optional[torch.Tensor]:
+    """
+    Decode an uploaded image into a (1, 3, H, W) pixel tensor for the disease model.
+    Returns None when the model or its processor is not available.
+    """
+    disease = disease or get_disease_model()
+    if disease is None or disease.processor is None:
+        return None
+    
+    if disease.preprocessor is not None:
+        with span("disease", "decode"):
+            image = disease.preprocessor.decode(image_bytes)
+        with span("disease", "preprocess"):
+            return disease.preprocessor.transform(image)
+    
+    with span("disease", "decode"):
+        image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
+    with span("disease", "preprocess"):
+        return disease.processor(images=image, return_tensors="pt")["pixel_values"]
+
+
+def get_disease_preprocessor() -> Optional[FastImagePreprocessor]:
+    """
+    Fast decode path built from the disease processor's config, or None when
+    FAST_IMAGE_DECODE is off or the processor config is not supported
+    (callers then use the HuggingFace processor directly).
+    """
+    disease = get_disease_model()
+    return disease.preprocessor if disease is not None else None
+
+
+def load_disease_runner():
+    """
+    Runner that maps pixel_values to logits for the configured DISEASE_BACKEND.
+    Compiled backends (torchscript/onnx) are parity-checked against eager mode
+    on load and fall back to eager if the artifact is missing or disagrees.
+    INT8 graphs are validated by the calibration report instead.
+    """
+    disease = get_disease_model()
+    return disease.runner if disease is not None else None
+
+
+def rebuild_disease_runner():
+    """Swap in a runner for the current DISEASE_BACKEND and thread count (same weights)"""
+    global _disease
+    disease = get_disease_model()
+    if disease is None:
+        return None
+    _disease = disease._replace(runner=_build_disease_runner(disease.model, disease.weights_path))
+    return _disease.runner
+
+
+def _build_disease_runner(model, weights_path: Optional[Path] = None):
+    """Runner for DISEASE_BACKEND if its artifact is usable for these weights, else eager"""
+    eager = EagerBackend(model, get_device())
+    backend = settings.DISEASE_BACKEND.lower()
+    if backend == "eager":
+        return eager
+    
+    model_dir = get_model_path("")
+    artifact = model_dir / ARTIFACTS.get(backend, "")
+    if weights_path is not None and artifact.is_file() and artifact.stat().st_mtime < weights_path.stat().st_mtime:
+        # Exported from older weights - re-export for the new version
+        logger.warning(f"⚠️ {artifact.name} predates {weights_path.name} - serving eager model")
+        return eager
+    
+    runner = load_compiled_disease_model(backend, model_dir, torch.get_num_threads())
+    quantized = backend.endswith("int8")
+    if runner is not None and settings.DISEASE_BACKEND_PARITY_CHECK and not quantized:
+        report = check_parity(eager, runner)
+        if report["ok"]:
+            logger.info(f"✅ {backend} parity OK (max |Δlogit| {report['max_abs_diff']:.2e})")
+        else:
+            logger.error(f"❌ {backend} parity check failed: {report} - serving eager model")
+            runner = None
+    
+    return runner or eager
+
+
+def predict_disease_batch(pixel_values: torch.Tensor, disease: Optional[DiseaseModel] = None) -> List[List[Dict]]:
+    """
+    Run one forward pass over a batch of preprocessed images.
+    Returns the top 3 predictions for every image in the batch.
+    """
+    runner = (disease or get_disease_model()).runner
+    
+    with span("disease", "forward"):
+        probs = torch.softmax(runner(pixel_values), dim=1)
+        topk = torch.topk(probs, k=min(3, probs.shape[1]), dim=1)
+    id2label = runner.id2label
+    
+    return [
+        [
+            {'disease_name': id2label[class_idx], 'confidence': confidence}
+            for class_idx, confidence in zip(indices, values)
+        ]
+        for indices, values in zip(topk.indices.cpu().tolist(), topk.values.cpu().tolist())
+    ]
+
+
+def get_disease_model_version() -> str:
+    """Identifies the weights and backend serving predictions (part of the cache key)"""
+    disease = get_disease_model()
+    return disease.version if disease is not None else "unavailable"
+
+
+def get_prediction_cache() -> Optional[PredictionCache]:
+    """Shared content-hash cache for disease predictions, or None when disabled"""
+    global _prediction_cache
+    if _prediction_cache is None and settings.PREDICTION_CACHE_ENABLED:
+        _prediction_cache = PredictionCache(
+            max_mb=settings.PREDICTION_CACHE_MB,
+            ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS,
+            disk_dir=settings.PREDICTION_CACHE_DIR or None,
+            disk_max_mb=settings.PREDICTION_CACHE_DISK_MB
+        )
+    return _prediction_cache
+
+
+def _cached_disease_prediction(image_bytes: bytes, disease: DiseaseModel) -> Tuple[Optional[str], Optional[List[Dict]]]:
+    """Returns (cache_key, cached_results); both None when the cache is disabled"""
+    cache = get_prediction_cache()
+    if cache is None:
+        return None, None
+    with span("disease", "cache"):
+        key = content_key(image_bytes, disease.version)
+        return key, cache.get(key)
+
+
+def _prepare_disease_input(image_bytes: bytes, disease: DiseaseModel) -> Tuple[Optional[str], Optional[List[Dict]], Optional[torch.Tensor]]:
+    """
+    Cache lookup followed by decode on a miss.
+    Returns (cache_key, cached_results, pixel_values); pixel_values is None
+    on a cache hit or when the model cannot decode images.
+    """
+    key, cached = _cached_disease_prediction(image_bytes, disease)
+    if cached is not None:
+        return key, cached, None
+    
+    return key, None, preprocess_disease_image(image_bytes, disease)
+
+
+def predict_disease_images(images: List[bytes]) -> List:
+    """
+    Decode and classify several uploads in one forward pass (worker-pool handler).
+    Returns one entry per image: (model version, top 3 predictions), or the
+    exception raised while decoding it.
+    """
+    disease = get_disease_model()
+    if disease is None:
+        return [("unavailable", _fallback_disease_prediction())] * len(images)
+    
+    outputs: List = [None] * len(images)
+    decoded = []
+    for i, image_bytes in enumerate(images):
+        try:
+            pixel_values = preprocess_disease_image(image_bytes, disease)
+        except Exception as e:
+            outputs[i] = e
+            continue
+        if pixel_values is None:
+            outputs[i] = (disease.version, _fallback_disease_prediction())
         else:
-            logger.warning("⚠️ Transformers not available, using fallback")
+            decoded.append((i, pixel_values))
     
-    return _disease_model, _disease_processor
+    if decoded:
+        batch = predict_disease_batch(torch.cat([pixel_values for _, pixel_values in decoded]), disease)
+        for (i, _), results in zip(decoded, batch):
+            outputs[i] = (disease.version, results)
+    return outputs
 
 
 def predict_disease(image_bytes: bytes) -> List[Dict]:
@@ -198,37 +619,87 @@ def predict_disease(image_bytes: bytes) -> List[Dict]:
     Detect plant disease from image using pre-trained model.
     Returns top 3 predictions with confidence scores.
     """
-    model, processor = load_disease_model()
+    try:
+        disease = get_disease_model()
+        if disease is None:
+            return _fallback_disease_prediction()
+        key, cached, pixel_values = _prepare_disease_input(image_bytes, disease)
+        if cached is not None:
+            return cached
+        if pixel_values is None:
+            return _fallback_disease_prediction()
+        
+        results = predict_disease_batch(pixel_values, disease)[0]
+        if key is not None:
+            get_prediction_cache().put(key, results)
+        return results
     
-    if model is None or processor is None:
+    except Exception as e:
+        logger.error(f"Disease prediction error: {e}", exc_info=True)
         return _fallback_disease_prediction()
+
+
+def _submit_disease_batch(disease: DiseaseModel, pixel_values: torch.Tensor) -> Optional[Future]:
+    """
+    Queue decoded images on the micro-batcher of `disease`, which packs
+    concurrent detections into one forward pass. Returns None if `disease`
+    was swapped out meanwhile (the caller then runs the batch itself).
+    """
+    global _disease_batcher
+    with _disease_batcher_lock:
+        if disease is not _disease:
+            return None
+        if _disease_batcher is None:
+            _disease_batcher = MicroBatcher(
+                lambda batch: predict_disease_batch(batch, disease),
+                max_batch_size=settings.DISEASE_BATCH_MAX_SIZE,
+                max_wait_ms=settings.DISEASE_BATCH_MAX_WAIT_MS,
+                name="disease-batcher"
+            )
+        # Under the lock, so a swap cannot retire the batcher between lookup and submit
+        return _disease_batcher.submit(pixel_values)
+
+
+async def predict_disease_async(image_bytes: bytes) -> List[Dict]:
+    """
+    API entry point for disease detection.
+    Checks the prediction cache in the threadpool, then either hands the raw
+    upload to the worker processes (decode + inference off this process) or
+    decodes it here and queues it on the shared micro-batcher. Both paths pack
+    concurrent uploads into a single forward pass.
+    """
+    pool = get_worker_pool()
+    if pool is None and not settings.DISEASE_BATCHING_ENABLED:
+        return await run_in_threadpool(predict_disease, image_bytes)
     
     try:
-        # Load image
-        image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
-        
-        # Process image
-        inputs = processor(images=image, return_tensors="pt").to(get_device())
-        
-        # Inference
-        with torch.no_grad():
-            outputs = model(**inputs)
-            probs = torch.softmax(outputs.logits, dim=1)[0]
-        
-        # Get top 3
-        topk = torch.topk(probs, k=min(3, len(probs)))
-        
-        results = []
-        for i in range(len(topk.indices)):
-            class_idx = topk.indices[i].item()
-            confidence = topk.values[i].item()
-            disease_name = model.config.id2label[class_idx]
-            
-            results.append({
-                'disease_name': disease_name,
-                'confidence': confidence
-            })
+        disease = _disease or await run_in_threadpool(get_disease_model)
+        if disease is None:
+            return _fallback_disease_prediction()
+        if pool is not None:
+            key, cached = await run_in_threadpool(_cached_disease_prediction, image_bytes, disease)
+            if cached is not None:
+                return cached
+            # Decode and forward pass happen in the worker; this is their total plus queueing
+            with span("disease", "inference"):
+                version, results = await asyncio.wrap_future(pool.submit("disease", image_bytes))
+            if version != disease.version:
+                key = None  # a worker already serving another version answered - do not cache under this key
+        else:
+            key, cached, pixel_values = await run_in_threadpool(_prepare_disease_input, image_bytes, disease)
+            if cached is not None:
+                return cached
+            if pixel_values is None:
+                return _fallback_disease_prediction()
+            with span("disease", "inference"):  # batch queueing + forward pass
+                future = _submit_disease_batch(disease, pixel_values)
+                if future is not None:
+                    results = (await asyncio.wrap_future(future))[0]
+                else:
+                    results = (await run_in_threadpool(predict_disease_batch, pixel_values, disease))[0]
         
+        if key is not None:
+            await run_in_threadpool(get_prediction_cache().put, key, results)
         return results
     
     except Exception as e:
@@ -236,6 +707,19 @@ def predict_disease(image_bytes: bytes) -> List[Dict]:
         return _fallback_disease_prediction()
 
 
+def get_inference_stats() -> Dict:
+    """Serving counters for /health - never triggers model loading"""
+    return {
+        "disease_backend": _disease.runner.name if _disease is not None else None,
+        "disease_model_version": _disease.weights if _disease is not None else None,
+        "disease_batcher": _disease_batcher.stats() if _disease_batcher is not None else None,
+        "prediction_cache": _prediction_cache.stats() if _prediction_cache is not None else None,
+        "worker_pool": _worker_pool.stats() if _worker_pool is not None else None,
+        "models": _registry.status() if _registry is not None else None,
+        "threads": thread_stats(),
+    }
+
+
 def _fallback_disease_prediction():
     """Fallback when model not available"""
     return [
@@ -253,11 +737,14 @@ def load_yield_model():
     global _yield_model
     
     if _yield_model is None:
-        model_path = get_model_path('yield_predictor.joblib')
+        registry = get_model_registry()
+        model_path, version = registry.resolve("yield")
         if model_path.exists():
             try:
-                _yield_model = joblib.load(model_path)
-                logger.info(f"✅ Loaded yield model from {model_path}")
+                started = time.perf_counter()
+                _yield_model = _load_yield_artifact(model_path)
+                registry.record("yield", version, model_path.name, time.perf_counter() - started)
+                logger.info(f"✅ Loaded yield model {version} from {model_path}")
             except Exception as e:
                 logger.error(f"❌ Failed to load yield model: {e}", exc_info=True)
                 _yield_model = None
@@ -267,63 +754,374 @@ def load_yield_model():
     return _yield_model
 
 
-def predict_yield(crop: str, season: str, state: str, area: float,
-                  rainfall: float, fertilizer: float, pesticide: float) -> Dict:
-    """Predict crop yield based on input parameters."""
-    model_data = load_yield_model()
-    
+YIELD_CATEGORICALS = ('Crop', 'Season', 'State')
+
+
+def _load_yield_artifact(path: Path) -> Dict:
+    """Load, prepare and warm up a yield model file"""
+    model_data = _prepare_yield_model(joblib.load(path))
+    crop, season, state = (next(iter(model_data['lookups'][col]), '') for col in YIELD_CATEGORICALS)
+    _predict_yield_with(model_data, [dict(crop=crop, season=season, state=state, area=1.0,
+                                          rainfall=0.0, fertilizer=0.0, pesticide=0.0)])
+    return model_data
+
+
+def _install_yield_model(model_data: Dict, version: str, path: Path):
+    global _yield_model
+    _yield_model = model_data
+    _restart_worker_pool()
+
+
+def _prepare_yield_model(model_data: Dict) -> Dict:
+    """
+    Compile the Crop/Season/State label encoders into plain dict lookup
+    tables (category -> code) so encoding is a dict get, not a sklearn call.
+    """
+    encoders = model_data['encoders']
+    model_data['lookups'] = {
+        col: {category: code for code, category in enumerate(encoders[col].classes_.tolist())}
+        for col in YIELD_CATEGORICALS
+    }
+    return _compile_tree_models(model_data, 'yield')
+
+
+def predict_yield_many(rows: List[Dict]) -> List[Dict]:
+    """
+    Predict yield for a table of rows in one pass.
+    Each row has crop, season, state, area, rainfall, fertilizer and pesticide.
+    Rows with an unknown crop get an error entry; unknown season/state
+    encode as 0, as in single predictions.
+    """
+    return _predict_yield_with(load_yield_model(), rows)
+
+
+def _predict_yield_with(model_data: Optional[Dict], rows: List[Dict]) -> List[Dict]:
     if model_data is None:
         logger.warning(f"Yield model not loaded")
-        return {'predicted_yield': 0.0, 'confidence': 0.0, 'error': 'Yield model not loaded'}
+        return [{'predicted_yield': 0.0, 'confidence': 0.0, 'error': 'Yield model not loaded'} for _ in rows]
     
-    model = model_data['model']
-    scaler = model_data['scaler']
-    encoders = model_data['encoders']
+    lookups = model_data['lookups']
+    crops, seasons, states = (lookups[col] for col in YIELD_CATEGORICALS)
+    results: List[Optional[Dict]] = [None] * len(rows)
+    valid, features = [], []
+    unknown_seasons, unknown_states = set(), set()
     
-    try:
-        crop_encoded = encoders['Crop'].transform([crop])[0]
-    except Exception as e:
-        logger.warning(f"Unknown crop '{crop}': {e}")
-        return {'predicted_yield': 0.0, 'confidence': 0.0, 'error': f'Unknown crop: {crop}'}
+    for i, row in enumerate(rows):
+        crop_code = crops.get(row['crop'])
+        if crop_code is None:
+            logger.warning(f"Unknown crop '{row['crop']}'")
+            results[i] = {'predicted_yield': 0.0, 'confidence': 0.0, 'error': f"Unknown crop: {row['crop']}"}
+            continue
+        
+        season_code = seasons.get(row['season'])
+        if season_code is None:
+            unknown_seasons.add(row['season'])
+            season_code = 0
+        state_code = states.get(row['state'])
+        if state_code is None:
+            unknown_states.add(row['state'])
+            state_code = 0
+        
+        valid.append(i)
+        features.append((crop_code, season_code, state_code, row['area'],
+                         row['rainfall'], row['fertilizer'], row['pesticide']))
     
-    try:
-        season_encoded = encoders['Season'].transform([season])[0]
-    except Exception as e:
-        logger.warning(f"Unknown season '{season}': {e}")
-        season_encoded = 0
+    if unknown_seasons:
+        logger.warning(f"Unknown season(s) {sorted(unknown_seasons)} - encoded as 0")
+    if unknown_states:
+        logger.warning(f"Unknown state(s) {sorted(unknown_states)} - encoded as 0")
     
-    try:
-        state_encoded = encoders['State'].transform([state])[0]
-    except Exception as e:
-        logger.warning(f"Unknown state '{state}': {e}")
-        state_encoded = 0
+    if valid:
+        try:
+            features_scaled = model_data['scaler'].transform(np.array(features, dtype=np.float64))
+            predictions = model_data['model'].predict(features_scaled)
+            confidence = model_data.get('r2_score', 0.97)
+            for i, prediction in zip(valid, predictions.tolist()):
+                results[i] = {'predicted_yield': float(prediction), 'confidence': confidence}
+        except Exception as e:
+            logger.error(f"Yield prediction error for {len(valid)} rows: {e}", exc_info=True)
+            for i in valid:
+                results[i] = {'predicted_yield': 0.0, 'confidence': 0.0, 'error': str(e)}
     
+    return results
+
+
+def predict_yield(crop: str, season: str, state: str, area: float,
+                  rainfall: float, fertilizer: float, pesticide: float) -> Dict:
+    """Predict crop yield based on input parameters."""
+    return predict_yield_many([dict(crop=crop, season=season, state=state, area=area,
+                                    rainfall=rainfall, fertilizer=fertilizer, pesticide=pesticide)])[0]
+
+
+async def predict_yield_async(crop: str, season: str, state: str, area: float,
+                              rainfall: float, fertilizer: float, pesticide: float) -> Dict:
+    """API entry point for yield prediction - runs in the worker pool when enabled"""
+    params = dict(crop=crop, season=season, state=state, area=area,
+                  rainfall=rainfall, fertilizer=fertilizer, pesticide=pesticide)
+    pool = get_worker_pool()
+    if pool is None:
+        return await run_in_threadpool(predict_yield, **params)
     try:
-        features = np.array([[crop_encoded, season_encoded, state_encoded, 
-                              area, rainfall, fertilizer, pesticide]])
-        features_scaled = scaler.transform(features)
-        prediction = model.predict(features_scaled)[0]
-        
-        return {
-            'predicted_yield': float(prediction),
-            'confidence': model_data.get('r2_score', 0.97)
-        }
+        return await asyncio.wrap_future(pool.submit("yield", params))
     except Exception as e:
         logger.error(f"Yield prediction error for {crop}: {e}", exc_info=True)
         return {'predicted_yield': 0.0, 'confidence': 0.0, 'error': str(e)}
 
 
+async def predict_yield_many_async(rows: List[Dict]) -> List[Dict]:
+    """Batch yield prediction off the event loop - in the worker pool when enabled"""
+    pool = get_worker_pool()
+    if pool is None:
+        return await run_in_threadpool(predict_yield_many, rows)
+    return await asyncio.wrap_future(pool.submit("yield_many", rows))
+
+
+# ==================================================
+# PROCESS-POOL INFERENCE
+# ==================================================
+def _init_worker_process():
+    """Runs in each worker process (a fresh interpreter): load the models its handlers serve"""
+    get_disease_model()
+    load_yield_model()
+
+
+def _predict_yield_task(params: Dict) -> Dict:
+    return predict_yield(**params)
+
+
+def _spawn_worker_pool() -> Optional[InferenceProcessPool]:
+    """Start a pool and wait for its workers to load the models; None if that fails"""
+    pool = InferenceProcessPool(
+        handlers={"yield": _predict_yield_task, "yield_many": predict_yield_many},
+        batch_handlers={"disease": predict_disease_images},
+        num_processes=settings.ML_WORKER_PROCESSES,
+        init=_init_worker_process,
+        max_batch_size=settings.DISEASE_BATCH_MAX_SIZE,
+        max_wait_ms=settings.DISEASE_BATCH_MAX_WAIT_MS,
+    )
+    try:
+        pool.start()
+    except Exception as e:
+        logger.error(f"❌ {e} - serving models in-process")
+        return None
+    return pool
+
+
+def start_worker_pool() -> Optional[InferenceProcessPool]:
+    """
+    Start ML_WORKER_PROCESSES inference workers. Each one is a fresh process
+    (forkserver/spawn, see app/ml/workers.py) that loads the models itself;
+    memory-mapped safetensors weights are shared through the page cache.
+    Disease detection and yield prediction are then served from the pool.
+    """
+    global _worker_pool
+    
+    if _worker_pool is not None or settings.ML_WORKER_PROCESSES <= 0:
+        return _worker_pool
+    _worker_pool = _spawn_worker_pool()
+    return _worker_pool
+
+
+def get_worker_pool() -> Optional[InferenceProcessPool]:
+    """The running worker pool, or None when disabled or broken (serve in-process)"""
+    if _worker_pool is not None and _worker_pool.healthy:
+        return _worker_pool
+    return None
+
+
+def _restart_worker_pool():
+    """
+    Start workers for the new weights after a model swap, then retire the
+    old ones. They keep serving until the new workers are ready, and their
+    results are tagged with the old version.
+    """
+    global _worker_pool
+    old = _worker_pool
+    if old is None:
+        return
+    _worker_pool = _spawn_worker_pool()
+    old.shutdown()
+
+
+def stop_worker_pool():
+    """Shut down the worker processes (app shutdown)"""
+    global _worker_pool
+    if _worker_pool is not None:
+        _worker_pool.shutdown()
+        _worker_pool = None
+
+
 # ==================================================
 # INITIALIZATION
 # ==================================================
+ML_MODELS = ("crop", "disease", "yield")
+
+# Seconds clients are told to wait (Retry-After) while a model is still loading
+RETRY_AFTER_SECONDS = 5
+
+_load_state: Dict[str, Dict] = {name: {"state": "pending"} for name in ML_MODELS}
+_load_state_lock = threading.Lock()
+_loader_thread = None
+
+
+_MODEL_LOADERS = {
+    "crop": load_crop_model,
+    "disease": get_disease_model,  # Will download from HuggingFace
+    "yield": load_yield_model,
+}
+
+
+def _warmup_crop(batch_size: int):
+    rng = np.random.default_rng(batch_size)
+    predict_crop_many(rng.random((batch_size, 7)) * [140, 145, 205, 44, 100, 9.9, 300])
+
+
+def _warmup_yield(batch_size: int):
+    lookups = _yield_model['lookups']
+    crop, season, state = (next(iter(lookups[col]), '') for col in YIELD_CATEGORICALS)
+    predict_yield_many([dict(crop=crop, season=season, state=state, area=1.0 + i,
+                             rainfall=1000.0, fertilizer=100.0, pesticide=1.0)
+                        for i in range(batch_size)])
+
+
+_warmup_images: List[bytes] = []
+
+
+def _warmup_disease(batch_size: int):
+    """Decode + classify synthetic photo-sized JPEGs (bypasses the prediction cache)"""
+    while len(_warmup_images) < batch_size:
+        rng = np.random.default_rng(len(_warmup_images))
+        buffer = io.BytesIO()
+        Image.fromarray(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)).save(buffer, 'JPEG')
+        _warmup_images.append(buffer.getvalue())
+    outputs = predict_disease_images(_warmup_images[:batch_size])
+    errors = [output for output in outputs if isinstance(output, Exception)]
+    if errors:
+        raise errors[0]
+
+
+_WARMUPS = {
+    "crop": _warmup_crop,
+    "disease": _warmup_disease,
+    "yield": _warmup_yield,
+}
+
+
+def _latency_slo_ms(name: str) -> float:
+    return {
+        "crop": settings.CROP_LATENCY_SLO_MS,
+        "disease": settings.DISEASE_LATENCY_SLO_MS,
+        "yield": settings.YIELD_LATENCY_SLO_MS,
+    }[name]
+
+
+def _load_tracked(name: str):
+    """Run one model's loader and warmup, recording state, load time and latencies for /health"""
+    with _load_state_lock:
+        _load_state[name] = {"state": "loading", "started_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    started = time.perf_counter()
+    warmup = slo_breach = None
+    try:
+        loaded = _MODEL_LOADERS[name]()
+        # Loaders log and return None on failure; routes then serve their fallbacks
+        state, error = ("ready", None) if loaded is not None else ("unavailable", "model not found or failed to load")
+        if loaded is not None and settings.WARMUP_ENABLED:
+            with _load_state_lock:
+                _load_state[name]["state"] = "warming"
+            warmup = run_warmup(_WARMUPS[name], parse_batch_sizes(settings.WARMUP_BATCH_SIZES),
+                                settings.WARMUP_ITERATIONS)
+            slo_breach = check_slo(warmup, _latency_slo_ms(name))
+            if slo_breach:
+                logger.error(f"❌ {name} model warmup: {slo_breach} - replica will report not ready")
+                state = "slo_exceeded"
+            else:
+                logger.info(f"✅ {name} model warm: " + ", ".join(
+                    f"batch {size} p50 {r['p50_ms']:.1f}ms p99 {r['p99_ms']:.1f}ms" for size, r in warmup.items()))
+    except Exception as e:
+        logger.error(f"❌ Loading {name} model failed: {e}", exc_info=True)
+        state, error = "failed", str(e)
+    with _load_state_lock:
+        _load_state[name].update(state=state, load_seconds=round(time.perf_counter() - started, 3))
+        if warmup is not None:
+            _load_state[name]["warmup"] = warmup
+        if slo_breach:
+            _load_state[name]["slo_breach"] = slo_breach
+        if error:
+            _load_state[name]["error"] = error
+
+
 def load_all_models():
-    """Load all models at startup"""
+    """Load all models at startup - concurrently, then start worker processes and hot reload"""
     logger.info("="*50)
     logger.info("🔧 Loading ML Models...")
     logger.info("="*50)
     
-    load_crop_model()
-    load_disease_model()  # Will download from HuggingFace
-    load_yield_model()
+    get_model_registry()  # shared by the loaders, create before they start
+    with ThreadPoolExecutor(max_workers=len(ML_MODELS), thread_name_prefix="model-loader") as loaders:
+        list(loaders.map(_load_tracked, ML_MODELS))
+    if settings.WARMUP_ENABLED:
+        reset_metrics()  # stage histograms should describe real traffic, not warmup
+    start_worker_pool()
+    get_model_registry().start()
     
     logger.info("="*50 + "\n")
+
+
+def start_background_loading():
+    """
+    Load the models on a background thread so the app serves non-ML routes
+    immediately; ML routes answer 503 + Retry-After until their model is loaded.
+    """
+    global _loader_thread
+    if _loader_thread is None:
+        _loader_thread = threading.Thread(target=load_all_models, name="model-loader", daemon=True)
+        _loader_thread.start()
+
+
+def model_ready(name: str) -> bool:
+    """
+    False while the model is loading at startup. Outside of startup loading
+    (scripts, tests) models load lazily on first use, so they count as ready.
+    """
+    with _load_state_lock:
+        state = _load_state[name]["state"]
+    return state not in ("loading", "warming") and not (state == "pending" and _loader_thread is not None)
+
+
+def all_models_ready() -> bool:
+    return all(model_ready(name) for name in ML_MODELS)
+
+
+def get_readiness() -> Tuple[bool, List[str]]:
+    """
+    Replica readiness for the load balancer: every model has finished loading
+    and none exceeded its latency SLO during warmup. Returns (ready, reasons).
+    """
+    reasons = [f"{name} model is still loading" for name in ML_MODELS if not model_ready(name)]
+    with _load_state_lock:
+        reasons += [f"{name}: {state['slo_breach']}" for name, state in _load_state.items() if state.get("slo_breach")]
+    return not reasons, reasons
+
+
+def require_model(name: str):
+    """Route dependency: 503 with Retry-After while `name` is still loading"""
+    def check_model_ready():
+        if not model_ready(name):
+            raise HTTPException(
+                status_code=503,
+                detail=f"The {name} model is still loading, retry shortly",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+            )
+    return check_model_ready
+
+
+def get_model_load_status() -> Dict:
+    """Per-model load state (pending/loading/warming/ready/slo_exceeded/unavailable/failed), load time and warmup latencies"""
+    with _load_state_lock:
+        return {name: dict(state) for name, state in _load_state.items()}
+
+
+def get_device_info() -> Dict:
+    """CUDA availability for /health and startup logs"""
+    cuda = torch.cuda.is_available()
+    return {"cuda": cuda, "gpu": torch.cuda.get_device_name(0) if cuda else None}
@@ -0,0 +1,69 @@
+"""
+Crop Recommendation Batch Benchmark
+Per-sample predict_crop calls vs one predict_crop_many call at 1, 100 and 10k rows
+
+Usage (run from backend/):
+    python -m benchmarks.crop_batch
+    python -m benchmarks.crop_batch --rows 1 100 10000 --loop-limit 500
+"""
+
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from app import ml_service
+
+# Realistic ranges of N, P, K, temperature, humidity, ph, rainfall
+FEATURE_RANGES = np.array([
+    [0, 140], [5, 145], [5, 205], [8, 44], [14, 100], [3.5, 9.9], [20, 300]
+])
+
+
+def synthetic_samples(rows: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    low, high = FEATURE_RANGES[:, 0], FEATURE_RANGES[:, 1]
+    return low + rng.random((rows, 7)) * (high - low)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched crop recommendation")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--loop-limit", type=int, default=1000,
+                        help="Per-sample loop runs at most this many rows and is extrapolated beyond")
+    parser.add_argument("--model", type=Path, default=None, help="Crop model .pkl (default: ml/models)")
+    args = parser.parse_args()
+
+    if args.model is not None:
+        import joblib
+        ml_service._crop_model = ml_service._prepare_crop_model(joblib.load(args.model))
+    if ml_service.load_crop_model() is None:
+        raise SystemExit("❌ Crop model not found - train it or pass --model")
+
+    ml_service.predict_crop_many(synthetic_samples(2))  # warm up
+
+    print(f"{'rows':>7} {'per-sample (ms)':>16} {'batch (ms)':>11} {'speedup':>8}")
+    for rows in args.rows:
+        samples = synthetic_samples(rows)
+
+        looped = samples[:args.loop_limit]
+        start = time.perf_counter()
+        for row in looped:
+            ml_service.predict_crop(*row)
+        loop_ms = (time.perf_counter() - start) * 1000 * rows / len(looped)
+
+        start = time.perf_counter()
+        results = ml_service.predict_crop_many(samples)
+        batch_ms = (time.perf_counter() - start) * 1000
+        assert len(results) == rows
+
+        note = "*" if rows > len(looped) else ""
+        print(f"{rows:>7} {loop_ms:>15.1f}{note or ' '} {batch_ms:>11.1f} {loop_ms / batch_ms:>7.1f}x")
+
+    if any(rows > args.loop_limit for rows in args.rows):
+        print(f"* extrapolated from {args.loop_limit} per-sample calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Disease Image Decode Benchmark
+HuggingFace processor path vs the fast reduced-scale decode path
+
+Usage (run from backend/):
+    python -m benchmarks.decode --images /path/to/phone_photos
+    python -m benchmarks.decode --synthetic 8 --size 4000x3000
+
+Without --images, synthetic photo-like JPEGs are generated at --size.
+"""
+
+import io
+import time
+import argparse
+import statistics
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import torch
+from PIL import Image
+
+from app.ml.preprocess import FastImagePreprocessor
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+
+def synthetic_jpeg(width: int, height: int, seed: int, quality: int = 90) -> bytes:
+    """Smooth gradients plus sensor-like noise, so the JPEG size resembles a real photo"""
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, (height // 64 + 1, width // 64 + 1, 3), dtype=np.uint8)
+    image = Image.fromarray(small).resize((width, height), Image.BICUBIC)
+    pixels = np.asarray(image, dtype=np.int16) + rng.integers(-12, 13, (height, width, 3), dtype=np.int16)
+    buffer = io.BytesIO()
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def load_images(folder: Path, limit: int) -> List[bytes]:
+    paths = [p for p in sorted(folder.rglob("*")) if p.suffix.lower() in IMAGE_EXTENSIONS]
+    return [p.read_bytes() for p in paths[:limit]]
+
+
+def load_processor():
+    """The deployed model's processor, or the stock MobileNetV2 config when offline"""
+    from app.ml_service import load_disease_model
+    _, processor = load_disease_model()
+    if processor is None:
+        from transformers import MobileNetV2ImageProcessor
+        print("⚠️ Disease processor unavailable, using the default MobileNetV2ImageProcessor config")
+        processor = MobileNetV2ImageProcessor()
+    return processor
+
+
+def time_path(fn: Callable[[bytes], torch.Tensor], images: List[bytes], repeat: int) -> Dict:
+    fn(images[0])  # warm up
+    timings = []
+    for _ in range(repeat):
+        for data in images:
+            start = time.perf_counter()
+            fn(data)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p95_ms": timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark disease image preprocessing")
+    parser.add_argument("--images", type=Path, default=None, help="Folder of real photos")
+    parser.add_argument("--limit", type=int, default=20, help="Max images to load from --images")
+    parser.add_argument("--synthetic", type=int, default=8, help="Synthetic images when --images is not given")
+    parser.add_argument("--size", default="4000x3000", help="Synthetic image size WxH (default 12MP)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.images:
+        images = load_images(args.images, args.limit)
+        if not images:
+            raise SystemExit(f"❌ No images found in {args.images}")
+    else:
+        width, height = (int(v) for v in args.size.lower().split("x"))
+        images = [synthetic_jpeg(width, height, seed) for seed in range(args.synthetic)]
+
+    processor = load_processor()
+    fast = FastImagePreprocessor.from_hf_processor(processor)
+    if fast is None:
+        raise SystemExit(f"❌ {type(processor).__name__} config is not supported by the fast path")
+
+    def processor_path(data: bytes) -> torch.Tensor:
+        image = Image.open(io.BytesIO(data)).convert("RGB")
+        return processor(images=image, return_tensors="pt")["pixel_values"]
+
+    first = Image.open(io.BytesIO(images[0]))
+    print(f"📷 {len(images)} images, {first.size[0]}x{first.size[1]} {first.format}, "
+          f"avg {sum(map(len, images)) / len(images) / 1024:.0f} KB, {args.repeat} passes")
+
+    results = {
+        "processor": time_path(processor_path, images, args.repeat),
+        "fast": time_path(fast, images, args.repeat),
+    }
+    for name, r in results.items():
+        print(f"   {name:<10} mean {r['mean_ms']:8.1f} ms   p50 {r['p50_ms']:8.1f} ms   p95 {r['p95_ms']:8.1f} ms")
+    print(f"   speedup    {results['processor']['mean_ms'] / results['fast']['mean_ms']:.1f}x")
+
+    # Fidelity: reduced-scale decode is not bit-exact, report how far the inputs drift
+    diffs = [(processor_path(d) - fast(d)).abs() for d in images]
+    print(f"   pixel diff max {max(float(d.max()) for d in diffs):.3f}   "
+          f"mean {statistics.mean(float(d.mean()) for d in diffs):.4f} (normalized units)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Query Count Check
+Asserts the crop cycle listing endpoints issue a fixed number of SQL
+statements however many cycles they return (no per-cycle N+1 queries)
+
+Seeds a fresh SQLite database with a land holding --cycles active cycles,
+each with a few activity logs, calls the endpoint functions on an
+AsyncSession and counts the statements executed. Exits non-zero if a count
+grows with the number of cycles or exceeds its budget.
+
+Usage (run from backend/):
+    python -m benchmarks.query_counts
+    python -m benchmarks.query_counts --cycles 200
+"""
+
+import sys
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.v1.endpoints import cropcycle
+from app.db.database import create_async_sqlite_engine
+from app.db.models import Base, Farmer, Land, CropCycle, ActivityLog
+
+# Statements each endpoint may issue, independent of the number of cycles
+BUDGETS = {
+    "/cropcycle/active/all": 2,      # cycles + land (joined), activities (selectin)
+    "/cropcycle/land/{land_id}": 4,  # land + farmer, land.crop_cycles, cycles + land, activities
+    "/cropcycle/{cycle_id}": 2,      # cycle + land, activities
+}
+
+
+async def seed(Session, cycles: int, activities: int):
+    async with Session() as db:
+        farmer = Farmer(farmer_id="FQC0001", name="Query Count", phone="9000000001",
+                        state="Karnataka", district="Mysuru")
+        land = Land(land_id="LQC0001", farmer=farmer, area_acres=2.0)
+        now = datetime.now()
+        for i in range(cycles):
+            cycle = CropCycle(cycle_id=f"CCQ{i:05d}", land=land, crop="rice", season="kharif",
+                              sowing_date=now - timedelta(days=30 + i % 60))
+            db.add_all(ActivityLog(crop_cycle=cycle, activity_type="irrigation",
+                                   activity_date=now - timedelta(days=j)) for j in range(activities))
+            db.add(cycle)
+        db.add(farmer)
+        await db.commit()
+
+
+async def count_queries(cycles: int, activities: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_sqlite_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'counts.db'}", production=False)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(Session, cycles, activities)
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        async def run(call):
+            statements.clear()
+            async with Session() as db:
+                result = await call(db)
+            return len(statements), result
+
+        counts = {}
+        counts["/cropcycle/active/all"], active = await run(lambda db: cropcycle.get_all_active_cycles(db=db))
+        counts["/cropcycle/land/{land_id}"], by_land = await run(
+            lambda db: cropcycle.get_land_cycles("LQC0001", active_only=True, db=db))
+        counts["/cropcycle/{cycle_id}"], one = await run(lambda db: cropcycle.get_crop_cycle("CCQ00000", db=db))
+        await engine.dispose()
+
+    # The responses must still carry every cycle and its activities
+    assert active["total_active"] == min(cycles, 100) and by_land["total"] == cycles
+    assert all(len(c.activities) == activities for c in active["cycles"] + by_land["cycles"])
+    assert len(one.activities) == activities
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check crop cycle listings for N+1 queries")
+    parser.add_argument("--cycles", type=int, default=50, help="Active cycles on the seeded land")
+    parser.add_argument("--activities", type=int, default=3, help="Activity logs per cycle")
+    args = parser.parse_args()
+
+    baseline = asyncio.run(count_queries(1, args.activities))
+    loaded = asyncio.run(count_queries(args.cycles, args.activities))
+
+    failures = 0
+    print(f"{'endpoint':<28} {'1 cycle':>8} {f'{args.cycles} cycles':>10} {'budget':>7}")
+    for endpoint, budget in BUDGETS.items():
+        ok = loaded[endpoint] == baseline[endpoint] and loaded[endpoint] <= budget
+        failures += not ok
+        print(f"{endpoint:<28} {baseline[endpoint]:>8} {loaded[endpoint]:>10} {budget:>7}  {'ok' if ok else 'FAIL'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Query Plan Check
+Asserts the hot API queries are served by the indexes declared in
+app/db/models.py (migration 0002) rather than full table scans
+
+Each check builds the same statement as the endpoint or crud_async function
+named in its label, runs EXPLAIN QUERY PLAN on a fresh SQLite database and
+looks for the expected index in the plan. Exits non-zero if any check fails,
+so it can gate CI next to the benchmarks.
+
+Usage (run from backend/):
+    python -m benchmarks.query_plans
+    python -m benchmarks.query_plans --verbose
+"""
+
+import sys
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from app.db.crud_async import _farmers, _cycles
+from app.db.database import create_sqlite_engine
+from app.db.pagination import encode_cursor, keyset_statement
+from app.db.models import Base, Farmer, CropCycle, DiseaseLog, ActivityLog, Complaint
+
+
+def checks():
+    """(label, statement, expected index) for each hot query shape"""
+    since = datetime(2026, 1, 1)
+    complaints = select(Complaint).options(joinedload(Complaint.farmer))
+    cursor = encode_cursor("2026-01-01 10:00:00", 500)
+    return [
+        # crud_async
+        ("crud.get_farmers(state=...)",
+         _farmers(Farmer.is_active == True, Farmer.state == "Karnataka").limit(100),
+         "ix_farmers_state_active"),
+        ("crud.get_land_crop_cycles (cropcycle /land)",
+         _cycles(CropCycle.land_id == 1, CropCycle.is_active == True).order_by(CropCycle.sowing_date.desc()),
+         "ix_crop_cycles_land_active_sowing"),
+        ("crud.get_land_crop_cycles(active_only=False)",
+         _cycles(CropCycle.land_id == 1).order_by(CropCycle.sowing_date.desc()),
+         "ix_crop_cycles_land_active_sowing"),
+        ("crud.get_active_crop_cycles (cropcycle /active)",
+         _cycles(CropCycle.is_active == True).limit(100),
+         "ix_crop_cycles_active_sowing"),
+        ("crud.get_disease_logs_for_cycle",
+         select(DiseaseLog).where(DiseaseLog.crop_cycle_id == 1),
+         "ix_disease_logs_crop_cycle"),
+        ("crud.get_recent_disease_logs",
+         select(DiseaseLog).order_by(DiseaseLog.detected_at.desc()).limit(50),
+         "ix_disease_logs_detected_at"),
+        ("crud.get_cycle_activities (cycle_to_response)",
+         select(ActivityLog).where(ActivityLog.crop_cycle_id == 1).order_by(ActivityLog.activity_date.desc()),
+         "ix_activity_logs_cycle_date"),
+        # complaints.py
+        ("complaints /my",
+         complaints.where(Complaint.farmer_id == 1).order_by(Complaint.created_at.desc()),
+         "ix_complaints_farmer_created"),
+        ("complaints district farmers",
+         select(Farmer.id).where(Farmer.district == "Mysuru"),
+         "ix_farmers_district"),
+        ("complaints /district",
+         complaints.where(Complaint.farmer_id.in_([1, 2, 3]), Complaint.status == "pending"),
+         "ix_complaints_farmer_status"),
+        ("complaints /admin/stats (grouped)",
+         select(Complaint.status, func.count(Complaint.id)).select_from(Farmer)
+         .outerjoin(Complaint, Complaint.farmer_id == Farmer.id)
+         .where(Farmer.district == "Mysuru").group_by(Complaint.status),
+         "ix_complaints_farmer_status"),
+        ("complaints /admin/all?status=",
+         complaints.where(Complaint.status == "pending").order_by(Complaint.created_at.desc()),
+         "ix_complaints_status_created"),
+        ("complaints /admin/all?district=",
+         complaints.join(Farmer).where(Farmer.district == "Mysuru").order_by(Complaint.created_at.desc()),
+         "ix_farmers_district"),
+        # keyset-paginated admin listings
+        ("complaints /admin/all page 2",
+         keyset_statement(complaints, Complaint, cursor, 51, "sqlite"),
+         "ix_complaints_created_id"),
+        ("farmer /all page 2",
+         keyset_statement(select(Farmer), Farmer, cursor, 51, "sqlite"),
+         "ix_farmers_created_id"),
+        # export.py
+        ("export /disease-logs?start_date=",
+         select(DiseaseLog).where(DiseaseLog.detected_at >= since).order_by(DiseaseLog.detected_at.desc()),
+         "ix_disease_logs_detected_at"),
+        ("export /disease-logs (all)",
+         select(DiseaseLog).order_by(DiseaseLog.detected_at.desc()),
+         "ix_disease_logs_detected_at"),
+        ("export /stats disease distribution",
+         select(DiseaseLog.disease_name, func.count(DiseaseLog.id)).group_by(DiseaseLog.disease_name),
+         "ix_disease_logs_disease_name"),
+        ("export /crop-cycles?active_only=",
+         select(CropCycle).where(CropCycle.is_active == True).order_by(CropCycle.sowing_date.desc()),
+         "ix_crop_cycles_active_sowing"),
+        ("export /stats active cycles",
+         select(func.count(CropCycle.id)).where(CropCycle.is_active == True),
+         "ix_crop_cycles_active_sowing"),
+    ]
+
+
+def explain(connection, statement) -> str:
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that hot queries use the composite indexes")
+    parser.add_argument("--verbose", action="store_true", help="Print every query plan")
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(f"sqlite:///{Path(tmp) / 'plans.db'}", production=False)
+        Base.metadata.create_all(engine)
+        with engine.connect() as connection:
+            for label, statement, index in checks():
+                plan = explain(connection, statement)
+                ok = index in plan
+                failures += not ok
+                print(f"{'ok' if ok else 'FAIL':<5} {label:<48} {index}")
+                if args.verbose or not ok:
+                    print("      " + plan.replace("\n", "\n      "))
+        engine.dispose()
+
+    print(f"\n{len(checks()) - failures} passed, {failures} failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
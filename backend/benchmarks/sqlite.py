@@ -0,0 +1,144 @@
+"""
+SQLite Concurrency Benchmark
+Reader latency and read/write throughput for the single-connection setup vs
+the production profile (WAL, tuned pragmas, connection pool)
+
+Readers run the disease-history style queries the API serves while writers
+insert disease logs, each in its own thread (as in the threadpool and the
+write-behind writer). Writers are throttled to --write-rate commits/s each so
+both profiles do the same write work and reader latency is comparable; use
+--write-rate 0 to measure maximum write throughput instead. Every profile gets
+a fresh database file with the same seed data.
+
+Usage (run from backend/):
+    python -m benchmarks.sqlite
+    python -m benchmarks.sqlite --readers 8 --writers 2 --seconds 10 --rows 20000
+    python -m benchmarks.sqlite --write-rate 0
+"""
+
+import time
+import random
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import create_sqlite_engine
+from app.db.models import Base, Farmer, DiseaseLog
+
+DISEASES = ["Tomato___Late_blight", "Potato___Early_blight", "Pepper__bell___Bacterial_spot", "Tomato___healthy"]
+
+
+def seed(Session, farmers: int, rows: int):
+    with Session() as db:
+        db.add_all(Farmer(farmer_id=f"F{i:06d}", name=f"Farmer {i}", phone=f"9{i:09d}",
+                          state="Karnataka", district=f"D{i % 30}") for i in range(farmers))
+        db.flush()
+        db.bulk_insert_mappings(DiseaseLog, [
+            {"log_id": f"DIS{i:08d}", "farmer_id": 1 + i % farmers, "disease_name": DISEASES[i % len(DISEASES)],
+             "confidence": 0.9, "severity": "moderate"}
+            for i in range(rows)
+        ])
+        db.commit()
+
+
+def read_once(db, farmers: int):
+    farmer_id = random.randint(1, farmers)
+    db.execute(select(DiseaseLog).where(DiseaseLog.farmer_id == farmer_id)
+               .order_by(DiseaseLog.detected_at.desc()).limit(20)).all()
+    db.execute(select(DiseaseLog.disease_name, func.count()).group_by(DiseaseLog.disease_name)).all()
+
+
+def write_once(db, farmers: int, n: int):
+    db.add(DiseaseLog(log_id=f"W{threading.get_ident() % 10**6:06d}{n:07d}", farmer_id=random.randint(1, farmers),
+                      disease_name=random.choice(DISEASES), confidence=0.8, severity="mild"))
+    db.commit()
+
+
+def run_profile(production: bool, readers: int, writers: int, seconds: float, farmers: int, rows: int,
+                write_rate: float = 0):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", production=production)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        seed(Session, farmers, rows)
+
+        stop = threading.Event()
+        read_ms = [[] for _ in range(readers)]
+        writes = [0] * writers
+        errors = []
+
+        def reader(out):
+            with Session() as db:
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    try:
+                        read_once(db, farmers)
+                        db.rollback()  # end the read transaction, as a request would
+                    except Exception as e:
+                        errors.append(type(e).__name__)
+                        db.rollback()
+                        continue
+                    out.append((time.perf_counter() - start) * 1000)
+
+        def writer(index):
+            interval = 1.0 / write_rate if write_rate > 0 else 0.0
+            next_at = time.perf_counter()
+            with Session() as db:
+                while not stop.is_set():
+                    try:
+                        write_once(db, farmers, writes[index])
+                        writes[index] += 1
+                    except Exception as e:
+                        errors.append(type(e).__name__)
+                        db.rollback()
+                    if interval:
+                        next_at += interval
+                        stop.wait(max(0.0, next_at - time.perf_counter()))
+
+        threads = [threading.Thread(target=reader, args=(out,)) for out in read_ms]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    flat = np.concatenate([np.asarray(out) for out in read_ms]) if any(read_ms) else np.zeros(1)
+    return {
+        "reads_per_s": sum(len(out) for out in read_ms) / seconds,
+        "writes_per_s": sum(writes) / seconds,
+        "read_p50_ms": float(np.percentile(flat, 50)),
+        "read_p99_ms": float(np.percentile(flat, 99)),
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQLite connection profiles under concurrent reads and writes")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads")
+    parser.add_argument("--writers", type=int, default=1, help="Concurrent writer threads")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration per profile")
+    parser.add_argument("--write-rate", type=float, default=20, help="Commits/s per writer (0 = as fast as possible)")
+    parser.add_argument("--farmers", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=10000, help="Seeded disease logs")
+    args = parser.parse_args()
+
+    rate = f"{args.write_rate:g} commits/s each" if args.write_rate > 0 else "unthrottled"
+    print(f"{args.readers} readers, {args.writers} writers ({rate}), {args.seconds:.0f}s per profile, {args.rows} seeded rows")
+    print(f"{'profile':<18} {'reads/s':>9} {'writes/s':>9} {'read p50':>9} {'read p99':>9} {'errors':>7}")
+    for name, production in (("single-connection", False), ("production", True)):
+        result = run_profile(production, args.readers, args.writers, args.seconds, args.farmers, args.rows,
+                             args.write_rate)
+        print(f"{name:<18} {result['reads_per_s']:>9.0f} {result['writes_per_s']:>9.0f} "
+              f"{result['read_p50_ms']:>9.2f} {result['read_p99_ms']:>9.2f} {result['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
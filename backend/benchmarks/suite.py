@@ -0,0 +1,294 @@
+"""
+Inference Benchmark Suite
+Latency percentiles, throughput and peak RSS for predict_crop, predict_disease and
+predict_yield across batch sizes, torch thread counts and disease backends
+
+Inputs are synthetic by default; pass recorded data to replay real traffic:
+    --crop-csv   Crop_recommendation.csv (N, P, K, temperature, humidity, ph, rainfall)
+    --yield-csv  crop_yield.csv (Crop, Season, State, Area, Annual_Rainfall, Fertilizer, Pesticide)
+    --images     folder of leaf photos
+
+Results are written as JSON; --compare flags regressions against an earlier run
+(exit code 1), so releases can be checked against each other on the same box.
+
+Usage (run from backend/, CPU only is fine):
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --entries disease --backends eager onnx onnx-int8 --threads 1 4
+    python -m benchmarks.suite --output new.json --compare bench.json --tolerance 0.15
+"""
+
+import csv
+import json
+import time
+import platform
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import torch
+
+from app import ml_service
+from app.core.config import settings
+from app.ml.threads import available_cores
+from benchmarks.crop_batch import synthetic_samples
+from benchmarks.decode import synthetic_jpeg, load_images
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+ENTRIES = ("crop", "disease", "yield")
+BACKENDS = ("eager", "torchscript", "onnx", "onnx-int8")
+
+# Compared between runs: higher is worse for latency, lower is worse for throughput
+LATENCY_KEYS = ("p50_ms", "p99_ms")
+THROUGHPUT_KEY = "throughput_per_s"
+
+
+# ==================================================
+# MEASUREMENT
+# ==================================================
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return round(peak / (2**20 if platform.system() == "Darwin" else 2**10), 1)
+
+
+def measure(call: Callable[[int], object], items_per_call: int,
+            min_time: float, min_iterations: int, max_iterations: int = 1000) -> Dict:
+    """
+    Time `call(i)` repeatedly (after two untimed warmup calls) until both
+    min_time seconds and min_iterations calls are reached.
+    """
+    call(0)
+    call(1)
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_iterations and (len(timings) < min_iterations or time.perf_counter() - started < min_time):
+        t0 = time.perf_counter()
+        call(len(timings))
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    timings = np.asarray(timings)
+    return {
+        "iterations": len(timings),
+        "mean_ms": round(float(timings.mean()), 3),
+        "p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "p90_ms": round(float(np.percentile(timings, 90)), 3),
+        "p99_ms": round(float(np.percentile(timings, 99)), 3),
+        THROUGHPUT_KEY: round(items_per_call * len(timings) / (timings.sum() / 1000), 1),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def rotating(pool: Sequence, batch_size: int) -> Callable[[int], list]:
+    """i -> the i-th batch of batch_size inputs, cycling through the pool"""
+    def batch(i: int) -> list:
+        start = (i * batch_size) % len(pool)
+        return [pool[(start + j) % len(pool)] for j in range(batch_size)]
+    return batch
+
+
+# ==================================================
+# INPUTS (synthetic or recorded)
+# ==================================================
+def crop_inputs(path: Optional[Path], count: int) -> np.ndarray:
+    if path is None:
+        return synthetic_samples(count)
+    with open(path, newline="") as f:
+        rows = [[float(row[col]) for col in ("N", "P", "K", "temperature", "humidity", "ph", "rainfall")]
+                for row in csv.DictReader(f)]
+    return np.array(rows[:count])
+
+
+def yield_inputs(path: Optional[Path], count: int) -> List[Dict]:
+    if path is None:
+        lookups = ml_service.load_yield_model()['lookups']
+        crops, seasons, states = (list(lookups[col]) for col in ml_service.YIELD_CATEGORICALS)
+        rng = np.random.default_rng(0)
+        return [dict(crop=crops[i % len(crops)], season=seasons[i % len(seasons)], state=states[i % len(states)],
+                     area=float(rng.uniform(1, 5000)), rainfall=float(rng.uniform(300, 3000)),
+                     fertilizer=float(rng.uniform(0, 500000)), pesticide=float(rng.uniform(0, 5000)))
+                for i in range(count)]
+    with open(path, newline="") as f:
+        return [dict(crop=row["Crop"], season=row["Season"], state=row["State"], area=float(row["Area"]),
+                     rainfall=float(row["Annual_Rainfall"]), fertilizer=float(row["Fertilizer"]),
+                     pesticide=float(row["Pesticide"]))
+                for _, row in zip(range(count), csv.DictReader(f))]
+
+
+def disease_inputs(folder: Optional[Path], count: int) -> List[bytes]:
+    if folder is None:
+        return [synthetic_jpeg(1280, 960, seed) for seed in range(count)]
+    return load_images(folder, count)
+
+
+# ==================================================
+# ENTRY POINTS
+# ==================================================
+def bench_crop(args, recorded: bool) -> List[Dict]:
+    if ml_service.load_crop_model() is None:
+        return [{"entry": "crop", "skipped": "crop model not found"}]
+    pool = crop_inputs(args.crop_csv, max(args.batch_sizes) * 4)
+    results = []
+    for batch_size in args.batch_sizes:
+        batch = rotating(pool, batch_size)
+        stats = measure(lambda i: ml_service.predict_crop_many(np.array(batch(i))), batch_size,
+                        args.min_time, args.min_iterations)
+        results.append({"entry": "crop", "input": "recorded" if recorded else "synthetic",
+                         "batch_size": batch_size, "threads": None, "backend": None, **stats})
+    return results
+
+
+def bench_yield(args, recorded: bool) -> List[Dict]:
+    if ml_service.load_yield_model() is None:
+        return [{"entry": "yield", "skipped": "yield model not found"}]
+    pool = yield_inputs(args.yield_csv, max(args.batch_sizes) * 4)
+    results = []
+    for batch_size in args.batch_sizes:
+        batch = rotating(pool, batch_size)
+        stats = measure(lambda i: ml_service.predict_yield_many(batch(i)), batch_size,
+                        args.min_time, args.min_iterations)
+        results.append({"entry": "yield", "input": "recorded" if recorded else "synthetic",
+                        "batch_size": batch_size, "threads": None, "backend": None, **stats})
+    return results
+
+
+def bench_disease(args, recorded: bool) -> List[Dict]:
+    """Decode + forward pass (predict_disease without the cache) per backend and thread count"""
+    model, _ = ml_service.load_disease_model()
+    if model is None:
+        return [{"entry": "disease", "skipped": "disease model not found"}]
+
+    # Measure inference, not cache hits; parity was checked when the artifacts were exported
+    settings.PREDICTION_CACHE_ENABLED = False
+    settings.DISEASE_BACKEND_PARITY_CHECK = False
+    ml_service._prediction_cache = None
+
+    pool = disease_inputs(args.images, max(max(args.batch_sizes), 8))
+    results = []
+    for backend in args.backends:
+        for threads in args.threads:
+            torch.set_num_threads(threads)
+            settings.DISEASE_BACKEND = backend
+            runner = ml_service.rebuild_disease_runner()  # this backend and thread count
+            if runner.name != backend:
+                results.append({"entry": "disease", "backend": backend, "threads": threads,
+                                "skipped": f"{backend} artifact unavailable"})
+                break
+
+            for batch_size in args.batch_sizes:
+                batch = rotating(pool, batch_size)
+                stats = measure(lambda i: ml_service.predict_disease_images(batch(i)), batch_size,
+                                args.min_time, args.min_iterations)
+                results.append({"entry": "disease", "input": "recorded" if recorded else "synthetic",
+                                "batch_size": batch_size, "threads": threads, "backend": backend, **stats})
+    return results
+
+
+# ==================================================
+# REPORTING
+# ==================================================
+def case_key(result: Dict) -> tuple:
+    return (result["entry"], result.get("input"), result.get("batch_size"), result.get("threads"), result.get("backend"))
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cores": available_cores(),
+        "cuda": torch.cuda.is_available(),
+    }
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Cases that got slower (p50/p99) or lost throughput by more than `tolerance`"""
+    previous = {case_key(r): r for r in baseline if "skipped" not in r}
+    regressions = []
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None or "skipped" in result:
+            continue
+        label = " ".join(f"{k}={v}" for k, v in zip(("entry", "input", "batch", "threads", "backend"), case_key(result))
+                         if v is not None)
+        for key in LATENCY_KEYS:
+            if result[key] > old[key] * (1 + tolerance):
+                regressions.append(f"{label}: {key} {old[key]:.2f} -> {result[key]:.2f}")
+        if result[THROUGHPUT_KEY] < old[THROUGHPUT_KEY] * (1 - tolerance):
+            regressions.append(f"{label}: {THROUGHPUT_KEY} {old[THROUGHPUT_KEY]:.1f} -> {result[THROUGHPUT_KEY]:.1f}")
+    return regressions
+
+
+def print_table(results: List[Dict]):
+    print(f"{'entry':<8} {'input':<9} {'batch':>5} {'thr':>4} {'backend':<11} "
+          f"{'p50 ms':>9} {'p99 ms':>9} {'items/s':>10} {'peak MB':>8}")
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['entry']:<8} skipped: {r['skipped']}")
+            continue
+        print(f"{r['entry']:<8} {r['input']:<9} {r['batch_size']:>5} {r['threads'] or '-':>4} {r['backend'] or '-':<11} "
+              f"{r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} {r[THROUGHPUT_KEY]:>10.1f} {r['peak_rss_mb'] or 0:>8.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crop, disease and yield inference entry points")
+    parser.add_argument("--entries", nargs="+", choices=ENTRIES, default=list(ENTRIES))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--threads", type=int, nargs="+", default=[torch.get_num_threads()],
+                        help="torch intra-op thread counts (disease)")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=["eager"], help="Disease backends")
+    parser.add_argument("--crop-csv", type=Path, default=None, help="Recorded crop samples")
+    parser.add_argument("--yield-csv", type=Path, default=None, help="Recorded yield rows")
+    parser.add_argument("--images", type=Path, default=None, help="Folder of recorded leaf photos")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds per case")
+    parser.add_argument("--min-iterations", type=int, default=10)
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown vs baseline")
+    args = parser.parse_args()
+
+    runners = {
+        "crop": lambda: bench_crop(args, args.crop_csv is not None),
+        "disease": lambda: bench_disease(args, args.images is not None),
+        "yield": lambda: bench_yield(args, args.yield_csv is not None),
+    }
+    results = []
+    for entry in args.entries:
+        results.extend(runners[entry]())
+
+    print_table(results)
+    report = {"environment": environment(), "settings": vars(args), "results": results}
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2, default=str))
+        print(f"📄 Results written to {args.output}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%} vs {args.compare}:")
+            for line in regressions:
+                print(f"   {line}")
+            raise SystemExit(1)
+        print(f"✅ No regressions beyond {args.tolerance:.0%} vs {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
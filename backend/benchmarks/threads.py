@@ -0,0 +1,83 @@
+"""
+Torch Thread Configuration Sweep
+Disease forward-pass latency and throughput for intra-op thread counts x concurrent callers
+
+Concurrent callers stand in for requests running in the threadpool (or
+several server workers sharing the host). Pick the intra-op count whose p99
+holds up at the concurrency you expect, then set TORCH_INTRA_OP_THREADS or
+SERVER_WORKERS accordingly.
+
+Usage (run from backend/):
+    python -m benchmarks.threads
+    python -m benchmarks.threads --threads 1 2 4 8 --concurrency 1 4 8 --requests 64
+"""
+
+import time
+import argparse
+import threading
+
+import numpy as np
+import torch
+
+from app import ml_service
+from app.ml.threads import available_cores
+
+
+def sweep_point(runner, intra_op: int, concurrency: int, requests: int, batch_size: int, image_size: int):
+    """(p50 ms, p99 ms, images/s) with `concurrency` threads sharing `requests` forward passes"""
+    torch.set_num_threads(intra_op)
+    pixel_values = torch.randn(batch_size, 3, image_size, image_size)
+    runner(pixel_values)  # warm up at this thread count
+
+    per_caller = max(1, requests // concurrency)
+    latencies = [[] for _ in range(concurrency)]
+
+    def caller(out):
+        for _ in range(per_caller):
+            start = time.perf_counter()
+            runner(pixel_values)
+            out.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=caller, args=(out,)) for out in latencies]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    flat = np.concatenate([np.asarray(out) for out in latencies])
+    return (float(np.percentile(flat, 50)), float(np.percentile(flat, 99)),
+            len(flat) * batch_size / elapsed)
+
+
+def main():
+    cores = available_cores()
+    default_threads = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+
+    parser = argparse.ArgumentParser(description="Sweep torch thread configurations for disease inference")
+    parser.add_argument("--threads", type=int, nargs="+", default=default_threads, help="Intra-op thread counts")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=sorted({1, cores}), help="Concurrent callers")
+    parser.add_argument("--requests", type=int, default=32, help="Forward passes per configuration")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--image-size", type=int, default=224)
+    args = parser.parse_args()
+
+    runner = ml_service.load_disease_runner()
+    if runner is None:
+        raise SystemExit("❌ Disease model could not be loaded - snapshot it with python -m app.ml.snapshot")
+
+    print(f"{cores} cores, backend {runner.name}, planned budget: {ml_service.thread_stats()['intra_op']} intra-op threads")
+    print(f"{'intra-op':>8} {'callers':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'img/s':>8}")
+    for concurrency in args.concurrency:
+        for intra_op in args.threads:
+            p50, p99, throughput = sweep_point(runner, intra_op, concurrency, args.requests,
+                                               args.batch_size, args.image_size)
+            oversubscribed = " *" if intra_op * concurrency > cores else ""
+            print(f"{intra_op:>8} {concurrency:>8} {p50:>9.1f} {p99:>9.1f} {throughput:>8.1f}{oversubscribed}")
+
+    print("* intra-op threads x callers exceed the available cores")
+
+
+if __name__ == "__main__":
+    main()
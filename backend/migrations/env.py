@@ -0,0 +1,55 @@
+"""
+Alembic Environment
+Migrations run against the app's engine and models (app/db)
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.db.database import engine
+from app.db.models import Base
+
+config = context.config
+target_metadata = Base.metadata
+
+# CLI runs configure logging from alembic.ini; create_tables() passes its own connection
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name)
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of executing it (alembic upgrade head --sql)"""
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=engine.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+    with engine.connect() as connection:
+        _run(connection)
+
+
+def _run(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",  # SQLite can't ALTER most things
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,31 @@
+"""Add model_version to disease_logs
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _has_column(table: str, column: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return column in {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade():
+    # Databases created after this change already have the column (create_all)
+    if not _has_column("disease_logs", "model_version"):
+        with op.batch_alter_table("disease_logs") as batch:
+            batch.add_column(sa.Column("model_version", sa.String(20), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("disease_logs") as batch:
+        batch.drop_column("model_version")
@@ -0,0 +1,47 @@
+"""Composite indexes for hot query patterns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) - mirrors __table_args__ in app/db/models.py
+INDEXES = [
+    ("ix_farmers_district", "farmers", ["district"]),
+    ("ix_farmers_state_active", "farmers", ["state", "is_active"]),
+    ("ix_crop_cycles_land_active_sowing", "crop_cycles", ["land_id", "is_active", "sowing_date"]),
+    ("ix_crop_cycles_active_sowing", "crop_cycles", ["is_active", "sowing_date"]),
+    ("ix_disease_logs_detected_at", "disease_logs", ["detected_at"]),
+    ("ix_disease_logs_disease_name", "disease_logs", ["disease_name"]),
+    ("ix_disease_logs_crop_cycle", "disease_logs", ["crop_cycle_id", "detected_at"]),
+    ("ix_activity_logs_cycle_date", "activity_logs", ["crop_cycle_id", "activity_date"]),
+    ("ix_complaints_farmer_created", "complaints", ["farmer_id", "created_at"]),
+    ("ix_complaints_farmer_status", "complaints", ["farmer_id", "status"]),
+    ("ix_complaints_status_created", "complaints", ["status", "created_at"]),
+]
+
+
+def _existing_indexes(table: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    # Databases created after this change already have them (create_all)
+    for name, table, columns in INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,37 @@
+"""(created_at, id) indexes for keyset-paginated admin listings
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) - mirrors __table_args__ in app/db/models.py
+INDEXES = [
+    ("ix_farmers_created_id", "farmers", ["created_at", "id"]),
+    ("ix_complaints_created_id", "complaints", ["created_at", "id"]),
+]
+
+
+def _existing_indexes(table: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
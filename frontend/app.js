@@ -3577,6 +3577,22 @@ function adminLogout() {
     document.getElementById('admin-password').value = '';
 }
 
+// Admin listings are cursor-paginated: follow X-Next-Cursor to the last page
+async function fetchAllPages(url) {
+    const items = [];
+    let cursor = null;
+    do {
+        const sep = url.includes('?') ? '&' : '?';
+        let pageUrl = `${url}${sep}limit=200`;
+        if (cursor) pageUrl += `&cursor=${encodeURIComponent(cursor)}`;
+        const response = await fetch(pageUrl);
+        if (!response.ok) throw new Error(`Request failed: ${response.status}`);
+        items.push(...await response.json());
+        cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor);
+    return items;
+}
+
 async function loadAdminDashboard() {
     if (!currentAdmin) return;
 
@@ -3592,15 +3608,14 @@ async function loadAdminDashboard() {
         }
 
         // Get total area from farmers in district
-        const farmersResponse = await fetch(`${API_BASE}/farmer/all?district=${encodeURIComponent(currentAdmin.district)}`);
-        if (farmersResponse.ok) {
-            const farmers = await farmersResponse.json();
+        try {
+            const farmers = await fetchAllPages(`${API_BASE}/farmer/all?district=${encodeURIComponent(currentAdmin.district)}`);
             const totalArea = farmers.reduce((sum, f) => {
                 const farmerArea = (f.lands || []).reduce((s, l) => s + (l.area || 0), 0);
                 return sum + farmerArea;
             }, 0);
             document.getElementById('admin-total-area').textContent = totalArea.toFixed(1);
-        } else {
+        } catch (e) {
             document.getElementById('admin-total-area').textContent = '0';
         }
 
@@ -3628,13 +3643,7 @@ async function renderAdminComplaints(filter) {
             url += `?status=${filter}`;
         }
 
-        const response = await fetch(url);
-
-        if (!response.ok) {
-            throw new Error('Failed to fetch complaints');
-        }
-
-        const filtered = await response.json();
+        const filtered = await fetchAllPages(url);
 
         if (filtered.length === 0) {
             container.innerHTML = '<div class="empty-state glass-card"><p>No complaints found.</p></div>';
@@ -3745,9 +3754,10 @@ async function renderAdminFarmers() {
 
     try {
         // Fetch farmers from backend
-        const response = await fetch(`${API_BASE}/farmer/all?district=${encodeURIComponent(currentAdmin.district)}`);
-
-        if (!response.ok) {
+        let farmers;
+        try {
+            farmers = await fetchAllPages(`${API_BASE}/farmer/all?district=${encodeURIComponent(currentAdmin.district)}`);
+        } catch (e) {
             // Fallback to localStorage if API fails
             const savedFarmersData = localStorage.getItem('allFarmers') || '[]';
             const allFarmersLocal = JSON.parse(savedFarmersData);
@@ -3756,7 +3766,6 @@ async function renderAdminFarmers() {
             return;
         }
 
-        const farmers = await response.json();
         renderFarmersList(container, farmers);
     } catch (error) {
         console.error('Error fetching farmers:', error);